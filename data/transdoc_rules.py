@@ -3,14 +3,19 @@
 
 Rule definitions for transdoc.
 """
+import hashlib
 import os
+import pickle
 import sys
+from collections.abc import Callable
+from importlib.metadata import version
+from pathlib import Path
 from typing import Any, cast
 
 import griffe
 from griffe import Kind
 
-from scripts.consts import MODULES, PATHS_TO_MODULES
+from scripts.consts import DOCS_SECTIONS, MODULES, PATHS_TO_MODULES
 
 # Add `src/*` to PATH so that building doesn't fail
 sys.path.extend([
@@ -20,14 +25,81 @@ sys.path.extend([
 ])
 
 
+GRIFFE_CACHE_DIR = os.getenv("GRIFFE_CACHE_DIR", ".build_cache/griffe")
+"""
+Directory where the griffe data for each module is cached between builds, or
+an empty string to disable the cache.
+"""
+
+
+def module_source_hash(module: str) -> str:
+    """
+    Returns a hash of the Python source files of the given module, as well as
+    the versions of Python and griffe, which determine the module's griffe
+    data.
+    """
+    root = Path("src") / PATHS_TO_MODULES[module] / module
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{sys.version}\0{version('griffe')}\0".encode())
+    for path in sorted(root.rglob("*.py*")):
+        if path.suffix in (".py", ".pyi"):
+            digest.update(f"{path.relative_to(root).as_posix()}\0".encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_module_info(module: str) -> dict[str, Any]:
+    """
+    Load the griffe data for the given module, using the cache if the
+    module's sources haven't changed since it was written.
+
+    The cache uses `pickle`, since the data contains griffe objects (such as
+    docstrings and expressions), so the cache directory should only contain
+    files written by this function.
+    """
+    if not GRIFFE_CACHE_DIR:
+        return griffe.load(
+            module,
+            resolve_aliases=True,
+            resolve_external=True,
+        ).as_dict()
+    key = module_source_hash(module)
+    cache_file = Path(GRIFFE_CACHE_DIR) / f"{module}.pickle"
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, info = pickle.load(f)
+        if cached_key == key:
+            return info
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+    info = griffe.load(
+        module,
+        resolve_aliases=True,
+        resolve_external=True,
+    ).as_dict()
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file, so that concurrent builds never see a
+    # partially-written cache
+    temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_file, "wb") as f:
+        pickle.dump((key, info), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, cache_file)
+    return info
+
+
 # Load griffe definitions for all modules
 module_info: dict[str, dict[str, dict[str, Any]]] = {}
 for mod in MODULES:
-    loaded_mod = griffe.load(mod, resolve_aliases=True, resolve_external=True)
-    module_info[mod] = loaded_mod.as_dict()
+    module_info[mod] = load_module_info(mod)
 
 
 BUILDING_ONLINE_DOCS = os.getenv("DOCS_BUILD_SITE") is not None
+"""
+Whether the documentation site is being built, in which case links use
+mkdocs cross-references. The rules check this each time they are called, so
+`scripts/build_all.py` changes it to produce both variants from a single
+load of the rules.
+"""
 
 
 BASE_URL = "https://il-group.github.io/FL-Studio-API-Stubs"
@@ -35,14 +107,26 @@ BASE_URL = "https://il-group.github.io/FL-Studio-API-Stubs"
 OLD_MANUAL_URL = "https://www.image-line.com/fl-studio-learning/fl-studio-online-manual/html"
 
 
-def get_item_docs_url(module: str, name: str) -> Any:
+MODULE_SECTIONS: dict[str, list[str]] = {}
+"""
+Mapping of module names to the sections of `src/` that contain them. If a
+module is in more than one section, links to it are ambiguous.
+"""
+for section in DOCS_SECTIONS:
+    for mod in os.listdir(Path("src") / section):
+        MODULE_SECTIONS.setdefault(mod, []).append(section)
+
+
+def build_symbol_index() -> dict[tuple[str, str], str]:
     """
-    Use Griffe to find the documentation URL for the given item.
+    Use Griffe to build an index mapping `(module, name)` to the
+    documentation URL of every member of every module, so that links can be
+    found without scanning the members of the module each time.
     """
-    mod_info = module_info[module]
-
-    for item in mod_info["members"].values():
-        if item["name"] == name:
+    index: dict[tuple[str, str], str] = {}
+    for module, mod_info in module_info.items():
+        for item in mod_info["members"].values():
+            name = item["name"]
             if item["kind"] == Kind.ALIAS:
                 path: list[str] = []
                 for dir in cast(str, item["target_path"].split('.')[:-1]):
@@ -52,13 +136,81 @@ def get_item_docs_url(module: str, name: str) -> Any:
                 # It's probably at the top of the module
                 path = [module]
                 anchor = f"{module}.{name}"
-            return (
+            index.setdefault(
+                (module, name),
                 f"{BASE_URL}/{PATHS_TO_MODULES[module]}"
                 f"/{'/'.join(path)}"
-                f"#{anchor}"
+                f"#{anchor}",
             )
+    return index
+
+
+symbol_index = build_symbol_index()
+"""
+Documentation URL of every member of every module, keyed by
+`(module, name)`.
+"""
 
-    raise NameError(f"Griffe definition not found: '{module}.{name}'")
+
+CHECKING_LINKS = os.getenv("DOCS_CHECK_LINKS") is not None
+"""
+Whether links that can't be resolved are recorded in `link_problems` rather
+than raising an error, so that they can all be reported in a single pass by
+`scripts/check_links.py`.
+"""
+
+link_problems: list[str] = []
+"""
+Problems with links found while `CHECKING_LINKS`.
+"""
+
+
+def link_problem(message: str) -> str:
+    """
+    Report a link that can't be resolved. When checking links, it is recorded
+    and a placeholder URL is returned, otherwise a `NameError` is raised.
+    """
+    if not CHECKING_LINKS:
+        raise NameError(message)
+    link_problems.append(message)
+    return "#"
+
+
+def check_ambiguous(module: str, link: str) -> None:
+    """
+    When checking links, record a link to a module which is in more than one
+    section of `src/`.
+    """
+    sections = MODULE_SECTIONS[module]
+    if CHECKING_LINKS and len(sections) > 1:
+        link_problems.append(
+            f"Ambiguous link: '{link}' (module '{module}' is in sections "
+            f"{sections})"
+        )
+
+
+def get_module_docs_url(module: str) -> str:
+    """
+    Find the documentation URL for the given module.
+    """
+    if module not in PATHS_TO_MODULES:
+        return link_problem(f"Module not found: '{module}'")
+    check_ambiguous(module, module)
+    return f"{BASE_URL}/{PATHS_TO_MODULES[module]}/{module}"
+
+
+def get_item_docs_url(module: str, name: str) -> str:
+    """
+    Find the documentation URL for the given item using the symbol index.
+    """
+    if module not in PATHS_TO_MODULES:
+        return link_problem(f"Module not found: '{module}'")
+    check_ambiguous(module, f"{module}.{name}")
+    url = symbol_index.get((module, name))
+    if url is None:
+        return link_problem(
+            f"Griffe definition not found: '{module}.{name}'")
+    return url
 
 
 def docs_url_mod(module: str) -> str:
@@ -67,10 +219,12 @@ def docs_url_mod(module: str) -> str:
     name.
     """
     if BUILDING_ONLINE_DOCS:
+        if CHECKING_LINKS:
+            get_module_docs_url(module)
         # Use mkdocs internal link
         return f"[`{module}`][{module}]"
     else:
-        return f"[{module}]({BASE_URL}/{PATHS_TO_MODULES[module]}/{module})"
+        return f"[{module}]({get_module_docs_url(module)})"
 
 
 def docs_url_fn(function: str, suffix: str = "()") -> str:
@@ -84,12 +238,13 @@ def docs_url_fn(function: str, suffix: str = "()") -> str:
 
     * `suffix` (`str`, optional): suffix to use in the text representation.
     """
+    module, fn = function.rsplit(".", 1)
     if BUILDING_ONLINE_DOCS:
-        module, fn = function.rsplit(".", 1)
+        if CHECKING_LINKS:
+            get_item_docs_url(module, fn)
         # Use mkdocs internal link
         return f"[`{module}.{fn}{suffix}`][{module}.{fn}]"
     else:
-        module, fn = function.rsplit(".", 1)
         return f"[{module}.{fn}{suffix}]({get_item_docs_url(module, fn)})"
 
 
@@ -104,18 +259,19 @@ def docs_url_attr(attribute: str, suffix: str = "") -> str:
 
     * `suffix` (`str`, optional): suffix to use in the text representation.
     """
+    module, fn = attribute.rsplit(".", 1)
     if BUILDING_ONLINE_DOCS:
-        module, fn = attribute.rsplit(".", 1)
+        if CHECKING_LINKS:
+            get_item_docs_url(module, fn)
         # Use mkdocs internal link
         return f"[`{module}.{fn}{suffix}`][{module}.{fn}]"
     else:
-        module, fn = attribute.rsplit(".", 1)
         return f"[{module}.{fn}{suffix}]({get_item_docs_url(module, fn)})"
 
 
-NOTE_MAPPINGS = {
+NOTE_MAPPINGS: dict[str, Callable[[], str]] = {
     # Commonly repeated info about colors
-    "colors": f"""Note that colors can be split into or built from components using the
+    "colors": lambda: f"""Note that colors can be split into or built from components using the
 functions provided in the {docs_url_mod("utils")} module.
 
 * {docs_url_fn("utils.ColorToRGB")}
@@ -123,8 +279,13 @@ functions provided in the {docs_url_mod("utils")} module.
 * {docs_url_fn("utils.RGBToColor")}""",
 
     # Note about playlist indexing
-    "playlist_indexes": "Note that playlist track indexes start at 1.",
+    "playlist_indexes": lambda: "Note that playlist track indexes start at 1.",
 }
+"""
+Notes that can be inserted using `note`. These are generated when they are
+used, so that their links match the value of `BUILDING_ONLINE_DOCS` at that
+time.
+"""
 
 
 def module_title(text: str | list[str]) -> str:
@@ -167,7 +328,7 @@ def note(name: str) -> str:
     """
     Insert a note into the documentation given its name.
     """
-    return NOTE_MAPPINGS[name]
+    return NOTE_MAPPINGS[name]()
 
 
 def md_table(table: list[list[str]]) -> str:
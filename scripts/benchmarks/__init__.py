@@ -0,0 +1,48 @@
+"""
+# Scripts / Benchmarks
+
+Micro-benchmarks for the parts of the library that are used when running
+scripts outside of FL Studio, as well as for the build scripts.
+
+Each benchmark can be run as a module, for example:
+
+```sh
+poetry run python -m scripts.benchmarks.fl_midi_msg
+```
+"""
+import sys
+import timeit
+from collections.abc import Callable
+
+# Add `src/*` to PATH so that the modules can be imported without building
+sys.path.extend([
+    'src/edison_scripting',
+    'src/midi_controller_scripting',
+    'src/piano_roll_scripting',
+])
+
+
+def report(name: str, fn: Callable[[], object], number: int) -> float:
+    """
+    Time the given function, and print the number of operations per second
+    it achieved.
+
+    The best of 5 repeats is used, to reduce noise from other processes.
+
+    ## Args
+
+    * `name` (`str`): name of the benchmark to display.
+
+    * `fn` (`Callable[[], object]`): function to benchmark.
+
+    * `number` (`int`): number of operations performed by a single call to
+      `fn`.
+
+    ## Returns
+
+    * `float`: operations per second.
+    """
+    best = min(timeit.repeat(fn, number=1, repeat=5))
+    rate = number / best
+    print(f"{name:<40} {rate:>14,.0f} ops/s")
+    return rate
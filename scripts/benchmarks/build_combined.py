@@ -0,0 +1,72 @@
+"""
+# Scripts / Benchmarks / Build Combined
+
+Compare the time taken to build the library and the documentation site
+sources separately (loading the rules and transforming `src/` once for each)
+and in a single combined pass, and check that both give byte-identical
+output.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.transform import (
+    hash_tree,
+    list_tree,
+    load_rules,
+    transform_files_parallel,
+)
+
+INPUT = Path("src")
+RULES = Path("data/transdoc_rules.py")
+
+
+def build_separate(lib: Path, site: Path, files: list[str]) -> None:
+    """
+    Build each variant with its own load of the rules, as running `build_lib`
+    and `build_docs` does.
+    """
+    previous = os.environ.pop("DOCS_BUILD_SITE", None)
+    try:
+        for output, site_flag in ((lib, False), (site, True)):
+            if site_flag:
+                os.environ["DOCS_BUILD_SITE"] = "TRUE"
+            transform_files_parallel(load_rules(RULES), INPUT, output, files,
+                                     jobs=1)
+    finally:
+        os.environ.pop("DOCS_BUILD_SITE", None)
+        if previous is not None:
+            os.environ["DOCS_BUILD_SITE"] = previous
+
+
+def build_combined(lib: Path, site: Path, files: list[str]) -> None:
+    """
+    Build both variants from a single load of the rules and parse of each
+    file, as `build_all` does.
+    """
+    transform_files_parallel(load_rules(RULES), INPUT, lib, files, jobs=1,
+                             site_output=site)
+
+
+def main():
+    files = list_tree(INPUT)
+    outputs = {}
+    with tempfile.TemporaryDirectory() as temp:
+        for name, build in (
+            ("separate", build_separate),
+            ("combined", build_combined),
+        ):
+            lib = Path(temp, name, "lib")
+            site = Path(temp, name, "site")
+            start = time.perf_counter()
+            build(lib, site, files)
+            seconds = time.perf_counter() - start
+            print(f"{f'build lib and site ({name})':<40} {seconds:>11.2f} s")
+            outputs[name] = (hash_tree(lib), hash_tree(site))
+    first, second = outputs.values()
+    print("Outputs are identical" if first == second else "Outputs differ!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+# Scripts / Benchmarks / Build Parallel
+
+Compare the time taken to transform `src/` sequentially and using a pool of
+worker processes, and check that both give byte-identical output. The rules
+are loaded once, before either build is timed.
+
+The number of processes can be given as an argument, and defaults to the
+number of CPUs.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.transform import (
+    hash_tree,
+    list_tree,
+    load_rules,
+    transform_files_parallel,
+)
+
+INPUT = Path("src")
+RULES = Path("data/transdoc_rules.py")
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    rules = load_rules(RULES)
+    files = list_tree(INPUT)
+    outputs = {}
+    with tempfile.TemporaryDirectory() as temp:
+        for name, mode_jobs in (("sequential", 1), (f"{jobs} processes", jobs)):
+            output = Path(temp, name)
+            start = time.perf_counter()
+            transform_files_parallel(rules, INPUT, output, files, jobs=mode_jobs)
+            seconds = time.perf_counter() - start
+            print(f"{f'transform {len(files)} files ({name})':<40} "
+                  f"{seconds:>11.2f} s")
+            outputs[name] = hash_tree(output)
+    first, second = outputs.values()
+    print("Outputs are identical" if first == second else "Outputs differ!")
+
+
+if __name__ == '__main__':
+    main()
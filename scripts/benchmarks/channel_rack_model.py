@@ -0,0 +1,58 @@
+"""
+# Scripts / Benchmarks / Channel Rack Model
+
+Compare redrawing a step sequencer grid using the per-step functions of the
+`channels` module with using the bulk operations of the channel rack model.
+"""
+from . import report
+
+CHANNELS = 4096
+STEPS = 64
+
+
+def main():
+    import channels
+    from fl_headless import (
+        ChannelRackModel,
+        disableChannelRackModel,
+        enableChannelRackModel,
+    )
+
+    rack = enableChannelRackModel(
+        ChannelRackModel(channelCount=CHANNELS, patternLength=STEPS))
+    for i in range(CHANNELS):
+        rack.fillGrid(i, 1 + i % 8, i % 4)
+
+    def per_step():
+        for i in range(CHANNELS):
+            for step in range(STEPS):
+                channels.getGridBit(i, step)
+
+    def per_row():
+        for i in range(CHANNELS):
+            row = rack.getGridRow(i)
+            for step in range(STEPS):
+                _ = (row >> step) & 1
+
+    def region():
+        rack.getGridRegion(0, CHANNELS)
+
+    def write_region():
+        rack.setGridRegion(0, [0x5555] * CHANNELS, 0, 16)
+
+    def step_params():
+        for i in range(0, CHANNELS, 16):
+            rack.setStepParams(i, 1, [127] * STEPS)
+            rack.getStepParams(i, 1)
+
+    cells = CHANNELS * STEPS
+    report("per-step getGridBit", per_step, cells)
+    report("getGridRow + bit tests", per_row, cells)
+    report("getGridRegion", region, cells)
+    report("setGridRegion (16 steps)", write_region, CHANNELS * 16)
+    report("set/getStepParams", step_params, CHANNELS // 16 * STEPS * 2)
+    disableChannelRackModel()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+# Scripts / Benchmarks / Edison Sample
+
+Measure the throughput of range operations on an in-memory Edison sample,
+using a 10 minute, 96 kHz stereo recording, both on one thread and on a
+thread per CPU, as well as the time taken to save it to and load it from a
+WAV file, and to look up its regions. NumPy is used if it is installed.
+"""
+import os
+import tempfile
+
+from . import report
+
+RATE = 96_000
+FRAMES = RATE * 600
+REGIONS = 1000
+
+
+def main():
+    from enveditor import Sample
+
+    sample = Sample(FRAMES, 2, RATE)
+    other = Sample(FRAMES // 10, 2, RATE)
+    end = FRAMES - 1
+
+    report("SineFromTo", lambda: sample.SineFromTo(0, end, 440, 0), FRAMES)
+    report("AmpFromTo", lambda: sample.AmpFromTo(0, end, 0.5), FRAMES)
+    report(
+        "NormalizeFromTo",
+        lambda: sample.NormalizeFromTo(0, end, 1.0),
+        FRAMES,
+    )
+    report(
+        "PasteFromTo (mix)",
+        lambda: sample.PasteFromTo(other, 0, end, 2),
+        FRAMES // 10,
+    )
+    report("SilenceFromTo", lambda: sample.SilenceFromTo(0, end, 0), FRAMES)
+
+    sample.Threads = os.cpu_count() or 1
+    report(
+        f"AmpFromTo ({sample.Threads} threads)",
+        lambda: sample.AmpFromTo(0, end, 0.5),
+        FRAMES,
+    )
+    report(
+        f"NormalizeFromTo ({sample.Threads} threads)",
+        lambda: sample.NormalizeFromTo(0, end, 1.0),
+        FRAMES,
+    )
+    sample.Threads = 1
+
+    # A region of half a second every 0.6 seconds, like a sliced recording
+    spacing = FRAMES // REGIONS
+    for i in range(REGIONS):
+        sample.AddRegion(i * spacing, i * spacing + RATE // 2)
+    positions = range(0, FRAMES, FRAMES // 10_000)
+    report(
+        "RegionAt",
+        lambda: [sample.RegionAt(p) for p in positions],
+        len(positions),
+    )
+    report(
+        "RegionsInRange (1 second)",
+        lambda: [sample.RegionsInRange(p, p + RATE) for p in positions],
+        len(positions),
+    )
+
+    with tempfile.TemporaryDirectory() as temp:
+        path = os.path.join(temp, "sample.wav")
+        report("SaveToWav", lambda: sample.SaveToWav(path), FRAMES)
+        # The loaded sample is discarded straight away, releasing its
+        # mapping of the file before the directory is deleted
+        report("LoadFromWav", lambda: Sample().LoadFromWav(path), FRAMES)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+# Scripts / Benchmarks / FL MIDI Msg
+
+Measure construction and attribute access throughput of `FlMidiMsg`, as
+well as its memory footprint.
+"""
+import sys
+
+from . import report
+
+N = 100_000
+
+
+def instance_size(obj: object) -> int:
+    """
+    Return the shallow size of an object, including its instance `__dict__`
+    if it has one.
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main():
+    from fl_classes import FlMidiMsg
+
+    events = [(0x90 | (i % 16), i % 128, (i * 7) % 128) for i in range(N)]
+    sysex = bytes([0xF0, 0x7E, 0x7F, 0x06, 0x01, 0xF7])
+    msgs = [FlMidiMsg(*e) for e in events]
+    msg = msgs[0]
+
+    def construct_standard():
+        for e in events:
+            FlMidiMsg(e[0], e[1], e[2])
+
+    def construct_sysex():
+        for _ in range(N):
+            FlMidiMsg(sysex)
+
+    def read_standard():
+        for m in msgs:
+            _ = m.status
+            _ = m.data1
+            _ = m.data2
+
+    def read_aliases():
+        for m in msgs:
+            _ = m.note
+            _ = m.velocity
+            _ = m.handled
+
+    def write_standard():
+        for m in msgs:
+            m.data1 = 0x40
+            m.handled = True
+
+    def compare():
+        for m in msgs:
+            _ = m == msg
+
+    report("construct (standard)", construct_standard, N)
+    report("construct (sysex)", construct_sysex, N)
+    report("read status/data1/data2", read_standard, N * 3)
+    report("read note/velocity/handled", read_aliases, N * 3)
+    report("write data1/handled", write_standard, N * 2)
+    report("compare (==)", compare, N)
+    print(f"{'instance size':<40} {instance_size(msg):>14,} bytes")
+
+
+if __name__ == '__main__':
+    main()
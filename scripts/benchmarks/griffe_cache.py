@@ -0,0 +1,53 @@
+"""
+# Scripts / Benchmarks / Griffe Cache
+
+Compare the time taken to load the transdoc rules (which load the griffe data
+of every module) without the griffe cache, with an empty (cold) cache, and
+with a populated (warm) cache.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.transform import load_rules
+
+RULES = Path("data/transdoc_rules.py")
+REPEATS = 5
+
+
+def time_load(cache_dir: str, clear: bool = False) -> float:
+    """
+    Returns the best time taken to load the rules using the given cache
+    directory, optionally clearing it before each load.
+    """
+    os.environ["GRIFFE_CACHE_DIR"] = cache_dir
+    best = float("inf")
+    for _ in range(REPEATS):
+        if clear:
+            for file in Path(cache_dir).glob("*"):
+                file.unlink()
+        start = time.perf_counter()
+        load_rules(RULES)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    previous = os.environ.get("GRIFFE_CACHE_DIR")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [
+            ("no cache", time_load("")),
+            ("cold cache", time_load(cache_dir, clear=True)),
+            ("warm cache", time_load(cache_dir)),
+        ]
+    if previous is None:
+        del os.environ["GRIFFE_CACHE_DIR"]
+    else:
+        os.environ["GRIFFE_CACHE_DIR"] = previous
+    for name, seconds in results:
+        print(f"{f'load rules ({name})':<40} {seconds * 1000:>11,.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
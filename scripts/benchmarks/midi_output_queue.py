@@ -0,0 +1,64 @@
+"""
+# Scripts / Benchmarks / MIDI Output Queue
+
+Measure the throughput of the MIDI output queue, and the number of messages
+and bytes it saves, using the workload of a script that redraws all 64 pads
+of a controller on each call to `OnIdle`, while only a few of their colors
+change between frames.
+"""
+import random
+from collections.abc import Iterator
+from types import ModuleType
+
+from . import report
+
+PADS = 64
+FRAMES = 500
+CHANGES_PER_FRAME = 4
+
+
+def main():
+    import device
+    from fl_headless import (
+        MidiOutputQueue,
+        ReplayEngine,
+        disableMidiOutputQueue,
+        enableMidiOutputQueue,
+    )
+
+    random.seed(0)
+    # Record the colors of the pads in each frame
+    colors = [0] * PADS
+    frames = []
+    for _ in range(FRAMES):
+        for _ in range(CHANGES_PER_FRAME):
+            colors[random.randrange(PADS)] = random.randrange(128)
+        frames.append(list(colors))
+
+    script = ModuleType("device_Benchmark")
+    frame_iter: Iterator[list[int]] = iter(())
+    queue = MidiOutputQueue()
+
+    def OnIdle():
+        for pad, color in enumerate(next(frame_iter)):
+            device.midiOutMsg(0x90 | pad << 8 | color << 16)
+
+    script.OnIdle = OnIdle  # type: ignore[attr-defined]
+
+    def run():
+        nonlocal frame_iter, queue
+        frame_iter = iter(frames)
+        queue = enableMidiOutputQueue(MidiOutputQueue(send=lambda m: None))
+        engine = ReplayEngine(script)
+        engine.advance(FRAMES * engine.idleInterval)
+
+    report("messages through queue", run, FRAMES * PADS)
+    print(
+        f"sent {queue.messagesSent:,} of {queue.messagesQueued:,} messages "
+        f"({queue.bytesSent:,} bytes sent, {queue.bytesSaved:,} bytes saved)"
+    )
+    disableMidiOutputQueue()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+# Scripts / Benchmarks / Mixer Model
+
+Measure the throughput of the `mixer` module's functions while backed by the
+in-memory mixer model, using the access pattern of a script's full refresh.
+"""
+from . import report
+
+REPEATS = 100
+
+
+def main():
+    import mixer
+    from fl_headless import disableMixerModel, enableMixerModel
+
+    model = enableMixerModel()
+    tracks = range(model.trackCount)
+
+    def read_tracks():
+        for _ in range(REPEATS):
+            for i in tracks:
+                mixer.getTrackVolume(i)
+                mixer.getTrackPan(i)
+                mixer.isTrackMuted(i)
+                mixer.isTrackSolo(i)
+                mixer.getTrackColor(i)
+
+    def write_tracks():
+        for _ in range(REPEATS):
+            for i in tracks:
+                mixer.setTrackVolume(i, 0.5)
+                mixer.setTrackPan(i, -0.25)
+                mixer.muteTrack(i)
+
+    def read_routes():
+        for _ in range(REPEATS):
+            for i in tracks:
+                mixer.getRouteSendActive(i, 0)
+                mixer.getRouteToLevel(i, 0)
+
+    def read_eq():
+        for _ in range(REPEATS):
+            for i in tracks:
+                for band in range(3):
+                    mixer.getEqGain(i, band)
+                    mixer.getEqFrequency(i, band)
+
+    n = REPEATS * model.trackCount
+    report("read volume/pan/mute/solo/color", read_tracks, n * 5)
+    report("write volume/pan/mute", write_tracks, n * 3)
+    report("read route active/level", read_routes, n * 2)
+    report("read EQ gain/frequency", read_eq, n * 6)
+    disableMixerModel()
+
+
+if __name__ == '__main__':
+    main()
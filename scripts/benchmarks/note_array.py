@@ -0,0 +1,47 @@
+"""
+# Scripts / Benchmarks / Note Array
+
+Compare the memory footprint and transformation throughput of a
+`NoteArray` with a list of `Note` objects.
+"""
+import random
+import sys
+
+from . import report
+
+N = 100_000
+
+
+def main():
+    from flpianoroll import Note, NoteArray
+
+    rng = random.Random(0)
+    notes = []
+    for _ in range(N):
+        note = Note()
+        note.number = rng.randint(24, 96)
+        note.time = rng.randint(0, N * 48)
+        note.length = rng.randint(12, 384)
+        notes.append(note)
+    array = NoteArray(notes)
+
+    def transpose_notes():
+        for note in notes:
+            note.number = min(max(note.number + 1, 0), 131)
+
+    def quantize_notes():
+        for note in notes:
+            note.time = (note.time + 12) // 24 * 24
+
+    report("list[Note]: transpose", transpose_notes, N)
+    report("NoteArray: transpose", lambda: array.transpose(1), N)
+    report("list[Note]: quantize", quantize_notes, N)
+    report("NoteArray: quantize", lambda: array.quantize(24), N)
+    report("NoteArray: scaleVelocity", lambda: array.scaleVelocity(0.9), N)
+    report("NoteArray: shiftTime", lambda: array.shiftTime(5), N)
+    print(f"{'Note size':<40} {sys.getsizeof(notes[0]):>14,} bytes")
+    print(f"{'NoteArray size per note':<40} {array.nbytes // N:>14,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+# Scripts / Benchmarks / Piano Roll Score
+
+Measure the throughput of the in-memory piano roll score, using a large
+score with randomly-placed notes.
+"""
+import random
+
+from . import report
+
+N = 100_000
+
+
+def main():
+    from flpianoroll import Note, score
+
+    rng = random.Random(0)
+    notes = []
+    for _ in range(N):
+        note = Note()
+        note.number = rng.randint(24, 96)
+        note.time = rng.randint(0, N * 48)
+        note.length = rng.randint(12, 384)
+        notes.append(note)
+    ppq = score.PPQ
+
+    def add_notes():
+        score.clearNotes(True)
+        score.addNotes(notes)
+
+    def query_beats():
+        for i in range(1000):
+            score.queryRange(i * ppq, (i + 1) * ppq)
+
+    def query_pitches():
+        for pitch in range(24, 97):
+            score.queryRange(0, N * 48, pitch, pitch)
+
+    def humanize():
+        for i in range(score.noteCount):
+            note = score.getNote(i)
+            note.time += 1
+
+    def add_delete_notes():
+        add_notes()
+        score.deleteNotes(range(0, N, 2))
+
+    report("addNotes", add_notes, N)
+    report("queryRange (1 beat)", query_beats, 1000)
+    report("queryRange (1 pitch)", query_pitches, 73)
+    report("shift note times (indexed)", humanize, N)
+    report("addNotes + deleteNotes (half)", add_delete_notes, N)
+    score.clearNotes(True)
+
+
+if __name__ == '__main__':
+    main()
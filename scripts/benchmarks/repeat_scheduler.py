@@ -0,0 +1,80 @@
+"""
+# Scripts / Benchmarks / Repeat Scheduler
+
+Measure the cost of starting and cancelling repeats on the repeat scheduler
+while many repeats are active, and the throughput of replaying a script
+while a dozen buttons are held down and repeated using
+`device.repeatMidiEvent`.
+"""
+from types import ModuleType
+
+from . import report
+
+ACTIVE = 1000
+OPERATIONS = 10_000
+BUTTONS = 12
+SECONDS = 60
+
+
+def main():
+    import device
+    from fl_classes import FlMidiMsg
+    from fl_headless import (
+        RepeatScheduler,
+        ReplayEngine,
+        disableRepeatScheduler,
+        enableRepeatScheduler,
+    )
+
+    # Sysex events, so that each repeat has its own key
+    events = [
+        FlMidiMsg([0xF0, *i.to_bytes(3, 'big'), 0xF7])
+        for i in range(ACTIVE + OPERATIONS)
+    ]
+    scheduler = RepeatScheduler()
+    for event in events[:ACTIVE]:
+        scheduler.repeat(event, 300, 50)
+
+    def insert_cancel():
+        for event in events[ACTIVE:]:
+            scheduler.cancel(scheduler.repeat(event, 300, 50))
+
+    report(f"repeat + cancel ({ACTIVE} active)", insert_cancel, OPERATIONS)
+
+    def advance():
+        s = RepeatScheduler()
+        for event in events[:ACTIVE]:
+            s.repeat(event, 300, 50)
+        for _ in s.due(SECONDS):
+            pass
+
+    fired = ACTIVE * ((SECONDS * 1000 - 300) // 50 + 1)
+    report(f"repeated events ({ACTIVE} active)", advance, fired)
+
+    # A script which repeats each button while it is held, and accelerates
+    # a jog wheel position using the number of repeats
+    script = ModuleType("device_Benchmark")
+    position = [0]
+
+    def OnNoteOn(event):
+        event.handled = True
+        position[0] += 1
+
+    script.OnNoteOn = OnNoteOn  # type: ignore[attr-defined]
+
+    def replay():
+        enableRepeatScheduler()
+        engine = ReplayEngine(script)
+        engine.start()
+        for note in range(BUTTONS):
+            device.repeatMidiEvent(FlMidiMsg(0x90, note, 127), 300, 50)
+        engine.advance(SECONDS)
+        engine.stop()
+
+    fired = BUTTONS * ((SECONDS * 1000 - 300) // 50 + 1)
+    report(f"replayed repeats ({BUTTONS} held)", replay, fired)
+    disableRepeatScheduler()
+
+
+if __name__ == '__main__':
+    main()
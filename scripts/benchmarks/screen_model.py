@@ -0,0 +1,50 @@
+"""
+# Scripts / Benchmarks / Screen Model
+
+Measure the rate at which the `screen` module can draw and push frames while
+backed by the screen model, and the bandwidth saved by only pushing the
+changed parts of each frame, using a meter animation like those drawn by the
+AKAI Fire's script.
+"""
+import math
+
+from . import report
+
+FRAMES = 300
+
+
+def main():
+    import screen
+    from fl_headless import (
+        ScreenModel,
+        disableScreenModel,
+        enableScreenModel,
+    )
+
+    model = enableScreenModel(ScreenModel())
+    screen.init(128, 64, 16, 0, 0, 0)
+    screen.displayText(0, 0, 0, "Master", False, 0)
+
+    def animate():
+        for frame in range(FRAMES):
+            level = (math.sin(frame / 10) + 1) / 2
+            screen.displayBar(0, 32, "Level", level, False)
+            screen.update()
+
+    def text():
+        for frame in range(FRAMES):
+            screen.displayText(0, 1, 1, f"{frame:>5}", False, 0)
+            screen.update()
+
+    report("meter frames", animate, FRAMES)
+    report("text frames", text, FRAMES)
+    saved = 1 - model.bytesPushed / model.bytesFull
+    print(
+        f"pushed {model.bytesPushed:,} of {model.bytesFull:,} bytes "
+        f"({saved:.1%} saved)"
+    )
+    disableScreenModel()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+# Scripts / Benchmarks / Sysex Builder
+
+Measure the throughput of the 7-bit packing helpers in `device`, compared
+with packing one byte at a time, and of refreshing the 64 pads of an AKAI
+Fire using a `SysexBuilder`, compared with sending a message per pad.
+"""
+import os
+
+from . import report
+
+DATA_SIZE = 1 << 16
+PADS = 64
+REPEATS = 100
+FIRE_HEADER = b'\x47\x7F\x43\x65'
+
+
+def pack_per_byte(data: bytes) -> bytearray:
+    packed = bytearray()
+    for start in range(0, len(data), 7):
+        group = data[start:start + 7]
+        highs = 0
+        for i, b in enumerate(group):
+            highs |= (b >> 7) << i
+        packed.append(highs)
+        packed.extend(b & 0x7F for b in group)
+    return packed
+
+
+def main():
+    import device
+
+    data = os.urandom(DATA_SIZE)
+    packed = device.pack7Bit(data)
+    report("pack (per byte)", lambda: pack_per_byte(data), DATA_SIZE)
+    report("pack7Bit", lambda: device.pack7Bit(data), DATA_SIZE)
+    report("unpack7Bit", lambda: device.unpack7Bit(packed), DATA_SIZE)
+
+    sent: list[bytes] = []
+    colors = [bytes((i, 127 - i, i // 2)) for i in range(PADS)]
+
+    def per_pad():
+        for _ in range(REPEATS):
+            for i, color in enumerate(colors):
+                sent.append(b''.join((
+                    b'\xF0', FIRE_HEADER, b'\x00\x04', bytes((i,)), color,
+                    b'\xF7',
+                )))
+
+    builder = device.SysexBuilder(
+        FIRE_HEADER,
+        lengthBytes=2,
+        send=sent.append,
+    )
+
+    def batched():
+        for _ in range(REPEATS):
+            for i, color in enumerate(colors):
+                builder.setCell(i, color)
+            builder.flush()
+
+    n = PADS * REPEATS
+    report("pad refresh (message per pad)", per_pad, n)
+    report("pad refresh (SysexBuilder)", batched, n)
+    builder.messagesSent = builder.bytesSent = 0
+    batched()
+    print(
+        f"SysexBuilder sent {builder.messagesSent:,} messages "
+        f"({builder.bytesSent:,} bytes) for {n:,} pad updates, compared with "
+        f"{n:,} messages ({n * 11:,} bytes)"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+# Scripts / Benchmarks / Utils Colors
+
+Compare the throughput of the batch color functions in `utils` with calling
+the scalar functions once per color, when recoloring the 128 LEDs of a pad
+controller. NumPy is used by the batch functions if it is installed.
+"""
+import random
+
+from . import report
+
+LEDS = 128
+REPEATS = 100
+
+
+def main():
+    import utils
+
+    random.seed(0)
+    colors = [random.randrange(1 << 24) for _ in range(LEDS)]
+    targets = colors[::-1]
+    n = LEDS * REPEATS
+
+    def repeat(fn):
+        def run():
+            for _ in range(REPEATS):
+                fn()
+        return run
+
+    cases = [
+        (
+            "ColorToRGB",
+            lambda: [utils.ColorToRGB(c) for c in colors],
+            lambda: utils.ColorToRGBArray(colors),
+        ),
+        (
+            "RGBToHSVColor",
+            lambda: [utils.RGBToHSVColor(c) for c in colors],
+            lambda: utils.RGBToHSVColorArray(colors),
+        ),
+        (
+            "FadeColor",
+            lambda: [
+                utils.FadeColor(c, t, 128)
+                for c, t in zip(colors, targets, strict=True)
+            ],
+            lambda: utils.FadeColorArray(colors, targets, 128),
+        ),
+        (
+            "LightenColor",
+            lambda: [utils.LightenColor(c, 64) for c in colors],
+            lambda: utils.LightenColorArray(colors, 64),
+        ),
+    ]
+    for name, scalar, batch in cases:
+        report(f"{name} (per color)", repeat(scalar), n)
+        report(f"{name}Array", repeat(batch), n)
+
+
+if __name__ == '__main__':
+    main()
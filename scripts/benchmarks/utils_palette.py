@@ -0,0 +1,69 @@
+"""
+# Scripts / Benchmarks / Utils Palette
+
+Compare mapping colors to a 128-color controller palette using a
+`utils.TPaletteMatcher` with the naive approach of converting each color to
+HSV using `utils.RGBToHSVColor` and finding the palette color at the smallest
+distance. Colors are drawn from a small set, as they are when they come from
+the tracks of a project. NumPy is used by the matcher if it is installed.
+"""
+import random
+
+from . import report
+
+PALETTE_SIZE = 128
+LOOKUPS = 1000
+
+
+def main():
+    import utils
+
+    random.seed(0)
+    palette = [random.randrange(1 << 24) for _ in range(PALETTE_SIZE)]
+    project_colors = [random.randrange(1 << 24) for _ in range(64)]
+    colors = [random.choice(project_colors) for _ in range(LOOKUPS)]
+    palette_hsv = [utils.RGBToHSVColor(c) for c in palette]
+
+    def naive_match(color):
+        h, s, v = utils.RGBToHSVColor(color)
+        best = 0
+        best_distance = float('inf')
+        for i, (ph, ps, pv) in enumerate(palette_hsv):
+            hue = min(abs(h - ph), 360 - abs(h - ph)) / 180
+            distance = hue ** 2 + (s - ps) ** 2 + (v - pv) ** 2
+            if distance < best_distance:
+                best = i
+                best_distance = distance
+        return best
+
+    matcher = utils.TPaletteMatcher(palette)
+
+    report(
+        "naive HSV distance",
+        lambda: [naive_match(c) for c in colors],
+        LOOKUPS,
+    )
+    report(
+        "TPaletteMatcher.Match",
+        lambda: [matcher.Match(c) for c in colors],
+        LOOKUPS,
+    )
+    report(
+        "TPaletteMatcher.MatchExact",
+        lambda: [matcher.MatchExact(c) for c in colors],
+        LOOKUPS,
+    )
+    report(
+        "TPaletteMatcher.MatchArray",
+        lambda: matcher.MatchArray(colors),
+        LOOKUPS,
+    )
+    report(
+        "TPaletteMatcher() (construction)",
+        lambda: utils.TPaletteMatcher(palette),
+        1,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+# Scripts / Benchmarks / Utils Volume
+
+Compare converting the volumes of 127 mixer tracks to decibels using
+`utils.VolTodB` with using a `utils.TVolumeTable`, as a script would when
+updating its meters. NumPy is used by the table if it is installed.
+"""
+import random
+
+from . import report
+
+TRACKS = 127
+REPEATS = 100
+
+
+def main():
+    import utils
+
+    random.seed(0)
+    volumes = [random.random() for _ in range(TRACKS)]
+    table = utils.TVolumeTable()
+    n = TRACKS * REPEATS
+
+    def exact():
+        for _ in range(REPEATS):
+            [utils.VolTodB(v) for v in volumes]
+
+    def scalar():
+        for _ in range(REPEATS):
+            [table.VolTodB(v) for v in volumes]
+
+    def batch():
+        for _ in range(REPEATS):
+            table.VolTodBArray(volumes)
+
+    report("VolTodB", exact, n)
+    report("TVolumeTable.VolTodB", scalar, n)
+    report("TVolumeTable.VolTodBArray", batch, n)
+    report("TVolumeTable() (construction)", utils.TVolumeTable, 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+# Scripts / Build All
+
+Build both the library (in `build_lib/`) and the documentation site, as done
+for a release. Rather than transforming `src/` twice, as running `build_lib`
+and `build_docs` does, the rules (and their `griffe` data) are loaded once,
+and each Python file is parsed once, with its docstrings transformed for both
+`build_lib/` and `prebuild_docs/`. The rest of the site is then built in the
+same way as `build_docs`.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import transdoc
+
+from scripts.transform import transform_tree_parallel
+
+INPUT = Path("src")
+RULES = Path("data/transdoc_rules.py")
+LIB_OUTPUT = Path("build_lib")
+DOCS_OUTPUT = Path("prebuild_docs")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the library and the documentation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes to transform files with, or 0 to use "
+        "every CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--no-site",
+        action="store_true",
+        help="stop after transforming the sources, without building the "
+        "site using mkdocs",
+    )
+    args = parser.parse_args()
+
+    print("Compile docstrings with transdoc...")
+    start = time.perf_counter()
+    try:
+        transform_tree_parallel(
+            RULES,
+            INPUT,
+            LIB_OUTPUT,
+            args.jobs or None,
+            site_output=DOCS_OUTPUT,
+        )
+    except ExceptionGroup as e:
+        transdoc.util.print_error(e)
+        return 1
+    print(f"Transformed sources in {time.perf_counter() - start:.2f}s")
+
+    if not args.no_site:
+        # Only import mkdocs if the site is being built
+        from scripts.build_docs import build_site
+        build_site()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
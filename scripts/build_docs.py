@@ -16,6 +16,7 @@ Author: Maddy Guthridge
 Date: 2024-04-08
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -25,6 +26,8 @@ import transdoc
 from mkdocs.commands.build import build as mkdocs_build
 from mkdocs.config import load_config
 
+from scripts.transform import transform_tree_parallel
+
 TRANSDOC_INPUT = Path("src")
 """
 Input dir for transdoc
@@ -295,6 +298,17 @@ def main():
     """
     Main entrypoint of the build_docs script.
     """
+    parser = argparse.ArgumentParser(description="Build the documentation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes to transform files with, or 0 to use "
+        "every CPU (default: 1)",
+    )
+    args = parser.parse_args()
+
     print("Compile docstrings with transdoc...")
     # Set the DOCS_BUILD_SITE environment variable, which is detected by our
     # rules in `data/transdoc_rules.py` in order to generate better links for
@@ -302,17 +316,33 @@ def main():
     os.environ["DOCS_BUILD_SITE"] = "TRUE"
     # Run transdoc compilation
     try:
-        transdoc.transform_tree(
-            transdoc.get_all_handlers(),
-            transdoc.TransdocTransformer.from_file(TRANSDOC_RULES),
-            TRANSDOC_INPUT,
-            DOCS_PREBUILD_DIR,
-            force=True,
-        )
+        if args.jobs != 1:
+            transform_tree_parallel(
+                TRANSDOC_RULES,
+                TRANSDOC_INPUT,
+                DOCS_PREBUILD_DIR,
+                args.jobs or None,
+            )
+        else:
+            transdoc.transform_tree(
+                transdoc.get_all_handlers(),
+                transdoc.TransdocTransformer.from_file(TRANSDOC_RULES),
+                TRANSDOC_INPUT,
+                DOCS_PREBUILD_DIR,
+                force=True,
+            )
     except ExceptionGroup as e:
         transdoc.util.print_error(e)
         exit(1)
 
+    build_site()
+
+
+def build_site():
+    """
+    Build the documentation site from the sources in `prebuild_docs/`, which
+    must already have been transformed.
+    """
     print("Generate auto-docstrings...")
     # Generate auto-docstrings
     generate_auto_docstrings()
@@ -8,24 +8,56 @@ Author: Maddy Guthridge
 Date: 2024-04-07
 """
 
+import argparse
+import time
 from pathlib import Path
 
 import transdoc
 
+from scripts.transform import transform_incremental, transform_tree_parallel
+
 INPUT = Path("src")
 RULES = Path("data/transdoc_rules.py")
 OUTPUT = Path("build_lib")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the library")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only transform files that changed since the last incremental "
+        "build, and remove the outputs of deleted files",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes to transform files with, or 0 to use "
+        "every CPU (default: 1)",
+    )
+    args = parser.parse_args()
+    start = time.perf_counter()
     try:
-        transdoc.transform_tree(
-            transdoc.get_all_handlers(),
-            transdoc.TransdocTransformer.from_file(RULES),
-            INPUT,
-            OUTPUT,
-            force=True,
-        )
+        if args.incremental:
+            result = transform_incremental(
+                RULES,
+                INPUT,
+                OUTPUT,
+                args.jobs or None,
+            )
+            print(f"{result} in {time.perf_counter() - start:.2f}s")
+        elif args.jobs != 1:
+            transform_tree_parallel(RULES, INPUT, OUTPUT, args.jobs or None)
+        else:
+            transdoc.transform_tree(
+                transdoc.get_all_handlers(),
+                transdoc.TransdocTransformer.from_file(RULES),
+                INPUT,
+                OUTPUT,
+                force=True,
+            )
     except ExceptionGroup as e:
         transdoc.util.print_error(e)
         return 1
@@ -0,0 +1,52 @@
+"""
+# Scripts / Check Links
+
+Report every link in the docstrings that can't be resolved, or that is
+ambiguous, in a single pass. The build scripts stop at the first broken link
+in each file, which makes fixing many of them at once tedious.
+"""
+import os
+from pathlib import Path
+
+import transdoc
+from transdoc.handlers import find_matching_handler
+
+from scripts.transform import load_rules
+
+INPUT = Path("src")
+RULES = Path("data/transdoc_rules.py")
+
+
+def main():
+    os.environ["DOCS_CHECK_LINKS"] = "TRUE"
+    rules = load_rules(RULES)
+    transformer = transdoc.TransdocTransformer.from_namespace(rules)
+    handlers = transdoc.get_all_handlers()
+    problems: list[str] = [
+        f"{RULES}: {problem}" for problem in rules.link_problems
+    ]
+    rules.link_problems.clear()
+
+    for path in sorted(INPUT.rglob("*")):
+        handler = find_matching_handler(handlers, str(path))
+        if not path.is_file() or handler is None:
+            continue
+        try:
+            with open(path) as in_file:
+                handler.transform_file(transformer, str(path), in_file, None)
+        except Exception as e:
+            # Other errors still stop the file, so report them too
+            problems.append(f"{path}: {e}")
+        problems.extend(
+            f"{path}: {problem}" for problem in rules.link_problems
+        )
+        rules.link_problems.clear()
+
+    for problem in problems:
+        print(problem)
+    print(f"Found {len(problems)} link problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    exit(main())
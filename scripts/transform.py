@@ -0,0 +1,742 @@
+"""
+# Scripts / Transform
+
+Helpers for transforming the source tree using `transdoc`, shared by the build
+scripts.
+
+## Incremental builds
+
+`transform_incremental` keeps a manifest in the output directory, recording
+the content hash of each input file, of the rules file, and of the link data
+that the rules load from `griffe`. On the next build, only the files whose
+hashes changed are transformed again, and the outputs of removed files are
+deleted. If the rules file or the link data changed, every file is
+transformed again, since any docstring could depend on them.
+
+The link data is only derived from the input files, so when no input files
+changed, the rules (and `griffe`) aren't loaded at all.
+
+## Parallel builds
+
+Each file is transformed independently once the rules are loaded, so
+`transform_files_parallel` shares the files between a pool of worker
+processes. The rules are loaded once, before the workers are forked, and
+errors are sent back to the parent process so that they are reported in the
+same order as a sequential build.
+
+## Combined builds
+
+The library and the documentation site are built from the same sources,
+differing only in the style of links, which the rules choose using
+`BUILDING_ONLINE_DOCS`. Given a `site_output`, the helpers here build both
+from a single load of the rules, parsing each Python file once, and
+transforming its docstrings once with the flag cleared and once with it set.
+"""
+import copyreg
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from shutil import copyfile, rmtree
+from types import ModuleType
+from typing import Any
+
+import libcst
+import transdoc
+import transdoc_python
+from transdoc.errors import TransdocTransformationError
+from transdoc.handlers import find_matching_handler
+from transdoc.handlers.api import TransdocHandler
+from transdoc_python import TransdocPythonHandler
+
+try:
+    # Private to transdoc-python, so only used if it is a version whose
+    # `TransdocPythonHandler.transform_file` is known to match
+    # `transform_file_combined`
+    from transdoc_python.__visitor import DocstringVisitor
+except ImportError:
+    DocstringVisitor = None  # type: ignore[assignment,misc]
+
+log = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".transdoc_manifest.json"
+"""
+Name of the manifest file written to the output directory.
+"""
+
+MANIFEST_VERSION = 1
+"""
+Version of the manifest format. Manifests with a different version are
+ignored, causing a full build.
+"""
+
+SHARED_PARSE_VERSIONS = ("0.1.4",)
+"""
+Versions of `transdoc-python` that `transform_file_combined` has been checked
+against. To parse each file only once, it repeats the parsing and visiting
+done by `TransdocPythonHandler.transform_file`, which may change in other
+versions, so for them, the handler transforms the file for each output
+instead.
+"""
+
+SHARED_PARSE = (
+    DocstringVisitor is not None
+    and transdoc_python.__version__ in SHARED_PARSE_VERSIONS
+)
+"""
+Whether `transform_file_combined` parses Python files once for both outputs.
+"""
+
+SITE_FLAG = "BUILDING_ONLINE_DOCS"
+"""
+Name of the flag in the rules which selects links for the documentation site
+rather than the library.
+"""
+
+
+def hash_bytes(data: bytes) -> str:
+    """
+    Returns the content hash of the given data.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def list_tree(input: Path) -> list[str]:
+    """
+    Returns the paths of every file within the given directory, relative to
+    it (using `/` as the separator), in the same order as
+    `transdoc.transform_tree` visits them.
+    """
+    return [
+        Path(dirpath, filename).relative_to(input).as_posix()
+        for dirpath, _, filenames in os.walk(input)
+        for filename in filenames
+    ]
+
+
+def hash_tree(input: Path) -> dict[str, str]:
+    """
+    Returns the content hash of every file within the given directory, keyed
+    by their path relative to it (using `/` as the separator).
+    """
+    return {
+        file: hash_bytes((input / file).read_bytes())
+        for file in list_tree(input)
+    }
+
+
+def load_rules(rules: Path) -> ModuleType:
+    """
+    Load a rules file, in the same way as
+    `transdoc.TransdocTransformer.from_file`, but returning the module so that
+    the data it loaded can be inspected.
+    """
+    module_name = f"transdoc.rules_temp.{rules.stem}"
+    sys.path.append(str(rules.parent.absolute()))
+    spec = importlib.util.spec_from_file_location(module_name, rules)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load rules from '{rules}'")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def link_fingerprint(rules: ModuleType) -> str:
+    """
+    Returns a hash of the symbol index built by the rules, which is the only
+    part of the `griffe` data that affects their output.
+    """
+    return hash_bytes(json.dumps(sorted(rules.symbol_index.items())).encode())
+
+
+def transform_file(
+    handlers: Sequence[TransdocHandler],
+    transformer: transdoc.TransdocTransformer,
+    input: Path,
+    output: Path,
+    file: str,
+) -> Exception | None:
+    """
+    Transform a single file within the input directory, writing it to the
+    corresponding path in the output directory, in the same way as
+    `transdoc.transform_tree`.
+
+    ## Returns
+
+    * `Exception | None`: the error that occurred while transforming the
+      file, if any.
+    """
+    in_path = input / file
+    out_path = output / file
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    handler = find_matching_handler(handlers, str(in_path))
+    if handler is None:
+        copyfile(in_path, out_path)
+        return None
+    try:
+        with open(in_path) as in_file, open(out_path, "w") as out_file:
+            handler.transform_file(
+                transformer,
+                str(in_path),
+                in_file,
+                out_file,
+            )
+    except Exception as e:
+        msg = f"Error occurred while transforming {in_path}"
+        log.exception(msg)
+        e.add_note(msg)
+        return e
+    return None
+
+
+def transform_file_combined(
+    handlers: Sequence[TransdocHandler],
+    rules: ModuleType,
+    transformer: transdoc.TransdocTransformer,
+    input: Path,
+    output: Path,
+    site_output: Path,
+    file: str,
+) -> Exception | None:
+    """
+    Transform a single file within the input directory for both the library
+    and the documentation site, writing it to the corresponding paths in
+    `output` and `site_output` respectively. Python files are only parsed
+    once, and the parsed module is visited for each output, unless
+    `SHARED_PARSE` is false, in which case the handler transforms the file
+    for each output.
+
+    Each output is the same as transforming the file using `transform_file`
+    with `DOCS_BUILD_SITE` unset and set respectively.
+
+    ## Returns
+
+    * `Exception | None`: the error that occurred while transforming the
+      file, if any, or an `ExceptionGroup` if both outputs failed.
+    """
+    in_path = input / file
+    variants = [(output, False), (site_output, True)]
+    for out_dir, _ in variants:
+        (out_dir / file).parent.mkdir(parents=True, exist_ok=True)
+    handler = find_matching_handler(handlers, str(in_path))
+    if handler is None:
+        for out_dir, _ in variants:
+            copyfile(in_path, out_dir / file)
+        return None
+
+    parsed: libcst.MetadataWrapper | None = None
+    if SHARED_PARSE and isinstance(handler, TransdocPythonHandler):
+        with open(in_path) as in_file:
+            text = in_file.read()
+        # If it can't be parsed, the handler falls back to transforming it
+        # as plain text
+        with suppress(libcst.ParserSyntaxError):
+            parsed = libcst.MetadataWrapper(libcst.parse_module(text))
+
+    errors: list[Exception] = []
+    previous = getattr(rules, SITE_FLAG)
+    try:
+        for out_dir, site in variants:
+            setattr(rules, SITE_FLAG, site)
+            try:
+                with open(out_dir / file, "w") as out_file:
+                    if parsed is None:
+                        with open(in_path) as in_file:
+                            handler.transform_file(
+                                transformer,
+                                str(in_path),
+                                in_file,
+                                out_file,
+                            )
+                    else:
+                        visitor = DocstringVisitor(transformer, str(in_path))
+                        updated = parsed.visit(visitor)
+                        visitor.raise_errors()
+                        out_file.write(updated.code)
+            except Exception as e:
+                msg = f"Error occurred while transforming {in_path} " \
+                    f"into {out_dir}"
+                log.exception(msg)
+                e.add_note(msg)
+                errors.append(e)
+    finally:
+        setattr(rules, SITE_FLAG, previous)
+    if len(errors) > 1:
+        return ExceptionGroup(
+            f"Errors occurred while transforming {in_path}", errors)
+    return errors[0] if errors else None
+
+
+def transform_files(
+    handlers: Sequence[TransdocHandler],
+    rules: ModuleType,
+    transformer: transdoc.TransdocTransformer,
+    input: Path,
+    output: Path,
+    files: Iterable[str],
+    done: list[str] | None = None,
+    site_output: Path | None = None,
+) -> None:
+    """
+    Transform the given files within the input directory, writing them to the
+    corresponding paths in the output directory, in the same way as
+    `transdoc.transform_tree`.
+
+    ## Args
+
+    * `handlers` (`Sequence[TransdocHandler]`): handlers to use.
+
+    * `rules` (`ModuleType`): rules module, as loaded by `load_rules`.
+
+    * `transformer` (`TransdocTransformer`): transformer containing the
+      rules.
+
+    * `input` (`Path`): input directory.
+
+    * `output` (`Path`): output directory.
+
+    * `files` (`Iterable[str]`): paths of files to transform, relative to
+      the input directory.
+
+    * `done` (`list[str]`, optional): list to add the files that were
+      transformed successfully to.
+
+    * `site_output` (`Path`, optional): output directory for the
+      documentation site. If given, each file is transformed for both the
+      library and the site using `transform_file_combined`.
+
+    ## Raises
+
+    * `ExceptionGroup`: errors that occurred while transforming the files.
+      Other files are still transformed.
+    """
+    errors: list[Exception] = []
+    for file in files:
+        error = _transform_job(
+            handlers, rules, transformer, input, output, site_output, file)
+        if error is None:
+            if done is not None:
+                done.append(file)
+        else:
+            errors.append(error)
+    if errors:
+        raise ExceptionGroup(
+            "Errors occurred while performing transformation", errors
+        )
+
+
+def _transform_job(
+    handlers: Sequence[TransdocHandler],
+    rules: ModuleType,
+    transformer: transdoc.TransdocTransformer,
+    input: Path,
+    output: Path,
+    site_output: Path | None,
+    file: str,
+) -> Exception | None:
+    """
+    Transform a file for the library, and for the site if `site_output` is
+    given.
+    """
+    if site_output is None:
+        return transform_file(handlers, transformer, input, output, file)
+    return transform_file_combined(
+        handlers, rules, transformer, input, output, site_output, file)
+
+
+_worker: tuple[
+    list[TransdocHandler],
+    ModuleType,
+    transdoc.TransdocTransformer,
+] | None = None
+"""
+Handlers, rules and transformer used by worker processes. Workers that are forked
+inherit them from the parent process, so the rules (and their `griffe` data)
+aren't loaded again.
+"""
+
+
+def _rebuild_error(
+    cls: type[Exception],
+    args: tuple,
+    state: dict[str, Any],
+    cause: BaseException | None,
+) -> Exception:
+    """
+    Rebuild an error that was sent from a worker process.
+    """
+    error = cls.__new__(cls)
+    error.args = args
+    error.__dict__.update(state)
+    error.__cause__ = cause
+    return error
+
+
+def _reduce_error(error: Exception) -> tuple:
+    """
+    Reduce an error so that it can be sent from a worker process, including
+    its attributes, notes and cause, which `pickle` doesn't handle for
+    exceptions whose constructors take different arguments to their `args`,
+    such as `TransdocTransformationError`.
+    """
+    return _rebuild_error, (
+        type(error),
+        error.args,
+        error.__dict__,
+        error.__cause__,
+    )
+
+
+def _register_error_reducers() -> None:
+    """
+    Register `_reduce_error` for transdoc's errors, including subclasses
+    defined by handler plugins.
+    """
+    pending: list[type] = [TransdocTransformationError]
+    while pending:
+        cls = pending.pop()
+        copyreg.pickle(cls, _reduce_error)
+        pending.extend(cls.__subclasses__())
+
+
+def _sendable(error: Exception | None) -> Exception | None:
+    """
+    Returns the error if it can be sent to the parent process, or otherwise a
+    `RuntimeError` describing it.
+    """
+    if error is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        replacement = RuntimeError(f"{type(error).__name__}: {error}")
+        for note in getattr(error, "__notes__", []):
+            replacement.add_note(note)
+        return replacement
+    return error
+
+
+def _init_worker(rules: str) -> None:
+    """
+    Initialize a worker process, loading the rules if they weren't inherited
+    from the parent process.
+    """
+    global _worker
+    _register_error_reducers()
+    if _worker is None:
+        rules_module = load_rules(Path(rules))
+        _worker = (
+            transdoc.get_all_handlers(),
+            rules_module,
+            transdoc.TransdocTransformer.from_namespace(rules_module),
+        )
+
+
+def _transform_in_worker(
+    job: tuple[Path, Path, Path | None, str],
+) -> tuple[str, Exception | None]:
+    """
+    Transform a file in a worker process.
+    """
+    assert _worker is not None
+    input, output, site_output, file = job
+    handlers, rules, transformer = _worker
+    error = _transform_job(
+        handlers, rules, transformer, input, output, site_output, file)
+    return file, _sendable(error)
+
+
+def transform_files_parallel(
+    rules: ModuleType,
+    input: Path,
+    output: Path,
+    files: Iterable[str],
+    done: list[str] | None = None,
+    jobs: int | None = None,
+    site_output: Path | None = None,
+) -> None:
+    """
+    Transform the given files using a pool of worker processes. This gives
+    the same output and errors as `transform_files`, in the same order.
+
+    Where possible, workers are forked from the current process, so that
+    they share the rules that are already loaded. Otherwise, each worker
+    loads the rules again, which is made faster by the `griffe` cache.
+
+    ## Args
+
+    * `rules` (`ModuleType`): rules module, as loaded by `load_rules`.
+
+    * `input` (`Path`): input directory.
+
+    * `output` (`Path`): output directory.
+
+    * `files` (`Iterable[str]`): paths of files to transform, relative to
+      the input directory.
+
+    * `done` (`list[str]`, optional): list to add the files that were
+      transformed successfully to.
+
+    * `jobs` (`int`, optional): number of worker processes. Defaults to the
+      number of CPUs. If this is `1`, the files are transformed in the
+      current process.
+
+    * `site_output` (`Path`, optional): output directory for the
+      documentation site, as for `transform_files`.
+
+    ## Raises
+
+    * `ExceptionGroup`: errors that occurred while transforming the files.
+      Other files are still transformed.
+    """
+    global _worker
+    files = list(files)
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    handlers = transdoc.get_all_handlers()
+    transformer = transdoc.TransdocTransformer.from_namespace(rules)
+    if jobs <= 1:
+        transform_files(
+            handlers,
+            rules,
+            transformer,
+            input,
+            output,
+            files,
+            done,
+            site_output,
+        )
+        return
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        method = "fork"
+    else:
+        method = "spawn"
+    context = multiprocessing.get_context(method)
+    _register_error_reducers()
+    _worker = (handlers, rules, transformer)
+    errors: list[Exception] = []
+    try:
+        with context.Pool(jobs, _init_worker, (rules.__file__,)) as pool:
+            results = pool.imap(
+                _transform_in_worker,
+                [(input, output, site_output, file) for file in files],
+                # Small chunks, since some files take far longer than others
+                chunksize=max(1, len(files) // (jobs * 8)),
+            )
+            for file, error in results:
+                if error is None:
+                    if done is not None:
+                        done.append(file)
+                else:
+                    errors.append(error)
+    finally:
+        _worker = None
+    if errors:
+        raise ExceptionGroup(
+            "Errors occurred while performing transformation", errors
+        )
+
+
+def transform_tree_parallel(
+    rules: Path,
+    input: Path,
+    output: Path,
+    jobs: int | None = None,
+    site_output: Path | None = None,
+) -> None:
+    """
+    Transform the input directory into the output directory using a pool of
+    worker processes, giving the same output as `transdoc.transform_tree`
+    with `force=True`.
+
+    ## Args
+
+    * `rules` (`Path`): path to the rules file.
+
+    * `input` (`Path`): input directory.
+
+    * `output` (`Path`): output directory, which is removed first if it
+      exists.
+
+    * `jobs` (`int`, optional): number of worker processes. Defaults to the
+      number of CPUs.
+
+    * `site_output` (`Path`, optional): output directory for the
+      documentation site, which is also removed first if it exists. If
+      given, both the library and the site are built from a single load of
+      the rules, as for `transform_files`.
+
+    ## Raises
+
+    * `ExceptionGroup`: errors that occurred while transforming the files.
+    """
+    rules_module = load_rules(rules)
+    rmtree(output, ignore_errors=True)
+    if site_output is not None:
+        rmtree(site_output, ignore_errors=True)
+    transform_files_parallel(
+        rules_module,
+        input,
+        output,
+        list_tree(input),
+        jobs=jobs,
+        site_output=site_output,
+    )
+
+
+def remove_stale(output: Path, expected: Iterable[str]) -> list[str]:
+    """
+    Remove files in the output directory which aren't expected (other than
+    the manifest), as well as any directories left empty.
+
+    ## Returns
+
+    * `list[str]`: files that were removed, relative to the output
+      directory.
+    """
+    keep = set(expected)
+    keep.add(MANIFEST_NAME)
+    removed = []
+    for dirpath, _, filenames in os.walk(output, topdown=False):
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            relative = path.relative_to(output).as_posix()
+            if relative not in keep:
+                path.unlink()
+                removed.append(relative)
+        if dirpath != str(output) and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+@dataclass
+class BuildResult:
+    """
+    Summary of the work done by an incremental build.
+    """
+
+    total: int
+    """Number of input files"""
+    transformed: list[str] = field(default_factory=list)
+    """Files that were transformed"""
+    removed: list[str] = field(default_factory=list)
+    """Stale output files that were removed"""
+    full: bool = False
+    """Whether every file was transformed"""
+    reason: str = ""
+    """Why every file was transformed, if it was"""
+
+    def __str__(self) -> str:
+        summary = (
+            f"Transformed {len(self.transformed)} of {self.total} files, "
+            f"removed {len(self.removed)} stale files"
+        )
+        if self.full:
+            summary += f" (full build: {self.reason})"
+        return summary
+
+
+def transform_incremental(
+    rules: Path,
+    input: Path,
+    output: Path,
+    jobs: int | None = 1,
+) -> BuildResult:
+    """
+    Transform the input directory into the output directory, only
+    transforming the files which changed since the last build, as recorded in
+    the manifest.
+
+    ## Args
+
+    * `rules` (`Path`): path to the rules file.
+
+    * `input` (`Path`): input directory.
+
+    * `output` (`Path`): output directory.
+
+    * `jobs` (`int`, optional): number of worker processes to transform the
+      files with, as for `transform_files_parallel`. Defaults to `1`.
+
+    ## Raises
+
+    * `ExceptionGroup`: errors that occurred while transforming the files.
+      Files which failed are left out of the manifest, so that they are
+      transformed again by the next build.
+
+    ## Returns
+
+    * `BuildResult`: summary of the build.
+    """
+    manifest_path = output / MANIFEST_NAME
+    hashes = hash_tree(input)
+    config = {
+        "version": MANIFEST_VERSION,
+        "rules": hash_bytes(rules.read_bytes()),
+        "transdoc": transdoc.__version__,
+        "site": os.getenv("DOCS_BUILD_SITE") is not None,
+    }
+    result = BuildResult(len(hashes))
+
+    manifest: dict[str, Any] | None = None
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        result.reason = "no manifest"
+    if manifest is not None and manifest.get("config") != config:
+        manifest = None
+        result.reason = "rules changed"
+
+    changed = list(hashes)
+    if manifest is not None:
+        built: dict[str, str] = manifest["files"]
+        changed = [
+            file for file, digest in hashes.items()
+            if built.get(file) != digest or not (output / file).exists()
+        ]
+        if not changed and built.keys() == hashes.keys():
+            # Nothing to do, so don't bother loading the rules
+            return result
+
+    rules_module = load_rules(rules)
+    fingerprint = link_fingerprint(rules_module)
+    if manifest is not None and manifest["links"] != fingerprint:
+        manifest = None
+        result.reason = "link data changed"
+    if manifest is None:
+        result.full = True
+        changed = list(hashes)
+
+    result.removed = remove_stale(output, hashes)
+    output.mkdir(parents=True, exist_ok=True)
+    try:
+        transform_files_parallel(
+            rules_module,
+            input,
+            output,
+            changed,
+            result.transformed,
+            jobs,
+        )
+    finally:
+        # Record whatever was built, so that only the files which failed are
+        # transformed again by the next build
+        failed = set(changed).difference(result.transformed)
+        manifest_path.write_text(json.dumps({
+            "config": config,
+            "links": fingerprint,
+            "files": {
+                file: digest for file, digest in hashes.items()
+                if file not in failed
+            },
+        }, indent=1, sort_keys=True))
+    return result
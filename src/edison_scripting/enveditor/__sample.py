@@ -1,8 +1,450 @@
 """
 The classes and functions documented here are used to manipulate and interact
 with samples within the Edison editor.
+
+Outside of FL Studio, samples are stored in memory as interleaved 32-bit float
+frames, so that scripts can be tested by running them on real audio. If NumPy
+is installed, it is used to process ranges of a sample, which is far faster
+than processing them in Python.
+
+Ranges are processed in cache-sized blocks, with progress reported using
+`Utils.ProgressMsg` after each block. When NumPy is used, blocks can also be
+processed in parallel by setting `Sample.Threads`.
+
+Samples can be loaded from and saved to WAV files. 32-bit float WAV files are
+memory-mapped rather than read, so that even very long recordings can be
+opened using little memory. The regions and markers of a sample are loaded
+from and saved to the cue points of the file.
+
+Regions are kept sorted by their start positions, so that the regions at a
+position or within a range can be found using a binary search.
+"""
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal, TypeVar
+
+from .__utils import Utils
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore[assignment]
+
+T = TypeVar('T')
+
+
+def _as_floats(
+    buffer: 'array | memoryview | bytes | bytearray',
+) -> 'memoryview[float]':
+    """
+    Returns a flat view of a buffer as 32-bit floats.
+    """
+    return memoryview(buffer).cast('B').cast('f')
+
+
+def _peak(view: 'memoryview[float]') -> float:
+    """
+    Returns the largest magnitude of the values in a buffer.
+    """
+    if not len(view):
+        return 0.0
+    if numpy is not None:
+        values = numpy.frombuffer(view, numpy.float32)
+        return float(max(values.max(), -values.min()))
+    return max(max(view), -min(view))
+
+
+def _scale(view: 'memoryview[float]', gain: float) -> None:
+    """
+    Multiply the values in a buffer by `gain`, in place.
+    """
+    if numpy is not None:
+        values = numpy.frombuffer(view, numpy.float32)
+        numpy.multiply(values, gain, out=values)
+    else:
+        view[:] = array('f', [x * gain for x in view])
+
+
+def _silence(view: 'memoryview[float]') -> None:
+    """
+    Set the values in a buffer to `0.0`, in place.
+    """
+    if numpy is not None:
+        numpy.frombuffer(view, numpy.float32).fill(0)
+    else:
+        view[:] = array('f', bytes(4 * len(view)))
+
+
+def _mix(view: 'memoryview[float]', source: 'memoryview[float]') -> None:
+    """
+    Add the values in `source` to the values in a buffer of the same length,
+    in place.
+    """
+    if numpy is not None:
+        values = numpy.frombuffer(view, numpy.float32)
+        numpy.add(values, numpy.frombuffer(source, numpy.float32), out=values)
+    else:
+        view[:] = array('f', map(operator.add, view, source))
+
+
+_BLOCK_SIZE = 1 << 16
+"""
+Number of values in each block of a range processed by `_stream`. Blocks are
+256 KiB, so that they stay in the CPU cache while they are being processed.
+"""
+
+
+def _stream(
+    length: int,
+    chans: int,
+    fn: Callable[[int, int], T],
+    message: str,
+    threads: int = 1,
+) -> list[T]:
+    """
+    Process `length` interleaved values in blocks, by calling `fn` with the
+    start and end of each block, and returning its results in order.
+
+    Progress is reported in frames using `Utils.ProgressMsg` as each block
+    is finished. If `threads` is more than `1` and NumPy is available, the
+    blocks are processed using a thread pool, since NumPy releases the GIL
+    while it works.
+    """
+    size = _BLOCK_SIZE - _BLOCK_SIZE % chans
+    starts = range(0, length, size)
+    ends = (min(start + size, length) for start in starts)
+    pool = None
+    if threads > 1 and numpy is not None and len(starts) > 1:
+        pool = ThreadPoolExecutor(threads)
+        results = pool.map(fn, starts, ends)
+    else:
+        results = map(fn, starts, ends)
+    total = length // chans
+    collected = []
+    try:
+        for start, result in zip(starts, results, strict=True):
+            collected.append(result)
+            Utils.ProgressMsg(
+                message,
+                min(start + size, length) // chans,
+                total,
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return collected
+
+
+_SINE_BLOCK = 1 << 14
+"""
+Number of frames of a sine wave generated at once using NumPy.
+"""
+
+
+def _sine(
+    view: 'memoryview[float]',
+    chans: int,
+    step: float,
+    phase: float,
+    volume: float,
+) -> None:
+    """
+    Write a sine wave to every channel of a buffer of interleaved frames
+    using NumPy, where `step` is the change in phase per frame.
+
+    Rather than calling `sin` for every frame, the wave is generated in
+    blocks using the angle sum identity, with the sine and cosine of the
+    offsets within a block calculated once.
+    """
+    frames = numpy.frombuffer(view, numpy.float32).reshape(-1, chans)
+    offsets = numpy.arange(min(_SINE_BLOCK, len(frames))) * step
+    sin_offsets = numpy.sin(offsets) * volume
+    cos_offsets = numpy.cos(offsets) * volume
+    for start in range(0, len(frames), _SINE_BLOCK):
+        block = frames[start:start + _SINE_BLOCK]
+        size = len(block)
+        angle = start * step + phase
+        block[:] = (
+            sin_offsets[:size] * math.cos(angle)
+            + cos_offsets[:size] * math.sin(angle)
+        )[:, None]
+
+
+def _convert_channels(view: 'memoryview[float]', old: int, new: int) -> array:
+    """
+    Convert interleaved frames with `old` channels into a new array of frames
+    with `new` channels, repeating the source channels as needed.
+    """
+    if old == new:
+        result = array('f')
+        result.frombytes(view.cast('B'))
+        return result
+    frames = len(view) // old
+    result = array('f', bytes(4 * frames * new))
+    dest = memoryview(result)
+    for channel in range(new):
+        dest[channel::new] = view[channel % old::old]
+    return result
+
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _riff_chunks(data: memoryview) -> Iterator[tuple[bytes, memoryview]]:
+    """
+    Yields the ID and contents of each chunk in a sequence of RIFF chunks.
+    """
+    pos = 0
+    while pos + 8 <= len(data):
+        chunk_id = bytes(data[pos:pos + 4])
+        (size,) = struct.unpack_from('<I', data, pos + 4)
+        start = pos + 8
+        yield chunk_id, data[start:start + size]
+        # Chunks are padded to an even length
+        pos = start + size + (size & 1)
+
+
+def _riff_chunk(chunk_id: bytes, contents: bytes) -> bytes:
+    """
+    Returns a RIFF chunk with the given ID and contents, padded to an even
+    length.
+    """
+    return (
+        chunk_id
+        + struct.pack('<I', len(contents))
+        + contents
+        + b'\0' * (len(contents) & 1)
+    )
+
+
+def _wav_chunks(data: memoryview) -> dict[bytes, memoryview]:
+    """
+    Returns the chunks of a RIFF WAVE file, as views of its data. If a chunk
+    ID appears more than once, the first occurrence is used.
+
+    `LIST` chunks are returned using their list type as their ID (eg
+    `b'adtl'`), so that each type of list can be found.
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF WAVE file")
+    chunks: dict[bytes, memoryview] = {}
+    for chunk_id, contents in _riff_chunks(data[12:]):
+        if chunk_id == b'LIST' and len(contents) >= 4:
+            chunk_id, contents = bytes(contents[:4]), contents[4:]
+        chunks.setdefault(chunk_id, contents)
+    return chunks
+
+
+_MARKER_END = (1 << 63) - 1
 """
-from typing import Literal
+End position of markers within a region table, which is greater than the
+length of any sample, as expected by `Region.SampleEnd`.
+"""
+
+
+def _decode_cues(
+    chunks: dict[bytes, memoryview],
+) -> list[tuple[int, int]]:
+    """
+    Returns the regions and markers given by the cue points of a WAV file,
+    as `(start, end)` pairs.
+
+    Cue points with a length in the associated data list (`adtl`) are
+    regions, and all others are markers.
+    """
+    cue = chunks.get(b'cue ')
+    if cue is None or len(cue) < 4:
+        return []
+    (count,) = struct.unpack_from('<I', cue)
+    count = min(count, (len(cue) - 4) // 24)
+    lengths = {}
+    for chunk_id, contents in _riff_chunks(chunks.get(b'adtl', cue[:0])):
+        if chunk_id == b'ltxt' and len(contents) >= 8:
+            cue_id, length = struct.unpack_from('<II', contents)
+            lengths[cue_id] = length
+    regions = []
+    for cue_id, offset in (
+        # Cue ID and sample offset of each cue point
+        struct.unpack_from('<I16xI', cue, 4 + 24 * i) for i in range(count)
+    ):
+        length = lengths.get(cue_id, 0)
+        regions.append(
+            (offset, offset + length - 1 if length else _MARKER_END))
+    return regions
+
+
+def _encode_cues(regions: Iterable[tuple[int, int]]) -> bytes:
+    """
+    Returns `cue ` and `LIST` (`adtl`) chunks containing a cue point for each
+    of the given regions and markers.
+    """
+    points = []
+    labels = []
+    for cue_id, (start, end) in enumerate(regions, 1):
+        points.append(
+            struct.pack('<II4s8xI', cue_id, start, b'data', start))
+        if end != _MARKER_END:
+            labels.append(_riff_chunk(b'ltxt', struct.pack(
+                '<II4s8x', cue_id, end - start + 1, b'rgn ')))
+    if not points:
+        return b''
+    chunks = _riff_chunk(
+        b'cue ',
+        struct.pack('<I', len(points)) + b''.join(points),
+    )
+    if labels:
+        chunks += _riff_chunk(b'LIST', b'adtl' + b''.join(labels))
+    return chunks
+
+
+def _decode_wav(
+    fmt: memoryview,
+    data: memoryview,
+) -> tuple['memoryview[float]', int, int]:
+    """
+    Decode the audio data of a WAV file, returning its frames as 32-bit
+    floats, its number of channels and its sample rate.
+
+    32-bit float data is returned as a view of the given data, without
+    copying it. Other formats are converted.
+    """
+    if len(fmt) < 16:
+        raise ValueError("Invalid fmt chunk in WAV file")
+    tag, chans, rate, _, align, bits = struct.unpack_from('<HHIIHH', fmt)
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The format tag is the start of the sub-format GUID
+        (tag,) = struct.unpack_from('<H', fmt, 24)
+    if chans < 1 or align != chans * bits // 8:
+        raise ValueError("Invalid fmt chunk in WAV file")
+    raw = data[:len(data) - len(data) % align]
+    if tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        if _LITTLE_ENDIAN:
+            return _as_floats(raw), chans, rate
+        values = array('f')
+        values.frombytes(raw)
+        values.byteswap()
+    elif tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 64:
+        doubles = array('d')
+        doubles.frombytes(raw)
+        if not _LITTLE_ENDIAN:
+            doubles.byteswap()
+        values = array('f', doubles)
+    elif tag == _WAVE_FORMAT_PCM and bits in (8, 16, 24, 32):
+        values = _decode_pcm(raw, bits)
+    else:
+        raise ValueError(
+            f"Unsupported WAV format (format tag {tag}, {bits} bits)")
+    return _as_floats(values), chans, rate
+
+
+def _decode_pcm(raw: memoryview, bits: int) -> array:
+    """
+    Convert little-endian integer PCM data to 32-bit floats.
+    """
+    if bits == 8:
+        # 8-bit WAV data is unsigned
+        ints = array('b', bytes(raw).translate(
+            bytes((b - 128) & 0xFF for b in range(256))))
+        scale = 1 / (1 << 7)
+    elif bits == 16:
+        ints = array('h')
+        ints.frombytes(raw)
+        scale = 1 / (1 << 15)
+    else:
+        if bits == 24:
+            # Widen each value to 32 bits, so that it can be read as an int
+            # with its sign preserved
+            count = len(raw) // 3
+            widened = bytearray(4 * count)
+            widened[1::4] = raw[0::3]
+            widened[2::4] = raw[1::3]
+            widened[3::4] = raw[2::3]
+            raw = memoryview(widened)
+        ints = array('i')
+        ints.frombytes(raw)
+        scale = 1 / (1 << 31)
+    if not _LITTLE_ENDIAN:
+        ints.byteswap()
+    if numpy is not None:
+        values = numpy.frombuffer(ints, ints.typecode).astype(numpy.float32)
+        values *= scale
+        return array('f', values.tobytes())
+    return array('f', [x * scale for x in ints])
+
+
+class _RegionTable:
+    """
+    Regions and markers of a sample, stored as arrays of start and end
+    positions sorted by start position.
+
+    Since the maximum length of the regions is tracked, the regions
+    overlapping a range can be found using a binary search over the start
+    positions. Markers are stored with an end of `_MARKER_END`, and are not
+    included in the maximum length.
+    """
+
+    def __init__(self) -> None:
+        self.starts = array('q')
+        self.ends = array('q')
+        self.maxLength = 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, start: int, end: int) -> int:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        if end != _MARKER_END:
+            self.maxLength = max(self.maxLength, end - start + 1)
+        return i
+
+    def extend(self, regions: Iterable[tuple[int, int]]) -> None:
+        # Sorting is stable, so regions at the same position keep their order
+        merged = sorted(
+            [*zip(self.starts, self.ends, strict=True), *regions],
+            key=operator.itemgetter(0),
+        )
+        self.starts = array('q', [start for start, _ in merged])
+        self.ends = array('q', [end for _, end in merged])
+        self.maxLength = max(
+            (end - start + 1 for start, end in merged if end != _MARKER_END),
+            default=0,
+        )
+
+    def at(self, position: int) -> int:
+        starts = self.starts
+        ends = self.ends
+        first = bisect_left(starts, position - self.maxLength + 1)
+        # Search backwards, so that the latest region to start is found
+        for i in range(bisect_right(starts, position) - 1, first - 1, -1):
+            if ends[i] != _MARKER_END and ends[i] >= position:
+                return i
+        return -1
+
+    def query(self, start: int, end: int) -> list[int]:
+        starts = self.starts
+        ends = self.ends
+        first = bisect_left(starts, start - self.maxLength + 1)
+        last = bisect_right(starts, end)
+        return [
+            i for i in range(first, last)
+            if (starts[i] if ends[i] == _MARKER_END else ends[i]) >= start
+        ]
 
 
 class Region:
@@ -12,12 +454,28 @@ class Region:
     A region is bound by a start and end point, and a marker only has a start
     point.
     """
+    def __init__(self, start: int = 0, end: int = 0) -> None:
+        """
+        Create a region
+
+        ## Args:
+        * `start` (`int`, optional): the starting point. Defaults to `0`.
+
+        * `end` (`int`, optional): the ending point. Defaults to `0`.
+
+        ## Note:
+        * FL Studio doesn't accept any arguments when creating a region. They
+          are only provided by these stubs, for use when testing scripts.
+        """
+        self.__start = start
+        self.__end = end
+
     @property
     def SampleStart(self) -> int:
         """
         The starting point of this region in samples.
         """
-        return 0
+        return self.__start
 
     @property
     def SampleEnd(self) -> int:
@@ -25,7 +483,7 @@ class Region:
         The ending point of this region in samples. If this is greater than the
         length of the sample, then this region is actually a marker.
         """
-        return 0
+        return self.__end
 
 
 class MEEditor:
@@ -56,11 +514,101 @@ class Sample:
 
     Note that this is different from a sample point, which is a location within
     a sample's waveform at a single instance in time.
+
+    Positions are given as frame indexes, and ranges given by `start` and
+    `end` positions are clamped to the length of the sample.
     """
-    def __init__(self) -> None:
+    Threads = 1
+    """
+    Number of threads used to process ranges of the sample. This only has
+    an effect if NumPy is installed. Defaults to `1`.
+
+    ## Note:
+    * This attribute is not available in FL Studio, and is only provided by
+      these stubs, for use when testing scripts.
+    """
+
+    def __init__(
+        self,
+        length: int = 0,
+        numChans: int = 2,
+        sampleRate: int = 44_100,
+    ) -> None:
         """
         Create an audio sample
+
+        ## Args:
+        * `length` (`int`, optional): number of silent frames to create the
+          sample with. Defaults to `0`.
+
+        * `numChans` (`int`, optional): number of audio channels. Defaults to
+          `2`.
+
+        * `sampleRate` (`int`, optional): sample rate. Defaults to `44_100`.
+
+        ## Note:
+        * FL Studio doesn't accept any arguments when creating a sample. They
+          are only provided by these stubs, for creating samples to test
+          scripts with.
+        """
+        if numChans < 1:
+            raise ValueError(f"numChans must be at least 1 (got {numChans})")
+        self.__chans = numChans
+        self.__rate = sampleRate
+        self.__data = _as_floats(array('f', bytes(4 * length * numChans)))
+        self.__regions = _RegionTable()
+
+    def __frames(self, start: int, end: int) -> tuple[int, int]:
+        """
+        Clamp an inclusive range of frames to the sample, returning the
+        exclusive range of values it covers within the interleaved data.
+        """
+        chans = self.__chans
+        start = max(start, 0)
+        end = min(end + 1, len(self.__data) // chans)
+        if end < start:
+            end = start
+        return start * chans, end * chans
+
+    def __check(self, position: int, channel: int) -> int:
+        """
+        Returns the index of the value for a channel at a position.
+        """
+        if not 0 <= channel < self.__chans:
+            raise IndexError(
+                f"Channel {channel} out of range for sample with "
+                f"{self.__chans} channels"
+            )
+        if not 0 <= position < len(self.__data) // self.__chans:
+            raise IndexError(f"Position {position} out of range")
+        return position * self.__chans + channel
+
+    def __stream(
+        self,
+        view: 'memoryview[float]',
+        fn: Callable[[int, int], T],
+        message: str,
+    ) -> list[T]:
+        """
+        Process a range of the sample in blocks, using `_stream`.
+        """
+        return _stream(len(view), self.__chans, fn, message, self.Threads)
+
+    @property
+    def Buffer(self) -> 'memoryview[float]':
+        """
+        A writable view of the audio data of this sample, with shape
+        `(Length, NumChans)`, and format `'f'` (32-bit float).
+
+        This can be used to process the sample without copying it, for
+        example using `numpy.asarray(sample.Buffer)`. The view is invalidated
+        when the length or number of channels of the sample changes.
+
+        ## Note:
+        * This property is not available in FL Studio, and is only provided
+          by these stubs, for use when testing scripts.
         """
+        return self.__data.cast('B').cast('f', (self.Length, self.__chans))
 
     def GetSampleAt(self, position: int, channel: int) -> float:
         """
@@ -75,7 +623,7 @@ class Sample:
         ## Returns:
         * `float`: the magnitude at this position
         """
-        return 0.0
+        return self.__data[self.__check(position, channel)]
 
     def SetSampleAt(self, position: int, channel: int, value: float) -> None:
         """
@@ -89,6 +637,7 @@ class Sample:
 
         * `value` (`float`): new magnitude
         """
+        self.__data[self.__check(position, channel)] = value
 
     def NormalizeFromTo(
         self,
@@ -109,7 +658,25 @@ class Sample:
         * `volume` (`float`): ???
 
         * `only_if_above` (`bool`, optional): ???. Defaults to False
+
+        ## Note:
+        * Outside of FL Studio, this scales the range so that its peak
+          magnitude is `volume`. If `only_if_above` is set, the range is only
+          changed if its peak is already above `volume`.
         """
+        a, b = self.__frames(start, end)
+        view = self.__data[a:b]
+        # Find the peak block by block, rather than processing the whole
+        # range at once
+        peak = max(
+            self.__stream(view, lambda x, y: _peak(view[x:y]), "Scanning"),
+            default=0.0,
+        )
+        if peak == 0 or (only_if_above and peak <= volume):
+            return
+        gain = volume / peak
+        self.__stream(
+            view, lambda x, y: _scale(view[x:y], gain), "Normalizing")
 
     def AmpFromTo(
         self,
@@ -128,6 +695,10 @@ class Sample:
 
         * `volume` (`float`): the multiplication to apply to each value
         """
+        a, b = self.__frames(start, end)
+        view = self.__data[a:b]
+        self.__stream(
+            view, lambda x, y: _scale(view[x:y], volume), "Amplifying")
 
     def SilenceFromTo(
         self,
@@ -146,6 +717,9 @@ class Sample:
 
         * `end` (`int`): the ending position
         """
+        a, b = self.__frames(start, end)
+        view = self.__data[a:b]
+        self.__stream(view, lambda x, y: _silence(view[x:y]), "Silencing")
 
     def SineFromTo(
         self,
@@ -170,7 +744,25 @@ class Sample:
 
         * `volume` (`float`, optional): the amplitude of the sine wave.
           Defaults to `1`.
+
+        ## Note:
+        * Outside of FL Studio, `frequency` is treated as being in Hz, and
+          `phase` in radians, at the `start` position. The wave is written to
+          all channels.
         """
+        a, b = self.__frames(start, end)
+        chans = self.__chans
+        frames = (b - a) // chans
+        step = 2 * math.pi * frequency / self.__rate
+        if numpy is not None:
+            _sine(self.__data[a:b], chans, step, phase, volume)
+        else:
+            values = array('f', [
+                volume * math.sin(i * step + phase) for i in range(frames)
+            ])
+            view = self.__data[a:b]
+            for channel in range(chans):
+                view[channel::chans] = values
 
     def LoadFromClipboard(self) -> None:
         """
@@ -179,6 +771,90 @@ class Sample:
         This will replace any existing sample
         """
 
+    def LoadFromWav(self, path: 'str | Path') -> None:
+        """
+        Load a WAV file into this sample object
+
+        This will replace any existing sample, including its number of
+        channels and sample rate.
+
+        32-bit float files are memory-mapped, so the audio is only read from
+        disk as it is accessed. Changes to the sample are never written back
+        to the file. Files in other formats (8, 16, 24 or 32-bit integer, or
+        64-bit float) are converted to 32-bit float in memory.
+
+        ## Args:
+        * `path` (`str | Path`): path of the file to load
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        with open(path, 'rb') as f:
+            # Copy-on-write, so that the file is never modified
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        chunks = _wav_chunks(memoryview(mapped))
+        if b'fmt ' not in chunks or b'data' not in chunks:
+            raise ValueError(f"Missing fmt or data chunk in '{path}'")
+        data, chans, rate = _decode_wav(chunks[b'fmt '], chunks[b'data'])
+        self.__data = data
+        self.__chans = chans
+        self.__rate = rate
+        self.__regions = _RegionTable()
+        self.__regions.extend(_decode_cues(chunks))
+
+    def SaveToWav(self, path: 'str | Path') -> None:
+        """
+        Save this sample to a 32-bit float WAV file
+
+        Regions and markers are saved as cue points. The file is written to a
+        temporary file first, which then replaces the destination, so a sample
+        can be saved to the file it was loaded from.
+
+        ## Args:
+        * `path` (`str | Path`): path of the file to write
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        path = Path(path)
+        raw = self.__data.cast('B')
+        if not _LITTLE_ENDIAN:
+            swapped = array('f')
+            swapped.frombytes(raw)
+            swapped.byteswap()
+            raw = memoryview(swapped).cast('B')
+        fmt = struct.pack(
+            '<HHIIHH',
+            _WAVE_FORMAT_IEEE_FLOAT,
+            self.__chans,
+            self.__rate,
+            self.__rate * self.__chans * 4,
+            self.__chans * 4,
+            32,
+        )
+        cues = _encode_cues(
+            zip(self.__regions.starts, self.__regions.ends, strict=True))
+        # The data chunk is written separately, to avoid copying it
+        header = (
+            b'RIFF'
+            + struct.pack('<I', 4 + 8 + len(fmt) + len(cues) + 8 + len(raw))
+            + b'WAVE'
+            + _riff_chunk(b'fmt ', fmt)
+            + cues
+            + b'data' + struct.pack('<I', len(raw))
+        )
+        fd, temp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(raw)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
     def PasteFromTo(
         self,
         old: 'Sample',
@@ -203,7 +879,33 @@ class Sample:
               * `1`: Replace
 
               * `2`: Mix
+
+        ## Note:
+        * Outside of FL Studio, the whole of `old` is inserted before
+          `start`, replaces the range from `start` to `end`, or is mixed into
+          the range from `start` to `end` (truncating it to fit), depending on
+          the `mode`.
         """
+        chans = self.__chans
+        source = _as_floats(
+            _convert_channels(old.__data, old.__chans, chans))
+        a, b = self.__frames(start, end)
+        if mode == 2:
+            length = min(b - a, len(source))
+            view = self.__data[a:a + length]
+            self.__stream(
+                view,
+                lambda x, y: _mix(view[x:y], source[x:y]),
+                "Mixing",
+            )
+            return
+        if mode == 0:
+            b = a
+        result = array('f')
+        result.frombytes(self.__data[:a].cast('B'))
+        result.frombytes(source.cast('B'))
+        result.frombytes(self.__data[b:].cast('B'))
+        self.__data = _as_floats(result)
 
     def MsToSamples(self, time: float) -> int:
         """
@@ -215,7 +917,7 @@ class Sample:
         ## Returns:
         * `int`: position within the sample
         """
-        return 0
+        return round(time * self.__rate / 1000)
 
     def NormalizeFormat(
         self,
@@ -240,6 +942,10 @@ class Sample:
 
             Defaults to `0b001 | 0b010 | 0b100`, to copy all properties.
         """
+        if mode & 0b001:
+            self.NumChans = source.NumChans
+        if mode & 0b100:
+            self.SampleRate = source.SampleRate
 
     def GetRegion(self, index: int) -> Region:
         """
@@ -250,8 +956,119 @@ class Sample:
 
         ## Returns:
         * `Region`
+
+        ## Note:
+        * Outside of FL Studio, regions and markers are indexed in order of
+          their starting points.
+        """
+        regions = self.__regions
+        return Region(regions.starts[index], regions.ends[index])
+
+    def AddRegion(self, start: int, end: int | None = None) -> int:
         """
-        return Region()
+        Add a region or marker to this sample
+
+        ## Args:
+        * `start` (`int`): the starting point
+
+        * `end` (`int | None`, optional): the ending point (inclusive), or
+          `None` to add a marker. Defaults to `None`.
+
+        ## Returns:
+        * `int`: index of the new region
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        if end is None:
+            end = _MARKER_END
+        elif end < start:
+            raise ValueError(f"Region end {end} is before its start {start}")
+        return self.__regions.add(start, end)
+
+    def ClearRegions(self) -> None:
+        """
+        Remove all regions and markers from this sample
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        self.__regions = _RegionTable()
+
+    def RegionAt(self, position: int) -> int:
+        """
+        Returns the index of the region containing the given position
+
+        Markers are ignored. If regions overlap, the one that starts latest
+        is returned.
+
+        ## Args:
+        * `position` (`int`): position in the sample
+
+        ## Returns:
+        * `int`: index of the region, or `-1` if no region contains the
+          position
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        return self.__regions.at(position)
+
+    def RegionsInRange(self, start: int, end: int) -> list[int]:
+        """
+        Returns the indexes of the regions overlapping the range between the
+        `start` and `end` positions (inclusive), and of the markers within it
+
+        ## Args:
+        * `start` (`int`): the starting point
+
+        * `end` (`int`): the ending point
+
+        ## Returns:
+        * `list[int]`: indexes of the regions and markers, in order
+
+        ## Note:
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+        """
+        return self.__regions.query(start, end)
+
+    @property
+    def Regions(self) -> list[Region]:
+        """
+        The regions of this sample, excluding markers, in order of their
+        starting points.
+
+        ## Note:
+        * This property is not available in FL Studio, and is only provided
+          by these stubs, for use when testing scripts.
+        """
+        return [
+            Region(start, end)
+            for start, end in zip(
+                self.__regions.starts, self.__regions.ends, strict=True)
+            if end != _MARKER_END
+        ]
+
+    @property
+    def Markers(self) -> list[Region]:
+        """
+        The markers of this sample, excluding regions, in order of their
+        positions.
+
+        ## Note:
+        * This property is not available in FL Studio, and is only provided
+          by these stubs, for use when testing scripts.
+        """
+        return [
+            Region(start, end)
+            for start, end in zip(
+                self.__regions.starts, self.__regions.ends, strict=True)
+            if end == _MARKER_END
+        ]
 
     @property
     def Length(self) -> int:
@@ -261,7 +1078,7 @@ class Sample:
         For example, a 48 KHz sample that is 1 second long will have a length
         of `48_000`
         """
-        return 0
+        return len(self.__data) // self.__chans
 
     # @Length.setter
     # def Length(self, new_value: int) -> None:
@@ -274,11 +1091,16 @@ class Sample:
 
         For example, stereo audio has 2 channels.
         """
-        return 2
+        return self.__chans
 
     @NumChans.setter
     def NumChans(self, new_value: int) -> None:
-        pass
+        if new_value < 1:
+            raise ValueError(
+                f"NumChans must be at least 1 (got {new_value})")
+        self.__data = _as_floats(
+            _convert_channels(self.__data, self.__chans, new_value))
+        self.__chans = new_value
 
     @property
     def SampleRate(self) -> int:
@@ -287,11 +1109,11 @@ class Sample:
 
         For most audio clips, this will be `44_100` for 44.1 KHz.
         """
-        return 44_100
+        return self.__rate
 
     @SampleRate.setter
     def SampleRate(self, new_value: int) -> None:
-        pass
+        self.__rate = new_value
 
     @property
     def RegionCount(self) -> int:
@@ -301,7 +1123,7 @@ class Sample:
         Regions are specified using the yellow start and end markers in the
         Edison plugin's UI.
         """
-        return 0
+        return len(self.__regions)
 
 
 EditorSample = Sample()
@@ -16,6 +16,7 @@ for i in range(channels.channelCount()):
 from typing import Literal, overload
 
 import midi
+from fl_headless import getChannelRackModel
 
 
 def selectedChannel(
@@ -53,6 +54,10 @@ def selectedChannel(
 
     Included since API version 5
     """
+    model = getChannelRackModel()
+    if model is not None:
+        selected = model.getSelected(offset)
+        return selected if selected != -1 or canBeNone else 0
     return 0
 
 
@@ -80,6 +85,10 @@ def channelNumber(canBeNone: bool = False, offset: int = 0) -> int:
 
     Included since API version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        selected = model.getSelected(offset)
+        return selected if selected != -1 or canBeNone else 0
     return 0
 
 
@@ -100,6 +109,9 @@ def channelCount(globalCount: bool = False) -> int:
     Included since API version 1. (updated with optional parameter in API
     version 3).
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.channelCount
     return 0
 
 
@@ -123,6 +135,9 @@ def getChannelName(index: int, useGlobalIndex: bool = False) -> str:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.names[index] or model.defaultName(index)
     return ""
 
 
@@ -152,6 +167,9 @@ def setChannelName(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.names[index] = name
 
 
 def getChannelColor(index: int, useGlobalIndex: bool = False) -> int:
@@ -176,6 +194,9 @@ def getChannelColor(index: int, useGlobalIndex: bool = False) -> int:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.color[index]
     return 0
 
 
@@ -204,6 +225,9 @@ def setChannelColor(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.color[index] = color
 
 
 def isChannelMuted(index: int, useGlobalIndex: bool = False) -> bool:
@@ -227,6 +251,9 @@ def isChannelMuted(index: int, useGlobalIndex: bool = False) -> bool:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return bool(model.muted[index])
     return False
 
 
@@ -253,6 +280,10 @@ def muteChannel(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        mute = not model.muted[index] if value == -1 else bool(value)
+        model.muted[index] = mute
 
 
 def isChannelSolo(index: int, useGlobalIndex: bool = False) -> bool:
@@ -276,6 +307,9 @@ def isChannelSolo(index: int, useGlobalIndex: bool = False) -> bool:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return bool(model.solo[index])
     return False
 
 
@@ -296,6 +330,13 @@ def soloChannel(index: int, useGlobalIndex: bool = False) -> None:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        solo = not model.solo[index]
+        # Soloing a channel un-solos all the others
+        if solo:
+            model.solo[:] = bytes(len(model.solo))
+        model.solo[index] = solo
 
 
 def getChannelVolume(
@@ -330,6 +371,10 @@ def getChannelVolume(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        volume = model.volume[index]
+        return model.volumeToDb(volume) if mode else volume
     return 0.78125
 
 
@@ -363,6 +408,9 @@ def setChannelVolume(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.volume[index] = volume
 
 
 def getChannelPan(index: int, useGlobalIndex: bool = False) -> float:
@@ -388,6 +436,9 @@ def getChannelPan(index: int, useGlobalIndex: bool = False) -> float:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.pan[index]
     return 0.0
 
 
@@ -420,6 +471,9 @@ def setChannelPan(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.pan[index] = pan
 
 
 @overload
@@ -481,6 +535,13 @@ def getChannelPitch(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        if mode == 1:
+            return round(model.pitch[index] * model.pitchRange[index] * 100)
+        if mode == 2:
+            return model.pitchRange[index]
+        return model.pitch[index]
     return 0.0
 
 
@@ -524,6 +585,14 @@ def setChannelPitch(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        if mode == 1:
+            value /= model.pitchRange[index] * 100
+        elif mode == 2:
+            model.pitchRange[index] = int(value)
+            return
+        model.pitch[index] = max(-1.0, min(1.0, value))
 
 
 def getChannelType(index: int, useGlobalIndex: bool = False) -> int:
@@ -571,6 +640,9 @@ def isChannelSelected(index: int, useGlobalIndex: bool = False) -> bool:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return bool(model.selected[index])
     return False
 
 
@@ -595,6 +667,10 @@ def selectOneChannel(index: int, useGlobalIndex: bool = False) -> None:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.selected[:] = bytes(len(model.selected))
+        model.selected[index] = 1
 
 
 def selectChannel(
@@ -628,6 +704,10 @@ def selectChannel(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        select = not model.selected[index] if value == -1 else bool(value)
+        model.selected[index] = select
 
 
 def selectAll() -> None:
@@ -636,6 +716,9 @@ def selectAll() -> None:
 
     Included since API version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.selected[:] = b'\x01' * len(model.selected)
 
 
 def deselectAll() -> None:
@@ -644,6 +727,9 @@ def deselectAll() -> None:
 
     Included since API version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.selected[:] = bytes(len(model.selected))
 
 
 def getChannelMidiInPort(index: int, useGlobalIndex: bool = False) -> int:
@@ -700,6 +786,9 @@ def getChannelIndex(index: int) -> int:
 
     Included since API version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return index
     return 0
 
 
@@ -724,6 +813,9 @@ def getTargetFxTrack(index: int, useGlobalIndex: bool = False) -> int:
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.targetFxTrack[index]
     return 0
 
 
@@ -750,6 +842,9 @@ def setTargetFxTrack(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.targetFxTrack[channelIndex] = mixerIndex
 
 
 def getRecEventId(index: int, useGlobalIndex: bool = False) -> int:
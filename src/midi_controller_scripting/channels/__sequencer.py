@@ -36,6 +36,7 @@ fill_channel(2, 2, 0)
 fill_channel(3, 8, 4)
 ```
 """
+from fl_headless import getChannelRackModel
 
 
 def getGridBit(
@@ -65,6 +66,9 @@ def getGridBit(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return bool((model.grid[index] >> position) & 1)
     return False
 
 
@@ -96,6 +100,10 @@ def getGridBitWithLoop(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return bool(
+            (model.grid[index] >> (position % model.patternLength)) & 1)
     return False
 
 
@@ -125,6 +133,9 @@ def setGridBit(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.setGridBit(index, position, value)
 
 
 def isGridBitAssigned(index: int, useGlobalIndex: bool = False) -> bool:
@@ -171,10 +182,10 @@ def getStepParam(
 
     * `index` (`int`): channel index
 
-    * `offset` (`int`): step offset. This is added to the `step` value, but
-      allows you to look past the end of the pattern if the pattern length has
-      been limited (eg if the pattern length if `16`, `step` has a maximum of
-      `15`, but `offset` can be used to look further)
+    * `startPos` (`int`): step offset. This is added to the `step` value,
+      but allows you to look past the end of the pattern if the pattern length
+      has been limited (eg if the pattern length if `16`, `step` has a maximum
+      of `15`, but `startPos` can be used to look further)
 
     * `padsStride` (`int`, optional): pattern length control -- setting this
       value determines the pattern's length during the lookup, and is an
@@ -208,6 +219,13 @@ def getStepParam(
 
     Included since API version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        position = step + startPos
+        if position >= model.patternLength:
+            # Steps past the end of the pattern aren't stored
+            return model.stepParamDefault(param)
+        return model.getStepParam(index, position, param)
     return 0
 
 
@@ -257,6 +275,9 @@ def getCurrentStepParam(
 
     * v33: add `useGlobalIndex` flag.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        return model.getStepParam(index, step, param)
     return 0
 
 
@@ -300,6 +321,9 @@ def setStepParameterByIndex(
 
     Included since API Version 1.
     """
+    model = getChannelRackModel()
+    if model is not None:
+        model.setStepParam(index, step, param, value)
 
 
 def updateGraphEditor() -> None:
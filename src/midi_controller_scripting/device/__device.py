@@ -26,6 +26,7 @@ device.midiOutMsg(0x9, 0x0, 60, 100)
 from typing import overload
 
 from fl_classes import FlMidiMsg
+from fl_headless import getMidiOutputQueue, getRepeatScheduler
 
 
 def isAssigned() -> bool:
@@ -141,6 +142,15 @@ def midiOutMsg(
     Included since API version 1, with the component options added in API
     version 2.
     """
+    queue = getMidiOutputQueue()
+    if queue is not None:
+        if channel != -1:
+            message = (
+                ((message << 4) | channel)
+                | (data1 << 8)
+                | (data2 << 16)
+            )
+        queue.queueMessage(message)
 
 
 def midiOutNewMsg(slotIndex: int, message: int) -> None:
@@ -157,6 +167,9 @@ def midiOutNewMsg(slotIndex: int, message: int) -> None:
 
     Included since API version 1.
     """
+    queue = getMidiOutputQueue()
+    if queue is not None:
+        queue.queueSlotMessage(slotIndex, message)
 
 
 def midiOutSysex(message: bytes) -> None:
@@ -172,6 +185,9 @@ def midiOutSysex(message: bytes) -> None:
 
     Included since API version 1.
     """
+    queue = getMidiOutputQueue()
+    if queue is not None:
+        queue.queueSysex(message)
 
 
 def sendMsgGeneric(
@@ -208,6 +224,15 @@ def sendMsgGeneric(
 
     Deprecated since API version 9.
     """
+    queue = getMidiOutputQueue()
+    if queue is not None:
+        if message != lastMsg:
+            queue.queueSysex(
+                id.to_bytes(6, 'big')
+                + message.encode('ascii', 'replace')
+                + b'\xF7'
+            )
+        return message
     return ""
 
 
@@ -221,6 +246,13 @@ def directFeedback(eventData: FlMidiMsg, /) -> None:
 
     Included since API version 1.
     """
+    queue = getMidiOutputQueue()
+    if queue is not None:
+        if eventData.status == 0xF0:
+            queue.queueSysex(eventData.sysex)
+        else:
+            queue.queueMessage(
+                eventData.status | eventData.data1 << 8 | eventData.data2 << 16)
 
 
 def repeatMidiEvent(
@@ -243,6 +275,9 @@ def repeatMidiEvent(
 
     Included since API version 1.
     """
+    scheduler = getRepeatScheduler()
+    if scheduler is not None:
+        scheduler.repeat(eventData, delay, rate)
 
 
 def stopRepeatMidiEvent() -> None:
@@ -253,6 +288,9 @@ def stopRepeatMidiEvent() -> None:
 
     Included since API version 1.
     """
+    scheduler = getRepeatScheduler()
+    if scheduler is not None:
+        scheduler.cancelAll()
 
 
 def setMasterSync(value: bool) -> None:
@@ -19,6 +19,11 @@ to other scripts.
 * {{docs_url_page("Utilities", "midi_controller_scripting/device/util")}}:
   various utility functions for controlling script interaction with the
   connected device.
+
+* {{docs_url_page("Sysex", "midi_controller_scripting/device/sysex")}}:
+  build sysex messages which update many cells of the connected device at
+  once, and pack 8-bit data into 7-bit bytes. These are only provided by the
+  stubs.
 """
 
 __all__ = [
@@ -56,6 +61,9 @@ __all__ = [
     'setHasMeters',
     'baseTrackSelect',
     'hardwareRefreshMixerTrack',
+    'SysexBuilder',
+    'pack7Bit',
+    'unpack7Bit',
 ]
 
 from .__device import (
@@ -91,6 +99,7 @@ from .__fl import (
     linkToLastTweaked,
     processMIDICC,
 )
+from .__sysex import SysexBuilder, pack7Bit, unpack7Bit
 from .__util import (
     baseTrackSelect,
     createRefreshThread,
@@ -0,0 +1,377 @@
+"""
+Helpers for building sysex messages to send using `device.midiOutSysex`.
+
+Many controllers accept updates to many of their LEDs or display cells in a
+single sysex message. A `SysexBuilder` collects per-cell updates, and packs
+them into as few messages as the device's maximum payload size allows, so
+that a script can send one message per refresh rather than one per cell.
+
+NOTE: These helpers are not part of FL Studio's `device` module, and are only
+provided by these stubs. They can be used when testing a script, or copied
+into it.
+
+## Example usage
+
+Set the color of every pad on an AKAI Fire, where each update is the pad
+index followed by its red, green and blue (`0` - `127`).
+
+```py
+from device import SysexBuilder
+
+pads = SysexBuilder(b'\\x47\\x7F\\x43\\x65', lengthBytes=2)
+for i, (r, g, b) in enumerate(colors):
+    pads.setCell(i, bytes((r, g, b)))
+pads.flush()
+```
+"""
+from collections.abc import Callable
+
+from fl_classes import MidiBuffer
+
+from .__device import midiOutSysex
+
+_DATA_BYTES = bytes(range(0x80))
+"""
+Bytes that are valid within sysex data. Deleting them from a buffer using
+`bytes.translate` leaves any invalid bytes, without looping over it in Python.
+"""
+
+_LOW_BITS = bytes(b & 0x7F for b in range(0x100))
+"""
+Translation table that clears the high bit of each byte.
+"""
+
+_HIGH_BIT_TO_BIT = [
+    bytes((b >> 7) << i for b in range(0x100))
+    for i in range(7)
+]
+"""
+Translation tables that move the high bit of each byte to bit `i`, and clear
+the other bits.
+"""
+
+_BIT_TO_HIGH_BIT = [
+    bytes(((b >> i) & 1) << 7 for b in range(0x100))
+    for i in range(7)
+]
+"""
+Translation tables that move bit `i` of each byte to the high bit, and clear
+the other bits.
+"""
+
+
+def _checkData(data: bytes | bytearray, name: str) -> None:
+    """
+    Raise a `ValueError` if `data` contains any bytes that aren't valid
+    within sysex data.
+    """
+    if data.translate(None, _DATA_BYTES):
+        raise ValueError(
+            f"{name} must only contain 7-bit values (0x00 - 0x7F)")
+
+
+def _encodeValue(value: int, count: int) -> bytes:
+    """
+    Encode a value as `count` 7-bit bytes, most significant first.
+    """
+    if not 0 <= value < 1 << (7 * count):
+        raise ValueError(
+            f"{value} does not fit in {count} 7-bit byte(s)")
+    return bytes(
+        (value >> (7 * shift)) & 0x7F
+        for shift in reversed(range(count))
+    )
+
+
+def pack7Bit(data: MidiBuffer) -> bytearray:
+    """
+    Pack 8-bit data into 7-bit bytes, so that it can be included in a sysex
+    message.
+
+    Each group of 7 bytes is encoded as 8 bytes: a byte containing the high
+    bit of each byte in the group (the high bit of the first byte in bit `0`,
+    the second in bit `1`, and so on), followed by the lower 7 bits of each
+    byte. The final group may contain fewer than 7 bytes, so the result is
+    `len(data) + ceil(len(data) / 7)` bytes long. This is the format used by
+    many manufacturers, including Korg and Roland.
+
+    The data is processed using slicing and byte translation, rather than
+    looping over it in Python.
+
+    ## Args
+
+    * `data` (`bytes | bytearray | memoryview | mmap`): data to pack.
+
+    ## Returns
+
+    * `bytearray`: packed data.
+    """
+    length = len(data)
+    groups = -(-length // 7)
+    padded = bytes(data) + bytes(groups * 7 - length)
+    # The high bits of each group never overlap, so adding them as integers
+    # combines them without carrying
+    highs = sum(
+        int.from_bytes(padded[i::7].translate(table), 'big')
+        for i, table in enumerate(_HIGH_BIT_TO_BIT)
+    )
+    lows = padded.translate(_LOW_BITS)
+    packed = bytearray(groups * 8)
+    packed[0::8] = highs.to_bytes(groups, 'big')
+    for i in range(7):
+        packed[i + 1::8] = lows[i::7]
+    del packed[length + groups:]
+    return packed
+
+
+def unpack7Bit(data: MidiBuffer) -> bytearray:
+    """
+    Unpack 8-bit data from 7-bit bytes, as packed by `pack7Bit`.
+
+    ## Args
+
+    * `data` (`bytes | bytearray | memoryview | mmap`): packed data.
+
+    ## Raises
+
+    * `ValueError`: the data contains bytes that aren't valid within sysex
+      data, or its length isn't possible for packed data.
+
+    ## Returns
+
+    * `bytearray`: unpacked data.
+    """
+    length = len(data)
+    if length % 8 == 1:
+        raise ValueError(f"Invalid length for 7-bit packed data ({length})")
+    groups = -(-length // 8)
+    padded = bytes(data) + bytes(groups * 8 - length)
+    _checkData(padded, "Packed data")
+    highs = padded[0::8]
+    unpacked = bytearray(groups * 7)
+    for i, table in enumerate(_BIT_TO_HIGH_BIT):
+        # The low and high bits never overlap, so can be combined as integers
+        unpacked[i::7] = (
+            int.from_bytes(padded[i + 1::8], 'big')
+            | int.from_bytes(highs.translate(table), 'big')
+        ).to_bytes(groups, 'big')
+    del unpacked[length - groups:]
+    return unpacked
+
+
+class SysexBuilder:
+    """
+    Builds sysex messages for a device, by collecting updates to its cells
+    (such as LEDs or display characters), and packing them into as few
+    messages as possible.
+
+    Each message is made up of:
+
+    * `0xF0`
+    * the `header` (for example, the manufacturer ID, device ID and command)
+    * the length of the payload, if `lengthBytes` is non-zero
+    * the payload, which is a series of cell updates, each made up of the
+      index of the cell followed by its data
+    * `0xF7`
+    """
+
+    def __init__(
+        self,
+        header: bytes,
+        maxPayload: int = 256,
+        lengthBytes: int = 0,
+        indexBytes: int = 1,
+        send: Callable[[bytes], None] | None = None,
+    ) -> None:
+        """
+        Create a sysex builder with no pending updates.
+
+        ## Args
+
+        * `header` (`bytes`): bytes following the `0xF0` byte of each message.
+
+        * `maxPayload` (`int`, optional): maximum number of bytes in the
+          payload of each message, not including the header, length and
+          start and end bytes. Defaults to `256`.
+
+        * `lengthBytes` (`int`, optional): number of 7-bit bytes used to
+          encode the length of the payload after the header, most significant
+          first, or `0` if the device doesn't expect a length. Defaults to
+          `0`.
+
+        * `indexBytes` (`int`, optional): number of 7-bit bytes used to
+          encode the index of each cell, most significant first. Defaults to
+          `1`.
+
+        * `send` (`Callable[[bytes], None]`, optional): function to call with
+          each message. Defaults to `device.midiOutSysex`.
+        """
+        header = bytes(header)
+        _checkData(header, "header")
+        if maxPayload < 1:
+            raise ValueError(
+                f"maxPayload must be at least 1 (got {maxPayload})")
+        if lengthBytes:
+            # Make sure the largest payload's length can be encoded
+            _encodeValue(maxPayload, lengthBytes)
+        if indexBytes < 1:
+            raise ValueError(
+                f"indexBytes must be at least 1 (got {indexBytes})")
+        self.header = header
+        self.maxPayload = maxPayload
+        self.lengthBytes = lengthBytes
+        self.indexBytes = indexBytes
+        self.send = send if send is not None else midiOutSysex
+        self.__cells: dict[int, bytes] = {}
+        self.messagesSent = 0
+        """Number of messages sent"""
+        self.bytesSent = 0
+        """Number of bytes sent, including headers"""
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of cells with updates waiting to be sent.
+        """
+        return len(self.__cells)
+
+    def setCell(self, index: int, data: bytes) -> None:
+        """
+        Set the data of a cell. If the cell already has a pending update, it
+        is replaced.
+
+        ## Args
+
+        * `index` (`int`): index of the cell.
+
+        * `data` (`bytes`): data of the cell, which must only contain 7-bit
+          values.
+
+        ## Raises
+
+        * `ValueError`: the data is invalid, or the update is too large to fit
+          in a message.
+        """
+        data = bytes(data)
+        _checkData(data, "Cell data")
+        if self.indexBytes == 1 and 0 <= index < 0x80:
+            update = bytes((index,)) + data
+        else:
+            update = _encodeValue(index, self.indexBytes) + data
+        if len(update) > self.maxPayload:
+            raise ValueError(
+                f"Update for cell {index} ({len(update)} bytes) is larger "
+                f"than the maximum payload ({self.maxPayload} bytes)"
+            )
+        self.__cells[index] = update
+
+    def clear(self) -> None:
+        """
+        Discard all pending updates.
+        """
+        self.__cells.clear()
+
+    def __message(self, payload: bytes | memoryview) -> bytes:
+        """
+        Wrap a payload in a complete sysex message.
+        """
+        if self.lengthBytes:
+            length = _encodeValue(len(payload), self.lengthBytes)
+        else:
+            length = b''
+        return b''.join((b'\xF0', self.header, length, payload, b'\xF7'))
+
+    def buildMessages(self) -> list[bytes]:
+        """
+        Returns the messages for the pending updates, in the order that the
+        cells were first updated. Updates are never split across messages.
+        The pending updates are kept.
+        """
+        messages = []
+        batch: list[bytes] = []
+        size = 0
+        for update in self.__cells.values():
+            if size + len(update) > self.maxPayload:
+                messages.append(self.__message(b''.join(batch)))
+                batch = []
+                size = 0
+            batch.append(update)
+            size += len(update)
+        if batch:
+            messages.append(self.__message(b''.join(batch)))
+        return messages
+
+    def splitPayload(
+        self,
+        payload: MidiBuffer,
+        pack: bool = False,
+    ) -> list[bytes]:
+        """
+        Returns the messages needed to send a payload that may be larger than
+        the maximum payload of each message, splitting it into chunks.
+
+        ## Args
+
+        * `payload` (`bytes | bytearray | memoryview | mmap`): payload to
+          send.
+
+        * `pack` (`bool`, optional): whether the payload contains 8-bit data,
+          which should be packed using `pack7Bit`. Each chunk is packed
+          separately, so that it can be unpacked by itself. Defaults to
+          `False`.
+
+        ## Raises
+
+        * `ValueError`: the payload is invalid, or can't be split.
+        """
+        view = memoryview(payload).cast('B')
+        if pack:
+            # The largest whole number of 7-byte groups that fits once packed
+            chunk = self.maxPayload // 8 * 7
+            if chunk == 0:
+                raise ValueError(
+                    "maxPayload must be at least 8 to send packed data")
+            return [
+                self.__message(pack7Bit(view[start:start + chunk]))
+                for start in range(0, len(view), chunk)
+            ]
+        _checkData(view.tobytes(), "Payload")
+        chunk = self.maxPayload
+        return [
+            self.__message(view[start:start + chunk])
+            for start in range(0, len(view), chunk)
+        ]
+
+    def __send(self, messages: list[bytes]) -> int:
+        """
+        Send messages, returning the number sent.
+        """
+        send = self.send
+        for message in messages:
+            send(message)
+            self.bytesSent += len(message)
+        self.messagesSent += len(messages)
+        return len(messages)
+
+    def flush(self) -> int:
+        """
+        Send the pending updates, and clear them.
+
+        ## Returns
+
+        * `int`: number of messages sent.
+        """
+        messages = self.buildMessages()
+        self.__cells.clear()
+        return self.__send(messages)
+
+    def sendPayload(self, payload: MidiBuffer, pack: bool = False) -> int:
+        """
+        Send a payload, split into as many messages as required, as given by
+        `splitPayload`. Pending cell updates are not affected.
+
+        ## Returns
+
+        * `int`: number of messages sent.
+        """
+        return self.__send(self.splitPayload(payload, pack))
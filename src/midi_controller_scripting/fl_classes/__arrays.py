@@ -0,0 +1,166 @@
+"""
+Functions for working with arrays of raw event data, allowing whole recorded
+sessions to be filtered, transformed and compared without looping over
+`FlMidiMsg` objects in Python.
+
+Arrays of raw data are `array('I')` objects, where each item is a standard
+event, in the format given by `fl_classes.eventToRawData`. Any object which
+supports the buffer protocol with 32-bit unsigned items (such as a NumPy
+`uint32` array) is also accepted as input, and outputs can be viewed as NumPy
+arrays without copying them using `numpy.frombuffer`.
+"""
+import sys
+from array import array
+from collections.abc import Iterable
+
+from .__message import FlMidiMsg, isMidiMsgSysex
+from .__stream import MidiBuffer, iterRawData
+
+RawArray = array | memoryview
+"""
+An array of raw event data, or a `memoryview` of one.
+"""
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+assert array('I').itemsize == 4, "Expected 32-bit unsigned int arrays"
+
+
+def _as_bytes(data: 'RawArray | bytes | bytearray') -> memoryview:
+    """
+    Return a byte-wise view of a buffer, checking that its items are 32-bit.
+    """
+    view = memoryview(data)
+    if view.itemsize != 4:
+        raise TypeError(
+            f"Expected an array of 32-bit items (got {view.itemsize}-byte "
+            f"items of format {view.format!r})"
+        )
+    return view.cast('B')
+
+
+def eventsToRawArray(events: Iterable[FlMidiMsg]) -> array:
+    """
+    Convert standard events to an array of raw data.
+
+    ### Args:
+    * `events` (`Iterable[FlMidiMsg]`): standard events to convert
+
+    ### Raises:
+    * `ValueError`: an event was a sysex event
+
+    ### Returns:
+    * `array`: raw data of each event
+    """
+    def convert(event: FlMidiMsg) -> int:
+        if isMidiMsgSysex(event):
+            raise ValueError(
+                f"Cannot store sysex event {event!r} in an array of raw data")
+        return event.status + (event.data1 << 8) + (event.data2 << 16)
+
+    return array('I', map(convert, events))
+
+
+def rawArrayToEvents(data: RawArray) -> list[FlMidiMsg]:
+    """
+    Convert an array of raw data to standard events.
+
+    ### Args:
+    * `data` (`array | memoryview`): raw data to convert
+
+    ### Returns:
+    * `list[FlMidiMsg]`: events
+    """
+    status, data1, data2 = splitRawArray(data)
+    return list(map(FlMidiMsg, status, data1, data2))
+
+
+def splitRawArray(data: RawArray) -> tuple[bytes, bytes, bytes]:
+    """
+    Split an array of raw data into separate columns of status, data1 and
+    data2 bytes.
+
+    Any bits beyond the data2 byte are ignored.
+
+    ### Args:
+    * `data` (`array | memoryview`): raw data to split
+
+    ### Returns:
+    * `bytes`: status bytes
+
+    * `bytes`: data1 bytes
+
+    * `bytes`: data2 bytes
+
+    ### Example Usage
+
+    ```py
+    status, data1, data2 = splitRawArray(session)
+    # Count the note-on events for middle C
+    middle_c = sum(
+        1 for s, note in zip(status, data1)
+        if s & 0xF0 == 0x90 and note == 60
+    )
+    ```
+    """
+    raw = _as_bytes(data).tobytes()
+    if _LITTLE_ENDIAN:
+        return raw[0::4], raw[1::4], raw[2::4]
+    else:
+        return raw[3::4], raw[2::4], raw[1::4]
+
+
+def joinRawArray(
+    status: 'bytes | bytearray | memoryview',
+    data1: 'bytes | bytearray | memoryview',
+    data2: 'bytes | bytearray | memoryview',
+) -> array:
+    """
+    Join separate columns of status, data1 and data2 bytes into an array of
+    raw data. This is the inverse of `splitRawArray`.
+
+    ### Args:
+    * `status` (`bytes | bytearray | memoryview`): status bytes
+
+    * `data1` (`bytes | bytearray | memoryview`): data1 bytes
+
+    * `data2` (`bytes | bytearray | memoryview`): data2 bytes
+
+    ### Raises:
+    * `ValueError`: the columns have different lengths
+
+    ### Returns:
+    * `array`: raw data of each event
+    """
+    length = len(status)
+    if len(data1) != length or len(data2) != length:
+        raise ValueError(
+            f"Column lengths differ (status: {length}, data1: {len(data1)}, "
+            f"data2: {len(data2)})"
+        )
+    raw = bytearray(length * 4)
+    if _LITTLE_ENDIAN:
+        raw[0::4], raw[1::4], raw[2::4] = status, data1, data2
+    else:
+        raw[3::4], raw[2::4], raw[1::4] = status, data1, data2
+    result = array('I')
+    result.frombytes(raw)
+    return result
+
+
+def rawArrayFromStream(buffer: MidiBuffer) -> array:
+    """
+    Decode a buffer of raw MIDI data into an array of raw data, skipping any
+    sysex events.
+
+    Messages are decoded as described in `fl_classes.iterRawData`.
+
+    ### Args:
+    * `buffer` (`bytes | bytearray | memoryview | mmap`): buffer to decode
+
+    ### Returns:
+    * `array`: raw data of each standard event
+    """
+    return array('I', (
+        data for data in iterRawData(buffer) if isinstance(data, int)
+    ))
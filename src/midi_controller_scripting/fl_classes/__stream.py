@@ -0,0 +1,429 @@
+"""
+Functions for decoding streams of raw MIDI data (such as `.syx` dumps or
+captured MIDI port logs) into `FlMidiMsg` objects.
+
+Whole buffers can be decoded using `iterRawData` and `decodeMidiStream`. A
+`MidiStreamDecoder` decodes a stream that arrives in chunks (for example,
+when reading a large capture in blocks), continuing messages that are split
+between chunks.
+"""
+import re
+from collections.abc import Generator, Iterator
+from itertools import islice
+from mmap import mmap
+
+from .__message import FlMidiMsg
+
+MidiBuffer = bytes | bytearray | memoryview | mmap
+"""
+Types of buffer which can be decoded.
+"""
+
+_STATUS_BYTE = re.compile(rb'[\x80-\xFF]')
+"""
+Matches any status byte. Since `re` operates directly on buffer objects, this
+lets us scan through sysex data without copying it or looping over it in
+Python.
+"""
+
+_NON_REAL_TIME_STATUS = re.compile(rb'[\x80-\xF7]')
+"""
+Matches any status byte other than a real-time message, which ends a
+system-exclusive message.
+"""
+
+_REAL_TIME = bytes(range(0xF8, 0x100))
+"""
+Real-time status bytes, for deleting them from a buffer using
+`bytes.translate`.
+"""
+
+_IGNORED = 0xFF
+"""
+Placeholder in `_DATA_LENGTHS` for status bytes that don't begin a message.
+"""
+
+_DATA_LENGTHS = bytes(
+    # Data bytes (handled using running status)
+    [_IGNORED] * 0x80
+    # Note off, note on, key pressure, control change
+    + [2] * 0x40
+    # Program change, channel pressure
+    + [1] * 0x20
+    # Pitch bend
+    + [2] * 0x10
+    # Sysex (handled separately), MTC quarter frame, song position, song
+    # select, undefined, undefined, tune request, stray end of sysex
+    + [_IGNORED, 1, 2, 1, _IGNORED, _IGNORED, 0, _IGNORED]
+    # Real-time messages (handled separately)
+    + [0] * 0x08
+)
+"""
+Number of data bytes following each status byte.
+"""
+
+
+def iterRawData(buffer: MidiBuffer) -> Iterator[int | memoryview]:
+    """
+    Decode a buffer of raw MIDI data, yielding the raw data of each message
+    it contains.
+
+    Standard events are presented in the same format as
+    `fl_classes.eventToRawData`, as a little-endian integer where the status
+    byte has the lowest component value. Messages with fewer than two data
+    bytes are padded with zeros.
+
+    System-exclusive events are presented as a `memoryview` of the buffer,
+    from their `0xF0` byte to their `0xF7` byte (inclusive), meaning that
+    their data is not copied. Note that while any of these views exist,
+    the underlying buffer cannot be resized, and an `mmap` cannot be closed.
+
+    Decoding follows the MIDI specification:
+
+    * Running status is supported for channel messages, and is cancelled by
+      system common and system-exclusive messages.
+
+    * Real-time messages (`0xF8` - `0xFF`) may be interleaved within other
+      messages, and are yielded in the position that they appear.
+
+    * Messages that are truncated (either by the end of the buffer or by
+      another status byte), undefined status bytes and stray data bytes are
+      skipped.
+
+    ### Args:
+    * `buffer` (`bytes | bytearray | memoryview | mmap`): buffer to decode
+
+    ### Yields:
+    * `int | memoryview`: raw data of each message
+
+    ### Example Usage
+
+    ```py
+    with open("capture.bin", "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            note_ons = sum(
+                1
+                for data in iterRawData(buffer)
+                if isinstance(data, int) and data & 0xF0 == 0x90
+            )
+    ```
+    """
+    yield from _decode(memoryview(buffer).cast('B'), 0, 0, True)
+
+
+def _decode(
+    data: memoryview,
+    pos: int,
+    running: int,
+    final: bool,
+) -> Generator[int | memoryview, None, tuple[int, int]]:
+    """
+    Decode the messages in a buffer, starting from `pos`, given the running
+    status from the data before it.
+
+    If `final` is `False`, a message which is truncated by the end of the
+    buffer is left undecoded, since it may be continued by the next chunk of
+    the stream. Any real-time messages within it are still yielded.
+
+    Returns the position of the first undecoded byte (the end of the buffer,
+    unless a message was left undecoded), and the running status.
+    """
+    size = len(data)
+    while pos < size:
+        start = pos
+        byte = data[pos]
+        if byte < 0x80:
+            if not running:
+                # Stray data byte
+                pos += 1
+                continue
+            status = running
+        else:
+            pos += 1
+            if byte >= 0xF8:
+                yield byte
+                continue
+            if byte == 0xF0:
+                running = 0
+                end = yield from _sysex(data, pos)
+                if end is None:
+                    # Truncated by end of buffer
+                    return (size if final else start), running
+                pos = end
+                continue
+            status = byte
+            running = byte if byte < 0xF0 else 0
+
+        length = _DATA_LENGTHS[status]
+        # Fast path: the data bytes are all present and uninterrupted
+        if length == 2:
+            if pos + 1 < size:
+                data1 = data[pos]
+                data2 = data[pos + 1]
+                if data1 < 0x80 and data2 < 0x80:
+                    yield status | (data1 << 8) | (data2 << 16)
+                    pos += 2
+                    continue
+        elif length == 1:
+            if pos < size:
+                data1 = data[pos]
+                if data1 < 0x80:
+                    yield status | (data1 << 8)
+                    pos += 1
+                    continue
+        elif length == 0:
+            yield status
+            continue
+        else:
+            # Undefined or stray status byte
+            continue
+        pos = yield from _interrupted(data, pos, status, length)
+        if pos < 0:
+            # Truncated by end of buffer
+            return (size if final else start), running
+    return size, running
+
+
+def _interrupted(
+    data: memoryview,
+    pos: int,
+    status: int,
+    length: int,
+) -> Generator[int, None, int]:
+    """
+    Slow path for decoding the data bytes of a standard message, used when
+    they are interleaved with real-time messages, or are truncated.
+
+    Returns the position of the next byte to decode, or `-1` if the message
+    was truncated by the end of the buffer.
+    """
+    values: list[int] = []
+    size = len(data)
+    while len(values) < length and pos < size:
+        byte = data[pos]
+        if byte < 0x80:
+            values.append(byte)
+        elif byte >= 0xF8:
+            yield byte
+        else:
+            # Interrupted by another message, which we'll decode next
+            return pos
+        pos += 1
+    if len(values) < length:
+        return -1
+    raw = status
+    for i, value in enumerate(values):
+        raw |= value << (8 * (i + 1))
+    yield raw
+    return pos
+
+
+def _sysex(
+    data: memoryview,
+    pos: int,
+) -> Generator[int | memoryview, None, int | None]:
+    """
+    Decode a system-exclusive message, given the position of the byte
+    following its `0xF0` byte.
+
+    Returns the position of the next byte to decode, or `None` if the message
+    was truncated by the end of the buffer.
+    """
+    start = pos - 1
+    # Only needed if real-time messages are interleaved with the data
+    parts: list[memoryview] = []
+    while True:
+        match = _STATUS_BYTE.search(data, pos)
+        if match is None:
+            return None
+        end = match.start()
+        byte = data[end]
+        if byte == 0xF7:
+            if parts:
+                parts.append(data[start:end + 1])
+                yield memoryview(b''.join(parts))
+            else:
+                yield data[start:end + 1]
+            return end + 1
+        if byte < 0xF8:
+            # Interrupted by another message, which we'll decode next
+            return end
+        yield byte
+        parts.append(data[start:end])
+        start = pos = end + 1
+
+
+class MidiStreamDecoder:
+    """
+    Decodes a stream of raw MIDI data which arrives in chunks, yielding the
+    raw data of each message in the same format as `iterRawData`.
+
+    Messages which are split between chunks (including system-exclusive
+    messages, and data bytes using running status) are continued by the next
+    chunk. Real-time messages within a split message are yielded when they
+    are fed, before the message that contains them.
+
+    System-exclusive events that are contained within a single chunk are
+    yielded as a `memoryview` of it, so as for `iterRawData`, the chunk
+    shouldn't be modified while the views are in use. Those which are split
+    between chunks are copied. A message that is left incomplete at the end
+    of the stream is never yielded.
+
+    NOTE: This class is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ### Example Usage
+
+    ```py
+    decoder = MidiStreamDecoder()
+    with open("capture.bin", "rb") as f:
+        while chunk := f.read(65536):
+            for data in decoder.feed(chunk):
+                ...
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.__running = 0
+        self.__carry = b''
+        """
+        Incomplete message at the end of the previous chunk, starting with
+        its status byte, with any real-time bytes removed
+        """
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of bytes of an incomplete message waiting for the next chunk.
+        """
+        return len(self.__carry)
+
+    def reset(self) -> None:
+        """
+        Discard any incomplete message, and the running status, so that a new
+        stream can be decoded.
+        """
+        self.__running = 0
+        self.__carry = b''
+
+    def __completion(self, data: memoryview) -> int:
+        """
+        Returns the position in `data` where the incomplete message ends, or
+        the end of `data` if it doesn't end within it.
+        """
+        status = self.__carry[0]
+        if status == 0xF0:
+            match = _NON_REAL_TIME_STATUS.search(data)
+            if match is None:
+                return len(data)
+            return match.end() if data[match.start()] == 0xF7 \
+                else match.start()
+        needed = _DATA_LENGTHS[status] - (len(self.__carry) - 1)
+        pos = 0
+        while needed and pos < len(data):
+            byte = data[pos]
+            if byte < 0x80:
+                needed -= 1
+            elif byte < 0xF8:
+                # Interrupted by another message
+                break
+            pos += 1
+        return pos
+
+    def __keep(self, data: memoryview, pos: int) -> None:
+        """
+        Keep the incomplete message starting from `pos` for the next chunk.
+        """
+        carry = data[pos:].tobytes().translate(None, _REAL_TIME)
+        if data[pos] < 0x80:
+            # Continuing the running status
+            carry = bytes((self.__running,)) + carry
+        self.__carry = carry
+
+    def feed(self, chunk: MidiBuffer) -> Iterator[int | memoryview]:
+        """
+        Decode the next chunk of the stream.
+
+        ### Args:
+        * `chunk` (`bytes | bytearray | memoryview | mmap`): next chunk of
+          raw MIDI data
+
+        ### Yields:
+        * `int | memoryview`: raw data of each message completed by the
+          chunk
+        """
+        data = memoryview(chunk).cast('B')
+        pos = 0
+        if self.__carry:
+            # Finish the incomplete message first, copying only the part of
+            # the chunk that continues it
+            pos = self.__completion(data)
+            joined = memoryview(self.__carry + data[:pos].tobytes())
+            self.__carry = b''
+            # If it ends within the chunk, it is either complete, or was
+            # interrupted by another message and is skipped
+            end, self.__running = yield from _decode(
+                joined, 0, self.__running, pos < len(data))
+            if end < len(joined):
+                self.__keep(joined, end)
+                return
+        end, self.__running = yield from _decode(
+            data, pos, self.__running, False)
+        if end < len(data):
+            self.__keep(data, end)
+
+
+def decodeMidiStream(buffer: MidiBuffer) -> Iterator[FlMidiMsg]:
+    """
+    Lazily decode a buffer of raw MIDI data into `FlMidiMsg` objects.
+
+    Messages are decoded as described in `fl_classes.iterRawData`. The data
+    for system-exclusive events is only copied when their `FlMidiMsg` object
+    is created.
+
+    ### Args:
+    * `buffer` (`bytes | bytearray | memoryview | mmap`): buffer to decode
+
+    ### Yields:
+    * `FlMidiMsg`: each message
+
+    ### Example Usage
+
+    ```py
+    import device_MyController
+
+    with open("session.syx", "rb") as f:
+        for msg in decodeMidiStream(f.read()):
+            device_MyController.OnMidiMsg(msg)
+    ```
+    """
+    for data in iterRawData(buffer):
+        if isinstance(data, int):
+            yield FlMidiMsg(data & 0xFF, (data >> 8) & 0xFF, data >> 16)
+        else:
+            yield FlMidiMsg(data.tobytes())
+
+
+def decodeMidiStreamBatched(
+    buffer: MidiBuffer,
+    batchSize: int,
+) -> Iterator[list[FlMidiMsg]]:
+    """
+    Lazily decode a buffer of raw MIDI data into batches of `FlMidiMsg`
+    objects.
+
+    Messages are decoded as described in `fl_classes.iterRawData`. Each batch
+    contains `batchSize` messages, except for the last, which may be shorter.
+
+    ### Args:
+    * `buffer` (`bytes | bytearray | memoryview | mmap`): buffer to decode
+
+    * `batchSize` (`int`): number of messages in each batch
+
+    ### Returns:
+    * `Iterator[list[FlMidiMsg]]`: iterator over each batch of messages
+    """
+    if batchSize < 1:
+        raise ValueError(f"batchSize must be at least 1 (got {batchSize})")
+    messages = decodeMidiStream(buffer)
+    return iter(lambda: list(islice(messages, batchSize)), [])
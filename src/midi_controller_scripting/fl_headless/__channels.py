@@ -0,0 +1,499 @@
+"""
+An in-memory model of FL Studio's channel rack, which the functions in the
+`channels` module read and write while it is enabled.
+
+The step sequencer grid of each channel is stored as a packed bitset (an
+`int` where bit `n` is set if step `n` is active), so that whole rows and
+rectangular regions of the grid can be read and written using a single call
+to the model, rather than a call per step. Step parameters are stored as a
+typed array per channel, allocated the first time one of them is changed.
+
+Other properties of the channels are stored as a column (an `array` or
+`bytearray` with one item per channel).
+
+The model has no channel groups, so global and group indexes are the same,
+and it only stores the grid of the current pattern. Step parameters are only
+stored for the steps of the pattern, so `channels.getStepParam` gives the
+default value of the parameter for steps past the end of the pattern, and its
+`padsStride` has no effect.
+
+## Example usage
+
+```py
+import channels
+from fl_headless import ChannelRackModel, enableChannelRackModel
+
+rack = enableChannelRackModel(ChannelRackModel(channelCount=64))
+channels.setGridBit(0, 4, True)
+
+# Redraw an 8x8 pad grid using the state of the first 8 steps of the first
+# 8 channels
+for y, row in enumerate(rack.getGridRegion(0, 8, 0, 8)):
+    for x in range(8):
+        setPadLight(x, y, (row >> x) & 1)
+```
+"""
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+
+STEP_PARAM_DEFAULTS = (60, 100, 64, 120, 64, 64, 64, 0)
+"""
+Default value of each step parameter (pitch, velocity, release velocity,
+fine pitch, pan, mod X, mod Y and shift), as documented for
+`channels.getStepParam`.
+"""
+
+
+class ChannelRackModel:
+    """
+    State of the channel rack, including the step sequencer grid of the
+    current pattern.
+    """
+
+    def __init__(self, channelCount: int = 16, patternLength: int = 16) -> None:
+        """
+        Create a channel rack model, with every channel in its default state
+        and an empty grid.
+
+        ## Args
+
+        * `channelCount` (`int`, optional): number of channels. Defaults to
+          `16`. Up to `midi.REC_MaxChan` (`4096`) channels are supported by
+          FL Studio.
+
+        * `patternLength` (`int`, optional): number of steps in the grid of
+          each channel. Defaults to `16`.
+        """
+        if channelCount < 1:
+            raise ValueError(
+                f"channelCount must be at least 1 (got {channelCount})")
+        if patternLength < 1:
+            raise ValueError(
+                f"patternLength must be at least 1 (got {patternLength})")
+        self.channelCount = channelCount
+        self.__patternLength = patternLength
+        self.grid = [0] * channelCount
+        """Active steps of each channel, as a bitset"""
+        self.stepParams: dict[int, array] = {}
+        """
+        Step parameters of each channel which has had them changed, indexed
+        by `param * patternLength + step`
+        """
+        self.names = [''] * channelCount
+        """Custom names of each channel (`''` for the default name)"""
+        self.color = array('q', [0]) * channelCount
+        self.volume = array('d', [1000 / 1280]) * channelCount
+        self.pan = array('d', [0.0]) * channelCount
+        self.pitch = array('d', [0.0]) * channelCount
+        """Pitch bend of each channel, as a factor of its pitch range"""
+        self.pitchRange = array('H', [2]) * channelCount
+        """Pitch range of each channel, in semitones"""
+        self.targetFxTrack = array('H', [0]) * channelCount
+        self.muted = bytearray(channelCount)
+        self.solo = bytearray(channelCount)
+        self.selected = bytearray(channelCount)
+        # Only the first channel is selected by default
+        self.selected[0] = 1
+
+    @property
+    def patternLength(self) -> int:
+        """
+        Number of steps in the grid of each channel.
+
+        Setting this truncates or extends the grid and step parameters of
+        every channel. Extended steps are inactive, and have the default
+        value of each step parameter.
+        """
+        return self.__patternLength
+
+    @patternLength.setter
+    def patternLength(self, length: int) -> None:
+        if length < 1:
+            raise ValueError(
+                f"patternLength must be at least 1 (got {length})")
+        old = self.__patternLength
+        mask = (1 << length) - 1
+        self.grid = [bits & mask for bits in self.grid]
+        for index, params in self.stepParams.items():
+            # The step parameters are laid out by `param * patternLength`, so
+            # each parameter's column needs to be moved
+            resized = array('H')
+            for param, default in enumerate(STEP_PARAM_DEFAULTS):
+                column = params[param * old:param * old + min(old, length)]
+                resized.extend(column)
+                resized.extend(array('H', [default]) * (length - len(column)))
+            self.stepParams[index] = resized
+        self.__patternLength = length
+
+    def defaultName(self, index: int) -> str:
+        """
+        Returns the name of the channel at `index` when it hasn't been
+        renamed.
+        """
+        return f"Channel {index + 1}"
+
+    def volumeToDb(self, value: float) -> float:
+        """
+        Convert a normalized channel volume to decibels. This approximates FL
+        Studio's scale, treating the volume as a linear gain where the
+        default volume is 0 dB.
+        """
+        if value <= 0:
+            return float('-inf')
+        return 20 * math.log10(value * 1280 / 1000)
+
+    def getSelected(self, offset: int = 0) -> int:
+        """
+        Returns the index of the nth selected channel, where n is `offset` +
+        1, or the last selected channel if fewer channels are selected. If no
+        channels are selected, `-1` is returned.
+        """
+        found = self.selected.find(1)
+        while found != -1 and offset > 0:
+            following = self.selected.find(1, found + 1)
+            if following == -1:
+                break
+            found = following
+            offset -= 1
+        return found
+
+    def __mask(self, start: int, length: int | None) -> tuple[int, int]:
+        """
+        Returns the number of steps in a range of the grid, and a mask of that
+        many bits.
+        """
+        if length is None:
+            length = self.patternLength - start
+        if start < 0 or length < 0 or start + length > self.patternLength:
+            raise IndexError(
+                f"Steps {start} - {start + length - 1} are outside the "
+                f"pattern (length {self.patternLength})"
+            )
+        return length, (1 << length) - 1
+
+    def getGridRow(
+        self,
+        index: int,
+        start: int = 0,
+        length: int | None = None,
+    ) -> int:
+        """
+        Returns the active steps of a range of the grid of the channel at
+        `index`, as a bitset.
+
+        ## Args
+
+        * `index` (`int`): channel index.
+
+        * `start` (`int`, optional): first step to get. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to get. Defaults to the
+          remainder of the pattern.
+
+        ## Returns
+
+        * `int`: bitset, where bit `n` is set if step `start + n` is active.
+        """
+        _, mask = self.__mask(start, length)
+        return (self.grid[index] >> start) & mask
+
+    def setGridRow(
+        self,
+        index: int,
+        bits: int,
+        start: int = 0,
+        length: int | None = None,
+    ) -> None:
+        """
+        Sets the active steps of a range of the grid of the channel at
+        `index`, from a bitset.
+
+        ## Args
+
+        * `index` (`int`): channel index.
+
+        * `bits` (`int`): bitset, where bit `n` is set if step `start + n`
+          should be active. Bits beyond `length` are ignored.
+
+        * `start` (`int`, optional): first step to set. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to set. Defaults to the
+          remainder of the pattern.
+        """
+        _, mask = self.__mask(start, length)
+        self.grid[index] = (
+            (self.grid[index] & ~(mask << start))
+            | ((bits & mask) << start)
+        )
+
+    def getGridRegion(
+        self,
+        index: int,
+        count: int,
+        start: int = 0,
+        length: int | None = None,
+    ) -> list[int]:
+        """
+        Returns the active steps of a rectangular region of the grid, as a
+        bitset for each channel.
+
+        ## Args
+
+        * `index` (`int`): first channel index.
+
+        * `count` (`int`): number of channels.
+
+        * `start` (`int`, optional): first step to get. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to get. Defaults to the
+          remainder of the pattern.
+
+        ## Returns
+
+        * `list[int]`: bitset for each channel, as given by `getGridRow`.
+        """
+        _, mask = self.__mask(start, length)
+        return [
+            (row >> start) & mask
+            for row in self.grid[index:index + count]
+        ]
+
+    def setGridRegion(
+        self,
+        index: int,
+        rows: Iterable[int],
+        start: int = 0,
+        length: int | None = None,
+    ) -> None:
+        """
+        Sets the active steps of a rectangular region of the grid, from a
+        bitset for each channel.
+
+        ## Args
+
+        * `index` (`int`): first channel index.
+
+        * `rows` (`Iterable[int]`): bitset for each channel, as given to
+          `setGridRow`.
+
+        * `start` (`int`, optional): first step to set. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to set. Defaults to the
+          remainder of the pattern.
+        """
+        _, mask = self.__mask(start, length)
+        clear = ~(mask << start)
+        grid = self.grid
+        for i, bits in enumerate(rows, index):
+            grid[i] = (grid[i] & clear) | ((bits & mask) << start)
+
+    def fillGrid(self, index: int, interval: int, offset: int = 0) -> None:
+        """
+        Set every `interval` steps of the grid of the channel at `index`
+        active, starting from `offset`. Other steps are cleared.
+
+        ## Args
+
+        * `index` (`int`): channel index.
+
+        * `interval` (`int`): number of steps between each active step.
+
+        * `offset` (`int`, optional): first active step. Defaults to `0`.
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be at least 1 (got {interval})")
+        bits = 0
+        for step in range(offset % interval, self.patternLength, interval):
+            bits |= 1 << step
+        self.grid[index] = bits
+
+    def setGridBit(self, index: int, step: int, value: bool) -> None:
+        """
+        Set whether a single step of the grid of the channel at `index` is
+        active.
+        """
+        self.__mask(step, 1)
+        if value:
+            self.grid[index] |= 1 << step
+        else:
+            self.grid[index] &= ~(1 << step)
+
+    def clearGrid(self) -> None:
+        """
+        Clear every step of the grid, and reset all step parameters.
+        """
+        self.grid = [0] * self.channelCount
+        self.stepParams.clear()
+
+    def stepParamDefault(self, param: int) -> int:
+        """
+        Returns the default value of a step parameter, as listed for
+        `channels.getStepParam`.
+
+        ## Raises
+
+        * `ValueError`: `param` isn't a step parameter type.
+        """
+        if not 0 <= param < len(STEP_PARAM_DEFAULTS):
+            raise ValueError(
+                f"Step parameter type must be 0 - "
+                f"{len(STEP_PARAM_DEFAULTS) - 1} (got {param})"
+            )
+        return STEP_PARAM_DEFAULTS[param]
+
+    def getStepParams(
+        self,
+        index: int,
+        param: int,
+        start: int = 0,
+        length: int | None = None,
+    ) -> array:
+        """
+        Returns the values of a step parameter for a range of steps of the
+        channel at `index`.
+
+        ## Args
+
+        * `index` (`int`): channel index.
+
+        * `param` (`int`): step parameter type, as listed for
+          `channels.getStepParam`.
+
+        * `start` (`int`, optional): first step to get. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to get. Defaults to the
+          remainder of the pattern.
+
+        ## Returns
+
+        * `array`: value of the parameter for each step.
+        """
+        default = self.stepParamDefault(param)
+        length, _ = self.__mask(start, length)
+        params = self.stepParams.get(index)
+        if params is None:
+            return array('H', [default]) * length
+        offset = param * self.patternLength + start
+        return params[offset:offset + length]
+
+    def setStepParams(
+        self,
+        index: int,
+        param: int,
+        values: Sequence[int],
+        start: int = 0,
+    ) -> None:
+        """
+        Sets the values of a step parameter for a range of steps of the
+        channel at `index`.
+
+        ## Args
+
+        * `index` (`int`): channel index.
+
+        * `param` (`int`): step parameter type, as listed for
+          `channels.getStepParam`.
+
+        * `values` (`Sequence[int]`): value of the parameter for each step.
+
+        * `start` (`int`, optional): first step to set. Defaults to `0`.
+        """
+        self.stepParamDefault(param)
+        length, _ = self.__mask(start, len(values))
+        offset = param * self.patternLength + start
+        self.__params(index)[offset:offset + length] = array('H', values)
+
+    def __params(self, index: int) -> array:
+        """
+        Returns the step parameters of the channel at `index`, allocating
+        them if needed.
+        """
+        params = self.stepParams.get(index)
+        if params is None:
+            if not 0 <= index < self.channelCount:
+                raise IndexError(f"Channel index {index} out of range")
+            params = array('H')
+            for default in STEP_PARAM_DEFAULTS:
+                params.extend(array('H', [default]) * self.patternLength)
+            self.stepParams[index] = params
+        return params
+
+    def getStepParam(self, index: int, step: int, param: int) -> int:
+        """
+        Returns the value of a step parameter for a single step of the
+        channel at `index`.
+
+        ## Raises
+
+        * `ValueError`: `param` isn't a step parameter type.
+
+        * `IndexError`: `step` is outside the pattern.
+        """
+        default = self.stepParamDefault(param)
+        self.__mask(step, 1)
+        params = self.stepParams.get(index)
+        if params is None:
+            return default
+        return params[param * self.patternLength + step]
+
+    def setStepParam(
+        self,
+        index: int,
+        step: int,
+        param: int,
+        value: int,
+    ) -> None:
+        """
+        Sets the value of a step parameter for a single step of the channel at
+        `index`.
+
+        ## Raises
+
+        * `ValueError`: `param` isn't a step parameter type.
+
+        * `IndexError`: `step` is outside the pattern.
+        """
+        self.stepParamDefault(param)
+        self.__mask(step, 1)
+        self.__params(index)[param * self.patternLength + step] = value
+
+
+_model: ChannelRackModel | None = None
+
+
+def enableChannelRackModel(
+    model: ChannelRackModel | None = None,
+) -> ChannelRackModel:
+    """
+    Enable a channel rack model, so that the functions in the `channels`
+    module read and write its state.
+
+    ## Args
+
+    * `model` (`ChannelRackModel`, optional): model to enable. Defaults to a
+      new model in the default state.
+
+    ## Returns
+
+    * `ChannelRackModel`: the enabled model.
+    """
+    global _model
+    _model = model if model is not None else ChannelRackModel()
+    return _model
+
+
+def disableChannelRackModel() -> None:
+    """
+    Disable the channel rack model, so that the functions in the `channels`
+    module return their default values again.
+    """
+    global _model
+    _model = None
+
+
+def getChannelRackModel() -> ChannelRackModel | None:
+    """
+    Returns the enabled channel rack model, or `None` if no model is enabled.
+    """
+    return _model
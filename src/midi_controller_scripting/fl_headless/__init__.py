@@ -0,0 +1,108 @@
+"""
+{{module_title[fl_headless]}}
+
+This module provides a headless emulation of parts of FL Studio's runtime,
+so that device scripts can be driven, tested and profiled outside of FL
+Studio, for example as part of a CI pipeline.
+
+NOTE: This module is not included in FL Studio's runtime, and should only be
+imported by code used to test your script, not by the script itself.
+
+## Contents
+
+* {{docs_url_page("Replay", "midi_controller_scripting/fl_headless/replay")}}:
+  drive a device script through FL Studio's callback lifecycle by replaying
+  recorded MIDI events through it.
+
+* {{docs_url_page("Profiler", "midi_controller_scripting/fl_headless/profiler")}}:
+  measure the time and memory used by a script's callbacks, and check them
+  against time budgets.
+
+* {{docs_url_page("Mixer", "midi_controller_scripting/fl_headless/mixer")}}:
+  an in-memory model of the mixer, which the functions in the `mixer` module
+  read and write while it is enabled.
+
+* {{docs_url_page("Channels", "midi_controller_scripting/fl_headless/channels")}}:
+  an in-memory model of the channel rack and step sequencer, which the
+  functions in the `channels` module read and write while it is enabled.
+
+* {{docs_url_page("Screen", "midi_controller_scripting/fl_headless/screen")}}:
+  a framebuffer model of the AKAI Fire's screen, which the functions in the
+  `screen` module draw to while it is enabled, and which only pushes the
+  changed parts of each frame.
+
+* {{docs_url_page("Output", "midi_controller_scripting/fl_headless/output")}}:
+  a queue for the MIDI messages sent by the functions in the `device` module,
+  which drops redundant messages and coalesces updates to the same control.
+
+* {{docs_url_page("Repeat", "midi_controller_scripting/fl_headless/repeat")}}:
+  a timer wheel which schedules the events repeated using
+  `device.repeatMidiEvent`, so that they can be dispatched to the script.
+"""
+
+__all__ = [
+    'loadScript',
+    'CallbackTimings',
+    'ReplayReport',
+    'ReplayEngine',
+    'CALLBACKS',
+    'CallbackProfile',
+    'CallbackProfiler',
+    'MixerModel',
+    'enableMixerModel',
+    'disableMixerModel',
+    'getMixerModel',
+    'STEP_PARAM_DEFAULTS',
+    'ChannelRackModel',
+    'enableChannelRackModel',
+    'disableChannelRackModel',
+    'getChannelRackModel',
+    'FONTS',
+    'ScreenModel',
+    'enableScreenModel',
+    'disableScreenModel',
+    'getScreenModel',
+    'MidiOutputQueue',
+    'enableMidiOutputQueue',
+    'disableMidiOutputQueue',
+    'getMidiOutputQueue',
+    'RepeatScheduler',
+    'enableRepeatScheduler',
+    'disableRepeatScheduler',
+    'getRepeatScheduler',
+]
+
+from .__channels import (
+    STEP_PARAM_DEFAULTS,
+    ChannelRackModel,
+    disableChannelRackModel,
+    enableChannelRackModel,
+    getChannelRackModel,
+)
+from .__mixer import (
+    MixerModel,
+    disableMixerModel,
+    enableMixerModel,
+    getMixerModel,
+)
+from .__output import (
+    MidiOutputQueue,
+    disableMidiOutputQueue,
+    enableMidiOutputQueue,
+    getMidiOutputQueue,
+)
+from .__profiler import CALLBACKS, CallbackProfile, CallbackProfiler
+from .__repeat import (
+    RepeatScheduler,
+    disableRepeatScheduler,
+    enableRepeatScheduler,
+    getRepeatScheduler,
+)
+from .__replay import CallbackTimings, ReplayEngine, ReplayReport, loadScript
+from .__screen import (
+    FONTS,
+    ScreenModel,
+    disableScreenModel,
+    enableScreenModel,
+    getScreenModel,
+)
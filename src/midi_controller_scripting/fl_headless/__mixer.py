@@ -0,0 +1,160 @@
+"""
+An in-memory model of FL Studio's mixer, which the functions in the `mixer`
+module read and write while it is enabled.
+
+Each property of the mixer tracks is stored as a column (an `array` or
+`bytearray` with one item per track), so that accessing it costs little more
+than indexing a list, and so that whole columns can be inspected or modified
+at once by tests.
+
+## Example usage
+
+```py
+import mixer
+from fl_headless import disableMixerModel, enableMixerModel
+
+model = enableMixerModel()
+mixer.setTrackVolume(1, 0.5)
+assert model.volume[1] == 0.5
+
+# Simulate audio on the master track
+model.peaksLeft[0] = model.peaksRight[0] = 0.7
+script.OnUpdateMeters()
+
+disableMixerModel()
+```
+"""
+from array import array
+
+
+class MixerModel:
+    """
+    State of the mixer, stored as a column per track property.
+
+    Tracks are zero-indexed, with the master track at index `0`, followed by
+    the insert tracks, and the "current" track at the end, matching the
+    layout used by FL Studio.
+    """
+
+    def __init__(self, trackCount: int = 127, eqBands: int = 3) -> None:
+        """
+        Create a mixer model, with every track in its default state.
+
+        ## Args
+
+        * `trackCount` (`int`, optional): number of tracks, including the
+          master and "current" tracks. Defaults to `127`, as in FL Studio 20
+          and newer.
+
+        * `eqBands` (`int`, optional): number of bands in the built-in EQ of
+          each track. Defaults to `3`.
+        """
+        if trackCount < 3:
+            raise ValueError(
+                f"trackCount must be at least 3 (got {trackCount})")
+        if eqBands < 1:
+            raise ValueError(f"eqBands must be at least 1 (got {eqBands})")
+        self.trackCount = trackCount
+        self.eqBands = eqBands
+        self.slotCount = 10
+        """Number of effect slots on each track"""
+        self.names = [''] * trackCount
+        """Custom names of each track (`''` for the default name)"""
+        self.color = array('q', [0]) * trackCount
+        self.slotColor = array('q', [0]) * (trackCount * self.slotCount)
+        """Colors of effect slots, indexed by `track * slotCount + slot`"""
+        self.volume = array('d', [0.8]) * trackCount
+        self.pan = array('d', [0.0]) * trackCount
+        self.stereoSep = array('d', [0.0]) * trackCount
+        self.peaksLeft = array('d', [0.0]) * trackCount
+        self.peaksRight = array('d', [0.0]) * trackCount
+        self.muted = bytearray(trackCount)
+        self.solo = bytearray(trackCount)
+        self.armed = bytearray(trackCount)
+        self.selected = bytearray(trackCount)
+        self.slotsEnabled = bytearray(b'\x01') * trackCount
+        self.revPolarity = bytearray(trackCount)
+        self.swapChannels = bytearray(trackCount)
+        self.eqGain = array('d', [0.5]) * (trackCount * eqBands)
+        """EQ band gains, indexed by `track * eqBands + band`"""
+        self.eqFrequency = array('d', [0.5]) * (trackCount * eqBands)
+        """EQ band frequencies, indexed by `track * eqBands + band`"""
+        self.eqBandwidth = array('d', [0.5]) * (trackCount * eqBands)
+        """EQ band bandwidths, indexed by `track * eqBands + band`"""
+        self.routes: dict[int, dict[int, float]] = {}
+        """
+        Sparse routing matrix, mapping source tracks to the tracks they send
+        to, and the level of each send
+        """
+        self.events: dict[int, int] = {}
+        """Values of automated events, by event ID"""
+        # Only the master track is selected by default
+        self.selected[0] = 1
+        # All inserts route to the master track by default
+        for track in range(1, trackCount - 1):
+            self.routes[track] = {0: 0.8}
+
+    def defaultName(self, index: int) -> str:
+        """
+        Returns the name FL Studio gives to the track at `index` when it
+        hasn't been renamed.
+        """
+        if index == 0:
+            return "Master"
+        if index == self.trackCount - 1:
+            return "Current"
+        return f"Insert {index}"
+
+    def eqGainToDb(self, value: float) -> float:
+        """
+        Convert a normalized EQ gain to decibels. This approximates FL
+        Studio's scale, mapping `0.0` - `1.0` linearly to -18 dB - +18 dB.
+        """
+        return (value - 0.5) * 36.0
+
+    def eqFrequencyToHz(self, value: float) -> float:
+        """
+        Convert a normalized EQ frequency to Hz. This approximates FL
+        Studio's scale, mapping `0.0` - `1.0` logarithmically to
+        20 Hz - 20 kHz.
+        """
+        return 20.0 * 1000.0 ** value
+
+
+_model: MixerModel | None = None
+
+
+def enableMixerModel(model: MixerModel | None = None) -> MixerModel:
+    """
+    Enable a mixer model, so that the functions in the `mixer` module read
+    and write its state.
+
+    ## Args
+
+    * `model` (`MixerModel`, optional): model to enable. Defaults to a new
+      model in the default state.
+
+    ## Returns
+
+    * `MixerModel`: the enabled model.
+    """
+    global _model
+    _model = model if model is not None else MixerModel()
+    return _model
+
+
+def disableMixerModel() -> None:
+    """
+    Disable the mixer model, so that the functions in the `mixer` module
+    return their default values again.
+    """
+    global _model
+    _model = None
+
+
+def getMixerModel() -> MixerModel | None:
+    """
+    Returns the enabled mixer model, or `None` if no model is enabled.
+    """
+    return _model
+
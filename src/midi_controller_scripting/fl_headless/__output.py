@@ -0,0 +1,222 @@
+"""
+A queue for the MIDI messages that a script sends to its device, which the
+output functions in the `device` module send to while it is enabled.
+
+Rather than sending messages immediately, the queue holds them until it is
+flushed, which the `ReplayEngine` does after each call to `OnIdle`. Messages
+are keyed by their status and first data byte, so that:
+
+* a message that would set a control to the value it already has on the
+  device (according to a shadow of the last value sent for each key) is
+  dropped, and
+* when a control is updated more than once before the queue is flushed, only
+  its final value is sent.
+
+This means that a script which redraws all of its LEDs on every refresh only
+sends messages for the LEDs that changed. Sysex messages can't be coalesced,
+but identical sysex messages within a single flush are only sent once.
+
+## Example usage
+
+```py
+from fl_headless import ReplayEngine, enableMidiOutputQueue, loadScript
+
+queue = enableMidiOutputQueue()
+ReplayEngine(loadScript("device_MyController.py")).replay(events)
+print(f"{queue.messagesSuppressed} messages suppressed, "
+      f"{queue.bytesSaved} bytes saved")
+```
+"""
+from collections.abc import Callable
+
+
+def _messageSize(status: int) -> int:
+    """
+    Returns the number of bytes in a short MIDI message with the given status
+    byte.
+    """
+    if 0xC0 <= status < 0xE0 or status in (0xF1, 0xF3):
+        return 2
+    if status >= 0xF4 or status == 0xF0:
+        return 1
+    return 3
+
+
+class MidiOutputQueue:
+    """
+    Queue of outgoing MIDI messages, which drops redundant messages and
+    coalesces updates to the same control.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int | bytes], None] | None = None,
+    ) -> None:
+        """
+        Create an empty output queue.
+
+        ## Args
+
+        * `send` (`Callable[[int | bytes], None]`, optional): function to call
+          with each message when the queue is flushed. Short messages are
+          given as an `int` packed in the same way as for
+          `device.midiOutMsg`, and sysex messages as `bytes`. Defaults to
+          appending the messages to `output`.
+        """
+        self.output: list[int | bytes] = []
+        """Messages sent by the queue, if no `send` function was given"""
+        self.send = send if send is not None else self.output.append
+        self.shadow: dict[int, int] = {}
+        """
+        Last value (data 2) sent for each key (status and data 1, as packed
+        in the lower two bytes of a message)
+        """
+        self.slots: dict[int, int] = {}
+        """Last message given for each slot of `device.midiOutNewMsg`"""
+        self.__pending: dict[int | bytes, int] = {}
+        self.messagesQueued = 0
+        """Number of messages added to the queue"""
+        self.messagesSent = 0
+        """Number of messages sent when flushing the queue"""
+        self.bytesSent = 0
+        """Number of bytes sent when flushing the queue"""
+        self.bytesSaved = 0
+        """Number of bytes in messages that were dropped or coalesced"""
+
+    @property
+    def messagesSuppressed(self) -> int:
+        """
+        Number of messages that were dropped or coalesced, rather than sent.
+        """
+        return self.messagesQueued - self.messagesSent - len(self.__pending)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of messages waiting to be sent.
+        """
+        return len(self.__pending)
+
+    def queueMessage(self, message: int) -> None:
+        """
+        Add a short MIDI message to the queue.
+
+        ## Args
+
+        * `message` (`int`): message, packed as for `device.midiOutMsg`, with
+          the status in the lowest byte.
+        """
+        self.messagesQueued += 1
+        key = message & 0xFFFF
+        value = (message >> 16) & 0xFF
+        pending = self.__pending
+        if key in pending:
+            # Coalesce with the earlier update, keeping its place in the
+            # queue
+            self.bytesSaved += _messageSize(message & 0xFF)
+            pending[key] = value
+        elif self.shadow.get(key) == value:
+            self.bytesSaved += _messageSize(message & 0xFF)
+        else:
+            pending[key] = value
+
+    def queueSlotMessage(self, slotIndex: int, message: int) -> None:
+        """
+        Add a short MIDI message to the queue, unless it is the same as the
+        last message given for `slotIndex`, as for `device.midiOutNewMsg`.
+        """
+        if self.slots.get(slotIndex) == message:
+            self.messagesQueued += 1
+            self.bytesSaved += _messageSize(message & 0xFF)
+            return
+        self.slots[slotIndex] = message
+        self.queueMessage(message)
+
+    def queueSysex(self, message: bytes) -> None:
+        """
+        Add a sysex message to the queue.
+
+        ## Args
+
+        * `message` (`bytes`): message, including its `0xF0` and `0xF7`
+          bytes.
+        """
+        self.messagesQueued += 1
+        message = bytes(message)
+        if message in self.__pending:
+            self.bytesSaved += len(message)
+        else:
+            self.__pending[message] = 0
+
+    def flush(self) -> None:
+        """
+        Send the queued messages, in the order they were first queued.
+        """
+        pending = self.__pending
+        if not pending:
+            return
+        self.__pending = {}
+        shadow = self.shadow
+        send = self.send
+        for key, value in pending.items():
+            if isinstance(key, bytes):
+                send(key)
+                self.bytesSent += len(key)
+            elif shadow.get(key) == value:
+                # Changed back to the value on the device before the flush
+                self.bytesSaved += _messageSize(key & 0xFF)
+                continue
+            else:
+                shadow[key] = value
+                send(key | value << 16)
+                self.bytesSent += _messageSize(key & 0xFF)
+            self.messagesSent += 1
+
+    def reset(self) -> None:
+        """
+        Forget the state of the device, so that the next message for each
+        control is sent, for example after the device is reconnected. Queued
+        messages are kept.
+        """
+        self.shadow.clear()
+        self.slots.clear()
+
+
+_queue: MidiOutputQueue | None = None
+
+
+def enableMidiOutputQueue(
+    queue: MidiOutputQueue | None = None,
+) -> MidiOutputQueue:
+    """
+    Enable an output queue, so that the output functions in the `device`
+    module send messages to it.
+
+    ## Args
+
+    * `queue` (`MidiOutputQueue`, optional): queue to enable. Defaults to a
+      new empty queue.
+
+    ## Returns
+
+    * `MidiOutputQueue`: the enabled queue.
+    """
+    global _queue
+    _queue = queue if queue is not None else MidiOutputQueue()
+    return _queue
+
+
+def disableMidiOutputQueue() -> None:
+    """
+    Disable the output queue, so that the output functions in the `device`
+    module do nothing again. Messages still in the queue are not sent.
+    """
+    global _queue
+    _queue = None
+
+
+def getMidiOutputQueue() -> MidiOutputQueue | None:
+    """
+    Returns the enabled output queue, or `None` if no queue is enabled.
+    """
+    return _queue
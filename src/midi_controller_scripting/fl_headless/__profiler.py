@@ -0,0 +1,351 @@
+"""
+Profile the callbacks of a device script, to find out whether they stay within
+their time budgets.
+
+FL Studio calls some callbacks, such as `OnIdle` and `OnUpdateMeters`, on its
+UI thread, so if they run slowly, the whole of FL Studio will stutter.
+
+## Example usage
+
+```py
+from fl_headless import CallbackProfiler, ReplayEngine, loadScript
+
+script = loadScript("device_MyController.py")
+profiler = CallbackProfiler(
+    budgets={"OnIdle": 0.002, "OnUpdateMeters": 0.002},
+    traceAllocations=True,
+    recordStacks=True,
+)
+
+with profiler.attach(script):
+    ReplayEngine(script, metersInterval=1 / 30).replay(events)
+
+print(profiler.report())
+if profiler.overruns:
+    exit(1)
+
+# View using https://github.com/brendangregg/FlameGraph or speedscope
+with open("callbacks.folded", "w") as f:
+    f.write(profiler.collapsedStacks())
+```
+"""
+import functools
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from types import FrameType, ModuleType
+from typing import Any
+
+CALLBACKS = (
+    'OnInit',
+    'OnDeInit',
+    'OnMidiIn',
+    'OnMidiMsg',
+    'OnSysEx',
+    'OnNoteOn',
+    'OnNoteOff',
+    'OnControlChange',
+    'OnProgramChange',
+    'OnPitchBend',
+    'OnKeyPressure',
+    'OnChannelPressure',
+    'OnMidiOutMsg',
+    'OnIdle',
+    'OnProjectLoad',
+    'OnRefresh',
+    'OnDoFullRefresh',
+    'OnUpdateBeatIndicator',
+    'OnDisplayZone',
+    'OnUpdateLiveMode',
+    'OnDirtyMixerTrack',
+    'OnDirtyChannel',
+    'OnFirstConnect',
+    'OnUpdateMeters',
+    'OnWaitingForInput',
+    'OnSendTempMsg',
+)
+"""
+Names of all callbacks that FL Studio can call on a device script.
+"""
+
+
+class CallbackProfile:
+    """
+    Profiling data for a single callback function.
+    """
+
+    def __init__(self, name: str, budget: float | None) -> None:
+        """
+        Create an empty profile.
+
+        ## Args
+
+        * `name` (`str`): name of the callback.
+
+        * `budget` (`float | None`): time budget of each call, in seconds, or
+          `None` if it has no budget.
+        """
+        self.name = name
+        self.budget = budget
+        self.calls = 0
+        """Number of calls made to the callback"""
+        self.totalTime = 0
+        """Total time spent in the callback, in nanoseconds"""
+        self.maxTime = 0
+        """Duration of the slowest call, in nanoseconds"""
+        self.overruns = 0
+        """Number of calls that took longer than the budget"""
+        self.peakMemory = 0
+        """
+        Largest amount of memory allocated during a single call, in bytes
+        (only recorded when tracing allocations)
+        """
+        self.retainedMemory = 0
+        """
+        Total memory allocated by calls and not freed by the time they
+        returned, in bytes (only recorded when tracing allocations)
+        """
+
+
+class _StackRecorder:
+    """
+    Profile function which attributes the time spent in each function to its
+    full call stack.
+    """
+
+    def __init__(self, samples: dict[tuple[str, ...], int]) -> None:
+        self.samples = samples
+        self.stack: list[str] = []
+        self.last = time.perf_counter_ns()
+
+    def __call__(self, frame: FrameType, event: str, arg: Any) -> None:
+        now = time.perf_counter_ns()
+        if self.stack:
+            key = tuple(self.stack)
+            self.samples[key] = self.samples.get(key, 0) + now - self.last
+        if event == 'call':
+            module = frame.f_globals.get('__name__', '?')
+            self.stack.append(f"{module}.{frame.f_code.co_qualname}")
+        elif not self.stack:
+            # Calls made by the profiler itself, outside of the callback
+            pass
+        elif event == 'c_call':
+            module = getattr(arg, '__module__', None) or 'builtins'
+            self.stack.append(f"{module}.{arg.__qualname__}")
+        else:
+            # return, c_return or c_exception
+            self.stack.pop()
+        self.last = time.perf_counter_ns()
+
+
+class CallbackProfiler:
+    """
+    Opt-in profiler for the callbacks of a device script.
+
+    The profiler records the wall time and number of calls for each callback,
+    as well as the number of calls that overran the callback's time budget.
+    Optionally, it can record memory allocations using `tracemalloc`, and the
+    time spent in each call stack for exporting as a flame graph.
+
+    Since the profiler works by wrapping the script's callbacks, it can be
+    used with anything that calls them, including the `ReplayEngine`.
+    """
+
+    def __init__(
+        self,
+        budgets: dict[str, float] | None = None,
+        defaultBudget: float | None = None,
+        traceAllocations: bool = False,
+        recordStacks: bool = False,
+    ) -> None:
+        """
+        Create a callback profiler.
+
+        ## Args
+
+        * `budgets` (`dict[str, float]`, optional): mapping of callback names
+          to the maximum time that each call to them should take, in seconds.
+
+        * `defaultBudget` (`float | None`, optional): budget for callbacks not
+          given in `budgets`, or `None` for no budget. Defaults to `None`.
+
+        * `traceAllocations` (`bool`, optional): whether to record the memory
+          allocated by each callback using `tracemalloc`. This slows down
+          the script significantly. Defaults to `False`.
+
+        * `recordStacks` (`bool`, optional): whether to record the time spent
+          in each call stack within the callbacks, so that it can be exported
+          using `collapsedStacks`. This slows down the script significantly,
+          and if allocations are also traced, the memory used to record the
+          stacks is included in them. Defaults to `False`.
+        """
+        self.budgets = budgets if budgets is not None else {}
+        self.defaultBudget = defaultBudget
+        self.traceAllocations = traceAllocations
+        self.recordStacks = recordStacks
+        self.profiles: dict[str, CallbackProfile] = {}
+        self.__stacks: dict[tuple[str, ...], int] = {}
+        self.__depth = 0
+        """Number of wrapped callbacks currently running"""
+        self.__peaks: list[int] = []
+        """
+        Peak traced memory of each running callback, from before any nested
+        callbacks reset the peak
+        """
+
+    @property
+    def overruns(self) -> int:
+        """
+        Total number of calls that overran their budgets.
+        """
+        return sum(p.overruns for p in self.profiles.values())
+
+    def __profile(self, name: str) -> CallbackProfile:
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = CallbackProfile(
+                name,
+                self.budgets.get(name, self.defaultBudget),
+            )
+        return profile
+
+    def wrap(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+    ) -> Callable[..., Any]:
+        """
+        Wrap a callback function so that calls to it are profiled.
+
+        Callbacks may call other wrapped callbacks (for example, `OnMidiMsg`
+        often forwards to `OnNoteOn`), in which case the outer call's figures
+        include the inner call. Call stacks are recorded from the outermost
+        call.
+
+        ## Args
+
+        * `name` (`str`): name of the callback.
+
+        * `fn` (`Callable`): callback function.
+
+        ## Returns
+
+        * `Callable`: wrapped function.
+        """
+        profile = self.__profile(name)
+        budget = None if profile.budget is None else profile.budget * 1e9
+        trace = self.traceAllocations
+        stacks = self.__stacks if self.recordStacks else None
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            peaks = self.__peaks
+            if trace:
+                memory_before, peak = tracemalloc.get_traced_memory()
+                if peaks:
+                    # Keep the outer call's peak so far, since resetting the
+                    # peak for this call loses it
+                    peaks[-1] = max(peaks[-1], peak)
+                peaks.append(0)
+                tracemalloc.reset_peak()
+            outermost = self.__depth == 0
+            self.__depth += 1
+            if stacks is not None and outermost:
+                sys.setprofile(_StackRecorder(stacks))
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                duration = time.perf_counter_ns() - start
+                self.__depth -= 1
+                if stacks is not None and outermost:
+                    sys.setprofile(None)
+                profile.calls += 1
+                profile.totalTime += duration
+                if duration > profile.maxTime:
+                    profile.maxTime = duration
+                if budget is not None and duration > budget:
+                    profile.overruns += 1
+                if trace:
+                    current, peak = tracemalloc.get_traced_memory()
+                    peak = max(peak, peaks.pop())
+                    if peaks:
+                        # Carry this call's peak into the outer call
+                        peaks[-1] = max(peaks[-1], peak)
+                    profile.peakMemory = max(
+                        profile.peakMemory,
+                        peak - memory_before,
+                    )
+                    profile.retainedMemory += current - memory_before
+
+        return wrapper
+
+    @contextmanager
+    def attach(self, script: ModuleType) -> Iterator['CallbackProfiler']:
+        """
+        Profile the callbacks of the given script, for the duration of the
+        `with` block. The original callbacks are restored afterwards.
+
+        ## Args
+
+        * `script` (`ModuleType`): device script to profile.
+        """
+        originals = {
+            name: getattr(script, name)
+            for name in CALLBACKS
+            if callable(getattr(script, name, None))
+        }
+        started_tracing = self.traceAllocations and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        for name, fn in originals.items():
+            setattr(script, name, self.wrap(name, fn))
+        try:
+            yield self
+        finally:
+            for name, fn in originals.items():
+                setattr(script, name, fn)
+            if started_tracing:
+                tracemalloc.stop()
+
+    def report(self) -> str:
+        """
+        Returns a summary of the profiling data as a table.
+
+        Times are given in microseconds, and memory in bytes.
+        """
+        lines = [
+            f"{'callback':<20}{'calls':>10}{'total':>12}{'mean':>10}"
+            f"{'max':>10}{'budget':>10}{'overruns':>10}"
+            + (f"{'peak mem':>10}{'retained':>10}"
+               if self.traceAllocations else "")
+        ]
+        for name, p in sorted(self.profiles.items()):
+            if not p.calls:
+                continue
+            budget = "-" if p.budget is None else f"{p.budget * 1e6:.1f}"
+            lines.append(
+                f"{name:<20}{p.calls:>10}{p.totalTime / 1e3:>12.1f}"
+                f"{p.totalTime / p.calls / 1e3:>10.1f}{p.maxTime / 1e3:>10.1f}"
+                f"{budget:>10}{p.overruns:>10}"
+                + (f"{p.peakMemory:>10}{p.retainedMemory:>10}"
+                   if self.traceAllocations else "")
+            )
+        return "\n".join(lines)
+
+    def collapsedStacks(self) -> str:
+        """
+        Returns the recorded call stacks in the "collapsed" format used by
+        flame graph tools such as `flamegraph.pl` and speedscope.
+
+        Each line contains a semicolon-separated call stack, followed by the
+        time spent in it, in microseconds. This requires the profiler to be
+        created with `recordStacks=True`.
+        """
+        return "".join(
+            f"{';'.join(stack)} {duration // 1000}\n"
+            for stack, duration in sorted(self.__stacks.items())
+            if duration >= 1000
+        )
@@ -0,0 +1,327 @@
+"""
+A scheduler for repeating MIDI events, which `device.repeatMidiEvent` and
+`device.stopRepeatMidiEvent` start and stop repeats on while it is enabled.
+
+Repeats are stored in a hashed timer wheel: a ring of slots, one per tick of
+the scheduler's resolution, where each repeat is placed in the slot of the
+tick at which it is next due. Starting and cancelling a repeat takes
+constant time, regardless of how many repeats are active, and advancing the
+scheduler only visits the slots of the ticks that have passed.
+
+The scheduler has no clock of its own. It is advanced by the `ReplayEngine`,
+which dispatches each repeated event to the script at the time it is due,
+or it can be advanced by calling `tick` (for example from `OnIdle`), in which
+case the time is taken from `time.monotonic`.
+
+## Example usage
+
+```py
+from fl_classes import FlMidiMsg
+from fl_headless import ReplayEngine, enableRepeatScheduler, loadScript
+
+scheduler = enableRepeatScheduler()
+engine = ReplayEngine(loadScript("device_MyController.py"))
+engine.start()
+# Hold down 12 buttons, which the script repeats using
+# `device.repeatMidiEvent`
+for note in range(12):
+    engine.dispatch(FlMidiMsg(0x90, note, 127))
+engine.advance(2.0)
+assert scheduler.active == 12
+```
+"""
+import time
+from collections.abc import Callable, Iterator
+
+from fl_classes import FlMidiMsg, eventToRawData, rawDataToEvent
+
+
+class _Repeat:
+    """
+    A repeating event in the timer wheel.
+    """
+    __slots__ = ('handle', 'key', 'data', 'due', 'rate')
+
+    def __init__(
+        self,
+        handle: int,
+        key: int | bytes,
+        data: int | bytes,
+        due: int,
+        rate: int,
+    ) -> None:
+        self.handle = handle
+        self.key = key
+        self.data = data
+        self.due = due
+        """Tick at which the event is next due"""
+        self.rate = rate
+        """Ticks between each repeat, or `0` to only send the event once"""
+
+
+class RepeatScheduler:
+    """
+    Schedules repeating MIDI events, using a timer wheel.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.001,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a scheduler with no repeating events, at time `0`.
+
+        ## Args
+
+        * `resolution` (`float`, optional): length of each tick, in seconds.
+          Delays and rates are rounded to a whole number of ticks. Defaults
+          to `0.001`.
+
+        * `slots` (`int`, optional): number of slots in the timer wheel.
+          Repeats that are due more than this many ticks in the future share
+          slots with earlier repeats, so it should be larger than the usual
+          repeat rate divided by the resolution. Defaults to `512`.
+
+        * `clock` (`Callable[[], float]`, optional): clock used by `tick` when
+          no time is given, in seconds. Defaults to `time.monotonic`.
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if slots < 1:
+            raise ValueError(f"slots must be at least 1 (got {slots})")
+        self.resolution = resolution
+        self.clock = clock
+        self.origin = clock()
+        """Time given by `clock` when the scheduler was created"""
+        self.eventsFired = 0
+        """Number of repeated events that have been sent"""
+        self.__wheel: list[dict[int, _Repeat]] = [{} for _ in range(slots)]
+        self.__repeats: dict[int, _Repeat] = {}
+        self.__keys: dict[int | bytes, int] = {}
+        self.__tick = 0
+        self.__next_handle = 0
+
+    @property
+    def time(self) -> float:
+        """
+        The time the scheduler has been advanced to, in seconds.
+        """
+        return self.__tick * self.resolution
+
+    @property
+    def active(self) -> int:
+        """
+        Number of events that are repeating.
+        """
+        return len(self.__repeats)
+
+    def __ticks(self, ms: int) -> int:
+        """
+        Convert a duration in ms to a whole number of ticks.
+        """
+        return round(ms / 1000 / self.resolution)
+
+    def __insert(self, repeat: _Repeat) -> None:
+        self.__wheel[repeat.due % len(self.__wheel)][repeat.handle] = repeat
+
+    def __remove(self, repeat: _Repeat) -> None:
+        del self.__wheel[repeat.due % len(self.__wheel)][repeat.handle]
+
+    def repeat(
+        self,
+        eventData: FlMidiMsg,
+        delay: int = 300,
+        rate: int = 300,
+    ) -> int:
+        """
+        Start repeating an event, as for `device.repeatMidiEvent`.
+
+        If an event for the same control (the same status and data 1, or the
+        same sysex data) is already repeating, it is cancelled first.
+
+        ## Args
+
+        * `eventData` (`FlMidiMsg`): event to repeat. It is copied, so later
+          changes to it have no effect.
+
+        * `delay` (`int`, optional): time before the event is first sent, in
+          ms. Defaults to `300`.
+
+        * `rate` (`int`, optional): time between each repeat, in ms, or `0`
+          to only send the event once. Defaults to `300`.
+
+        ## Returns
+
+        * `int`: handle of the repeat, which can be given to `cancel`.
+        """
+        if delay < 0 or rate < 0:
+            raise ValueError(
+                f"delay and rate must not be negative (got {delay}, {rate})")
+        data = eventToRawData(eventData)
+        key = data & 0xFFFF if isinstance(data, int) else bytes(data)
+        existing = self.__keys.get(key)
+        if existing is not None:
+            self.cancel(existing)
+        handle = self.__next_handle
+        self.__next_handle += 1
+        repeat = _Repeat(
+            handle,
+            key,
+            data,
+            # Events can't be sent until the next tick
+            self.__tick + max(1, self.__ticks(delay)),
+            max(1, self.__ticks(rate)) if rate else 0,
+        )
+        self.__repeats[handle] = repeat
+        self.__keys[key] = handle
+        self.__insert(repeat)
+        return handle
+
+    def cancel(self, handle: int) -> bool:
+        """
+        Stop repeating an event.
+
+        ## Args
+
+        * `handle` (`int`): handle of the repeat, as returned by `repeat`.
+
+        ## Returns
+
+        * `bool`: whether the event was repeating.
+        """
+        repeat = self.__repeats.pop(handle, None)
+        if repeat is None:
+            return False
+        del self.__keys[repeat.key]
+        self.__remove(repeat)
+        return True
+
+    def cancelAll(self) -> None:
+        """
+        Stop repeating all events, as for `device.stopRepeatMidiEvent`, which
+        doesn't specify which event to stop.
+        """
+        for repeat in self.__repeats.values():
+            self.__remove(repeat)
+        self.__repeats.clear()
+        self.__keys.clear()
+
+    def due(self, to: float) -> Iterator[tuple[float, FlMidiMsg]]:
+        """
+        Advance the scheduler, yielding each event that is sent, in the order
+        they are due.
+
+        Repeats can be started and cancelled while iterating, for example by
+        the script handling the events. Each event is a new `FlMidiMsg`, so
+        that it isn't already marked as handled.
+
+        ## Args
+
+        * `to` (`float`): time to advance to, in seconds.
+
+        ## Yields
+
+        * `tuple[float, FlMidiMsg]`: time at which the event is sent, in
+          seconds, and the event.
+        """
+        target = int(to / self.resolution + 1e-9)
+        wheel = self.__wheel
+        repeats = self.__repeats
+        while self.__tick < target:
+            if not repeats:
+                # Nothing to send, so skip straight to the end
+                self.__tick = target
+                break
+            self.__tick += 1
+            tick = self.__tick
+            slot = wheel[tick % len(wheel)]
+            if not slot:
+                continue
+            # Later slots may be changed while yielding, so collect the due
+            # repeats first
+            for repeat in [r for r in slot.values() if r.due == tick]:
+                if repeats.get(repeat.handle) is not repeat:
+                    # Cancelled while handling an earlier event
+                    continue
+                self.__remove(repeat)
+                if repeat.rate:
+                    repeat.due += repeat.rate
+                    self.__insert(repeat)
+                else:
+                    del repeats[repeat.handle]
+                    del self.__keys[repeat.key]
+                self.eventsFired += 1
+                yield tick * self.resolution, rawDataToEvent(repeat.data)
+        self.__tick = max(self.__tick, target)
+
+    def tick(
+        self,
+        dispatch: Callable[[FlMidiMsg], object],
+        to: float | None = None,
+    ) -> int:
+        """
+        Advance the scheduler, passing each event that is sent to `dispatch`.
+
+        ## Args
+
+        * `dispatch` (`Callable[[FlMidiMsg], object]`): function to call with
+          each event, eg the script's `OnMidiMsg` callback.
+
+        * `to` (`float`, optional): time to advance to, in seconds. Defaults
+          to the time since the scheduler was created, according to its
+          `clock`.
+
+        ## Returns
+
+        * `int`: number of events sent.
+        """
+        if to is None:
+            to = self.clock() - self.origin
+        count = 0
+        for _, msg in self.due(to):
+            dispatch(msg)
+            count += 1
+        return count
+
+
+_scheduler: RepeatScheduler | None = None
+
+
+def enableRepeatScheduler(
+    scheduler: RepeatScheduler | None = None,
+) -> RepeatScheduler:
+    """
+    Enable a repeat scheduler, so that `device.repeatMidiEvent` and
+    `device.stopRepeatMidiEvent` start and stop repeats on it.
+
+    ## Args
+
+    * `scheduler` (`RepeatScheduler`, optional): scheduler to enable.
+      Defaults to a new scheduler with no repeating events.
+
+    ## Returns
+
+    * `RepeatScheduler`: the enabled scheduler.
+    """
+    global _scheduler
+    _scheduler = scheduler if scheduler is not None else RepeatScheduler()
+    return _scheduler
+
+
+def disableRepeatScheduler() -> None:
+    """
+    Disable the repeat scheduler, so that `device.repeatMidiEvent` and
+    `device.stopRepeatMidiEvent` do nothing again.
+    """
+    global _scheduler
+    _scheduler = None
+
+
+def getRepeatScheduler() -> RepeatScheduler | None:
+    """
+    Returns the enabled repeat scheduler, or `None` if no scheduler is
+    enabled.
+    """
+    return _scheduler
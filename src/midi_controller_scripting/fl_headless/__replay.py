@@ -0,0 +1,396 @@
+"""
+Drive a device script through FL Studio's callback lifecycle, by replaying a
+timestamped stream of MIDI events through it.
+
+## Example usage
+
+```py
+from fl_classes import decodeMidiStream
+from fl_headless import ReplayEngine, loadScript
+
+script = loadScript("device_MyController.py")
+engine = ReplayEngine(script, metersInterval=1 / 30)
+
+with open("session.bin", "rb") as f:
+    # Space the recorded events 5ms apart
+    events = enumerate(decodeMidiStream(f.read()))
+    report = engine.replay((i * 0.005, msg) for i, msg in events)
+
+print(report)
+```
+"""
+import importlib.util
+import math
+import sys
+import time
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from fl_classes import FlMidiMsg
+
+from .__output import getMidiOutputQueue
+from .__repeat import getRepeatScheduler
+
+TYPE_CALLBACKS = {
+    0x80: 'OnNoteOff',
+    0x90: 'OnNoteOn',
+    0xA0: 'OnKeyPressure',
+    0xB0: 'OnControlChange',
+    0xC0: 'OnProgramChange',
+    0xD0: 'OnChannelPressure',
+    0xE0: 'OnPitchBend',
+}
+"""
+Mapping of event types (the upper nibble of the status byte) to the callbacks
+that FL Studio calls for them.
+"""
+
+
+def loadScript(path: str | Path) -> ModuleType:
+    """
+    Load a device script (eg `device_MyController.py`) from the given path.
+
+    As in FL Studio, the directory containing the script is added to the
+    module search path, so that the script can import the other modules it
+    contains.
+
+    ## Args
+
+    * `path` (`str | Path`): path to the script's entrypoint file.
+
+    ## Returns
+
+    * `ModuleType`: the loaded script.
+    """
+    path = Path(path).resolve()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load script from '{path}'")
+    script = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = script
+    spec.loader.exec_module(script)
+    return script
+
+
+class CallbackTimings:
+    """
+    Latencies of the calls made to a single callback function.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Create an empty set of timings.
+
+        ## Args
+
+        * `name` (`str`): name of the callback.
+        """
+        self.name = name
+        self.__durations = array('q')
+        self.__sorted: list[int] | None = None
+
+    def add(self, duration: int) -> None:
+        """
+        Record the duration of a call.
+
+        ## Args
+
+        * `duration` (`int`): duration in nanoseconds.
+        """
+        self.__durations.append(duration)
+        self.__sorted = None
+
+    @property
+    def count(self) -> int:
+        """
+        Number of calls recorded.
+        """
+        return len(self.__durations)
+
+    @property
+    def total(self) -> float:
+        """
+        Total time spent in the callback, in seconds.
+        """
+        return sum(self.__durations) / 1e9
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean latency of the callback, in seconds.
+        """
+        if not self.__durations:
+            return 0.0
+        return self.total / len(self.__durations)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the given percentile of the callback's latencies, in seconds,
+        using the nearest-rank method.
+
+        ## Args
+
+        * `percent` (`float`): percentile to calculate (`0` - `100`).
+
+        ## Returns
+
+        * `float`: latency in seconds.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f"Percentile must be 0-100 (got {percent})")
+        if not self.__durations:
+            return 0.0
+        if self.__sorted is None:
+            self.__sorted = sorted(self.__durations)
+        rank = max(1, math.ceil(len(self.__sorted) * percent / 100))
+        return self.__sorted[rank - 1] / 1e9
+
+
+class ReplayReport:
+    """
+    Per-callback latencies recorded during a replay.
+
+    Converting the report to a string gives a table of latency percentiles,
+    in microseconds.
+    """
+
+    PERCENTILES = (50, 90, 99, 100)
+    """
+    Percentiles shown in the table.
+    """
+
+    def __init__(self, timings: dict[str, CallbackTimings]) -> None:
+        self.timings = timings
+
+    def __getitem__(self, callback: str) -> CallbackTimings:
+        return self.timings[callback]
+
+    def __str__(self) -> str:
+        header = f"{'callback':<20}{'count':>10}{'mean':>10}" + "".join(
+            f"{f'p{p}':>10}" if p < 100 else f"{'max':>10}"
+            for p in self.PERCENTILES
+        )
+        lines = [header]
+        for name, timing in sorted(self.timings.items()):
+            lines.append(
+                f"{name:<20}{timing.count:>10}{timing.mean * 1e6:>10.1f}"
+                + "".join(
+                    f"{timing.percentile(p) * 1e6:>10.1f}"
+                    for p in self.PERCENTILES
+                )
+            )
+        return "\n".join(lines)
+
+
+class ReplayEngine:
+    """
+    Drives a device script through FL Studio's callback lifecycle, without
+    FL Studio.
+
+    Time is simulated, meaning that events are replayed as quickly as
+    possible, with `OnIdle` and `OnUpdateMeters` called at the times they
+    would be called between the events within FL Studio. The latency of each
+    callback is measured using the real time taken by the script.
+
+    If a `MidiOutputQueue` is enabled, it is flushed after each call to
+    `OnIdle`, and when the script is de-initialized. If a `RepeatScheduler`
+    is enabled, the events it repeats are dispatched to the script at the
+    times they are due.
+    """
+
+    def __init__(
+        self,
+        script: ModuleType,
+        idleInterval: float = 0.02,
+        metersInterval: float | None = None,
+    ) -> None:
+        """
+        Create a replay engine for the given script.
+
+        ## Args
+
+        * `script` (`ModuleType`): script to drive, eg as loaded by
+          `loadScript`.
+
+        * `idleInterval` (`float`, optional): time between calls to `OnIdle`,
+          in seconds. Defaults to `0.02` (roughly the rate used by FL Studio).
+
+        * `metersInterval` (`float | None`, optional): time between calls to
+          `OnUpdateMeters`, in seconds, or `None` to never call it. In FL
+          Studio, this is only called for scripts that call
+          `device.setHasMeters`. Defaults to `None`.
+        """
+        if idleInterval <= 0:
+            raise ValueError("idleInterval must be positive")
+        if metersInterval is not None and metersInterval <= 0:
+            raise ValueError("metersInterval must be positive")
+        self.script = script
+        self.idleInterval = idleInterval
+        self.metersInterval = metersInterval
+        self.timings: dict[str, CallbackTimings] = {}
+        self.__time = 0.0
+        self.__idle_ticks = 0
+        self.__meters_ticks = 0
+
+    @property
+    def time(self) -> float:
+        """
+        The current simulated time, in seconds.
+        """
+        return self.__time
+
+    def call(self, callback: str, *args: Any) -> Any:
+        """
+        Call the given callback on the script, recording its latency.
+
+        If the script doesn't define the callback, nothing happens.
+
+        ## Args
+
+        * `callback` (`str`): name of the callback (eg `"OnInit"`).
+
+        * `*args`: arguments to pass to the callback.
+
+        ## Returns
+
+        * `Any`: the return value of the callback.
+        """
+        fn = getattr(self.script, callback, None)
+        if fn is None:
+            return None
+        timings = self.timings.get(callback)
+        if timings is None:
+            timings = self.timings[callback] = CallbackTimings(callback)
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            timings.add(time.perf_counter_ns() - start)
+
+    def dispatch(self, msg: FlMidiMsg) -> None:
+        """
+        Dispatch a MIDI message to the script, following the order used by
+        FL Studio.
+
+        The message is passed to `OnMidiIn`, then `OnMidiMsg`, then the
+        callback for its event type (eg `OnNoteOn` or `OnSysEx`), stopping as
+        soon as a callback sets `msg.handled`. Messages whose status byte
+        isn't a valid status (below `0x80`), such as malformed messages in a
+        recorded session, have no type-specific callback.
+
+        ## Args
+
+        * `msg` (`FlMidiMsg`): message to dispatch.
+        """
+        self.call('OnMidiIn', msg)
+        if msg.handled:
+            return
+        self.call('OnMidiMsg', msg)
+        if msg.handled:
+            return
+        status = msg.status
+        if status == 0xF0:
+            self.call('OnSysEx', msg)
+        elif 0x80 <= status < 0xF0:
+            self.call(TYPE_CALLBACKS[status & 0xF0], msg)
+
+    def advance(self, to: float) -> None:
+        """
+        Advance the simulated time, calling `OnIdle` and `OnUpdateMeters`
+        wherever they are due.
+
+        ## Args
+
+        * `to` (`float`): time to advance to, in seconds.
+        """
+        while True:
+            next_idle = (self.__idle_ticks + 1) * self.idleInterval
+            if self.metersInterval is not None:
+                next_meters = (self.__meters_ticks + 1) * self.metersInterval
+            else:
+                next_meters = math.inf
+            if next_meters <= to and next_meters <= next_idle:
+                self.__repeat(next_meters)
+                self.__time = next_meters
+                self.__meters_ticks += 1
+                self.call('OnUpdateMeters')
+            elif next_idle <= to:
+                self.__repeat(next_idle)
+                self.__time = next_idle
+                self.__idle_ticks += 1
+                self.call('OnIdle')
+                self.__flush()
+            else:
+                break
+        self.__repeat(to)
+        self.__time = max(self.__time, to)
+
+    def __repeat(self, to: float) -> None:
+        """
+        Dispatch the events repeated by the enabled repeat scheduler, if there
+        is one, up to the given time.
+        """
+        scheduler = getRepeatScheduler()
+        if scheduler is None:
+            return
+        for timestamp, msg in scheduler.due(to):
+            self.__time = max(self.__time, timestamp)
+            self.dispatch(msg)
+
+    def start(self) -> None:
+        """
+        Initialize the script, by calling `OnInit`.
+        """
+        self.call('OnInit')
+
+    def stop(self) -> None:
+        """
+        De-initialize the script, by calling `OnDeInit`.
+        """
+        self.call('OnDeInit')
+        self.__flush()
+
+    def __flush(self) -> None:
+        """
+        Flush the enabled output queue, if there is one.
+        """
+        queue = getMidiOutputQueue()
+        if queue is not None:
+            queue.flush()
+
+    def replay(
+        self,
+        events: Iterable[tuple[float, FlMidiMsg]],
+    ) -> ReplayReport:
+        """
+        Replay a stream of events through the full lifecycle of the script.
+
+        The script is initialized, then each event is dispatched at its time,
+        then the script is de-initialized.
+
+        ## Args
+
+        * `events` (`Iterable[tuple[float, FlMidiMsg]]`): events to replay,
+          with the time at which they occur, in seconds. Times must not
+          decrease.
+
+        ## Returns
+
+        * `ReplayReport`: latencies of each callback.
+        """
+        self.start()
+        for timestamp, msg in events:
+            if timestamp < self.__time:
+                raise ValueError(
+                    f"Event times must not decrease (got {timestamp} after "
+                    f"{self.__time})"
+                )
+            self.advance(timestamp)
+            self.dispatch(msg)
+        self.stop()
+        return ReplayReport(self.timings)
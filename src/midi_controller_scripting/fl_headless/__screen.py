@@ -0,0 +1,407 @@
+"""
+An in-memory model of the screen of the AKAI Fire, which the drawing
+functions in the `screen` module render to while it is enabled.
+
+The screen is stored as a bit-packed framebuffer, in the layout used by the
+Fire's display controller: the screen is divided into horizontal bands
+(pages) of 8 rows, and each byte holds one column of a band, with the least
+significant bit at the top.
+
+Each call to `screen.update` compares the framebuffer with the last frame
+that was pushed to the device, and only the changed columns of each band are
+pushed, rather than the whole screen. The number of bytes pushed is recorded,
+so that the bandwidth a script uses can be measured.
+
+Text is drawn using a built-in 5x7 pixel font, scaled up for the larger
+fonts, so the layout of text is only an approximation of the Fire's.
+
+## Example usage
+
+```py
+import screen
+from fl_headless import enableScreenModel
+
+model = enableScreenModel()
+screen.init(128, 64, 16, 0, 0, 0)
+screen.displayText(0, 0, 0, "Hello", False, 0)
+screen.update()
+print(model.render())
+print(f"{model.bytesPushed} of {model.bytesFull} bytes pushed")
+```
+"""
+
+_FONT = bytes.fromhex(
+    '0000000000' '00005f0000' '0007000700' '147f147f14'  # space ! " #
+    '242a7f2a12' '2313086462' '3649552250' '0005030000'  # $ % & '
+    '001c224100' '0041221c00' '082a1c2a08' '08083e0808'  # ( ) * +
+    '0050300000' '0808080808' '0060600000' '2010080402'  # , - . /
+    '3e5149453e' '00427f4000' '4261514946' '2141454b31'  # 0 1 2 3
+    '1814127f10' '2745454539' '3c4a494930' '0171090503'  # 4 5 6 7
+    '3649494936' '064949291e' '0036360000' '0056360000'  # 8 9 : ;
+    '0814224100' '1414141414' '0041221408' '0201510906'  # < = > ?
+    '324979413e' '7e1111117e' '7f49494936' '3e41414122'  # @ A B C
+    '7f4141221c' '7f49494941' '7f09090101' '3e41415132'  # D E F G
+    '7f0808087f' '00417f4100' '2040413f01' '7f08142241'  # H I J K
+    '7f40404040' '7f0204027f' '7f0408107f' '3e4141413e'  # L M N O
+    '7f09090906' '3e4151215e' '7f09192946' '4649494931'  # P Q R S
+    '01017f0101' '3f4040403f' '1f2040201f' '7f2018207f'  # T U V W
+    '6314081463' '0304780403' '6151494543' '007f414100'  # X Y Z [
+    '0204081020' '0041417f00' '0402010204' '4040404040'  # \ ] ^ _
+    '0001020400' '2054545478' '7f48444438' '3844444420'  # ` a b c
+    '384444487f' '3854545418' '087e090102' '081454543c'  # d e f g
+    '7f08040478' '00447d4000' '2040443d00' '007f102844'  # h i j k
+    '00417f4000' '7c04180478' '7c08040478' '3844444438'  # l m n o
+    '7c14141408' '081414187c' '7c08040408' '4854545420'  # p q r s
+    '043f444020' '3c4040207c' '1c2040201c' '3c4030403c'  # t u v w
+    '4428102844' '0c5050503c' '4464544c44' '0008364100'  # x y z {
+    '00007f0000' '0041360800' '0201020402'               # | } ~
+)
+"""
+Columns of each printable ASCII character in a 5x7 pixel font, with the
+least significant bit at the top.
+"""
+
+FONTS = (
+    (1, 1, 6),
+    (1, 2, 6),
+    (2, 2, 10),
+    (2, 4, 12),
+)
+"""
+Horizontal scale, vertical scale and character width in pixels of each font
+accepted by `screen.displayText` (`Font6x8`, `Font6x16`, `Font10x16` and
+`Font12x32`), when drawn using the built-in 5x7 font.
+"""
+
+
+def _glyph(char: str, scaleX: int, scaleY: int) -> list[int]:
+    """
+    Returns the columns of a character, scaled by the given amounts, with bit
+    `n` of each column set if row `n` is lit.
+    """
+    code = ord(char) - 0x20
+    if not 0 <= code < len(_FONT) // 5:
+        # Draw unsupported characters as '?'
+        code = ord('?') - 0x20
+    columns = []
+    for column in _FONT[code * 5:code * 5 + 5]:
+        if scaleY > 1:
+            scaled = 0
+            for row in range(7):
+                if column >> row & 1:
+                    scaled |= ((1 << scaleY) - 1) << (row * scaleY)
+            column = scaled
+        columns.extend([column] * scaleX)
+    return columns
+
+
+class ScreenModel:
+    """
+    State of the screen of the AKAI Fire, including the frame that was last
+    pushed to the device.
+    """
+
+    def __init__(
+        self,
+        width: int = 128,
+        height: int = 64,
+        textRowHeight: int = 16,
+    ) -> None:
+        """
+        Create a screen model, with a blank screen.
+
+        ## Args
+
+        * `width` (`int`, optional): width of the screen in pixels. Defaults
+          to `128`.
+
+        * `height` (`int`, optional): height of the screen in pixels. This
+          must be a multiple of `8`. Defaults to `64`.
+
+        * `textRowHeight` (`int`, optional): height of each row of text in
+          pixels. Defaults to `16`.
+        """
+        self.resize(width, height)
+        self.textRowHeight = textRowHeight
+        self.bytesPushed = 0
+        """Total number of bytes of pixel data pushed by `update`"""
+        self.bytesFull = 0
+        """
+        Total number of bytes of pixel data that would have been pushed by
+        `update` if the whole screen was pushed each time
+        """
+        self.lastPush: list[tuple[int, int, int, bytes]] = []
+        """
+        Bands pushed by the last call to `update`, as described in its
+        documentation
+        """
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Change the size of the screen, clearing it.
+        """
+        if width < 1:
+            raise ValueError(f"width must be at least 1 (got {width})")
+        if height < 8 or height % 8:
+            raise ValueError(
+                f"height must be a positive multiple of 8 (got {height})")
+        self.width = width
+        self.height = height
+        self.bands = height // 8
+        self.frame = bytearray(width * self.bands)
+        """Framebuffer, indexed by `band * width + x`"""
+        self.pushed = bytearray(width * self.bands)
+        """The frame that was last pushed to the device"""
+
+    def getPixel(self, x: int, y: int) -> bool:
+        """
+        Returns whether the pixel at the given position is lit.
+        """
+        return bool(self.frame[(y >> 3) * self.width + x] >> (y & 7) & 1)
+
+    def fillRect(self, x0: int, y0: int, x1: int, y1: int, value: int) -> None:
+        """
+        Fill a rectangle, from the start position up to (but not including)
+        the end position, clipped to the screen.
+
+        ## Args
+
+        * `x0`, `y0` (`int`): start position.
+
+        * `x1`, `y1` (`int`): end position.
+
+        * `value` (`int`): whether to light (non-zero) or clear (`0`) the
+          pixels.
+        """
+        x0, x1 = max(x0, 0), min(x1, self.width)
+        y0, y1 = max(y0, 0), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        frame = self.frame
+        for band in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+            top = max(y0 - band * 8, 0)
+            bottom = min(y1 - band * 8, 8)
+            mask = ((1 << bottom) - 1) & ~((1 << top) - 1)
+            if value:
+                table = bytes(b | mask for b in range(256))
+            else:
+                table = bytes(b & ~mask for b in range(256))
+            start = band * self.width
+            frame[start + x0:start + x1] = (
+                frame[start + x0:start + x1].translate(table))
+
+    def drawRect(self, x0: int, y0: int, x1: int, y1: int, value: int) -> None:
+        """
+        Draw the outline of a rectangle, using the same coordinates as
+        `fillRect`.
+        """
+        self.fillRect(x0, y0, x1, y0 + 1, value)
+        self.fillRect(x0, y1 - 1, x1, y1, value)
+        self.fillRect(x0, y0, x0 + 1, y1, value)
+        self.fillRect(x1 - 1, y0, x1, y1, value)
+
+    def textWidth(self, text: str, font: int = 0) -> int:
+        """
+        Returns the width of the given text in pixels.
+        """
+        return len(text) * FONTS[font][2]
+
+    def drawText(self, text: str, x: int, y: int, font: int = 0) -> None:
+        """
+        Draw text with its top left corner at the given position, clipped to
+        the screen. Pixels between the characters are left unchanged.
+
+        ## Args
+
+        * `text` (`str`): text to draw.
+
+        * `x`, `y` (`int`): position of the top left corner of the text.
+
+        * `font` (`int`, optional): font to use, as listed in `FONTS`.
+          Defaults to `0`.
+        """
+        scaleX, scaleY, charWidth = FONTS[font]
+        frame = self.frame
+        width = self.width
+        shift = y & 7
+        first = y >> 3
+        for i, char in enumerate(text):
+            left = x + i * charWidth
+            for offset, column in enumerate(_glyph(char, scaleX, scaleY)):
+                px = left + offset
+                if not 0 <= px < width:
+                    continue
+                bits = column << shift
+                band = first
+                while bits and band < self.bands:
+                    if band >= 0:
+                        frame[band * width + px] |= bits & 0xFF
+                    bits >>= 8
+                    band += 1
+
+    def displayText(
+        self,
+        text: str,
+        y: int,
+        font: int = 0,
+        justification: int = 0,
+    ) -> None:
+        """
+        Replace the contents of a row of the screen with the given text.
+
+        ## Args
+
+        * `text` (`str`): text to display.
+
+        * `y` (`int`): position of the top of the row.
+
+        * `font` (`int`, optional): font to use, as listed in `FONTS`.
+          Defaults to `0`.
+
+        * `justification` (`int`, optional): `0` for left, `1` for center or
+          `2` for right. Defaults to `0`.
+        """
+        height = 8 * FONTS[font][1]
+        self.fillRect(0, y, self.width, y + height, 0)
+        free = self.width - self.textWidth(text, font)
+        self.drawText(text, free * justification // 2, y, font)
+
+    def displayBar(
+        self,
+        text: str,
+        y: int,
+        value: float,
+        bipolar: bool = False,
+    ) -> None:
+        """
+        Replace the contents of a row of the screen with a label, and a bar
+        below it filled according to `value`.
+
+        ## Args
+
+        * `text` (`str`): label of the bar.
+
+        * `y` (`int`): position of the top of the row.
+
+        * `value` (`float`): value of the bar (`0.0` - `1.0`).
+
+        * `bipolar` (`bool`, optional): whether to fill the bar from its
+          center rather than its left. Defaults to `False`.
+        """
+        self.displayText(text, y)
+        bottom = y + max(self.textRowHeight, 12)
+        self.fillRect(0, y + 8, self.width, bottom, 0)
+        self.drawRect(0, y + 9, self.width, bottom, 1)
+        inner = self.width - 4
+        position = 2 + round(inner * min(max(value, 0.0), 1.0))
+        start = 2 + inner // 2 if bipolar else 2
+        self.fillRect(
+            min(start, position),
+            y + 11,
+            max(start, position),
+            bottom - 2,
+            1,
+        )
+
+    def clear(self) -> None:
+        """
+        Clear the whole screen.
+        """
+        self.frame[:] = bytes(len(self.frame))
+
+    def diff(self) -> list[tuple[int, int, int]]:
+        """
+        Returns the parts of the screen that have changed since the last
+        frame was pushed, as a dirty rectangle for each band.
+
+        ## Returns
+
+        * `list[tuple[int, int, int]]`: band index, first column and end
+          column (exclusive) of each changed band.
+        """
+        width = self.width
+        dirty = []
+        for band in range(self.bands):
+            start = band * width
+            new = self.frame[start:start + width]
+            old = self.pushed[start:start + width]
+            if new == old:
+                continue
+            # Find the first and last changed columns using a single XOR of
+            # the whole band, rather than comparing column by column
+            changed = (
+                int.from_bytes(new, 'little') ^ int.from_bytes(old, 'little'))
+            first = ((changed & -changed).bit_length() - 1) >> 3
+            last = (changed.bit_length() - 1) >> 3
+            dirty.append((band, first, last + 1))
+        return dirty
+
+    def update(self) -> list[tuple[int, int, int, bytes]]:
+        """
+        Push the changed parts of the screen to the device.
+
+        ## Returns
+
+        * `list[tuple[int, int, int, bytes]]`: band index, first column, end
+          column (exclusive) and column data of each band that was pushed.
+        """
+        width = self.width
+        bands = []
+        for band, x0, x1 in self.diff():
+            start = band * width
+            data = bytes(self.frame[start + x0:start + x1])
+            self.pushed[start + x0:start + x1] = data
+            self.bytesPushed += len(data)
+            bands.append((band, x0, x1, data))
+        self.bytesFull += len(self.frame)
+        self.lastPush = bands
+        return bands
+
+    def render(self, on: str = '#', off: str = '.') -> str:
+        """
+        Returns the contents of the screen as text, with a line per row of
+        pixels.
+        """
+        return "\n".join(
+            "".join(
+                on if self.getPixel(x, y) else off for x in range(self.width))
+            for y in range(self.height)
+        )
+
+
+_model: ScreenModel | None = None
+
+
+def enableScreenModel(model: ScreenModel | None = None) -> ScreenModel:
+    """
+    Enable a screen model, so that the functions in the `screen` module draw
+    to it.
+
+    ## Args
+
+    * `model` (`ScreenModel`, optional): model to enable. Defaults to a new
+      model with a blank screen.
+
+    ## Returns
+
+    * `ScreenModel`: the enabled model.
+    """
+    global _model
+    _model = model if model is not None else ScreenModel()
+    return _model
+
+
+def disableScreenModel() -> None:
+    """
+    Disable the screen model, so that the functions in the `screen` module do
+    nothing again.
+    """
+    global _model
+    _model = None
+
+
+def getScreenModel() -> ScreenModel | None:
+    """
+    Returns the enabled screen model, or `None` if no model is enabled.
+    """
+    return _model
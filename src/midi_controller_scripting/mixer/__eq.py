@@ -3,6 +3,7 @@
 
 Functions for interacting with the FL Studio mixer's built-in EQ.
 """
+from fl_headless import getMixerModel
 
 
 def getEqBandCount() -> int:
@@ -19,6 +20,9 @@ def getEqBandCount() -> int:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.eqBands
     return 0
 
 
@@ -43,6 +47,10 @@ def getEqGain(index: int, band: int, mode: int = 0) -> float:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        gain = model.eqGain[index * model.eqBands + band]
+        return model.eqGainToDb(gain) if mode else gain
     return 0.0
 
 
@@ -61,6 +69,9 @@ def setEqGain(index: int, band: int, value: float) -> None:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        model.eqGain[index * model.eqBands + band] = value
 
 
 def getEqFrequency(index: int, band: int, mode: int = 0) -> float:
@@ -85,6 +96,10 @@ def getEqFrequency(index: int, band: int, mode: int = 0) -> float:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        frequency = model.eqFrequency[index * model.eqBands + band]
+        return model.eqFrequencyToHz(frequency) if mode else frequency
     return 0.0
 
 
@@ -104,6 +119,9 @@ def setEqFrequency(index: int, band: int, value: float) -> None:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        model.eqFrequency[index * model.eqBands + band] = value
 
 
 def getEqBandwidth(index: int, band: int) -> float:
@@ -123,6 +141,9 @@ def getEqBandwidth(index: int, band: int) -> float:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.eqBandwidth[index * model.eqBands + band]
     return 0.0
 
 
@@ -142,3 +163,6 @@ def setEqBandwidth(index: int, band: int, value: float) -> None:
 
     Included since API Version 35
     """
+    model = getMixerModel()
+    if model is not None:
+        model.eqBandwidth[index * model.eqBands + band] = value
@@ -4,6 +4,7 @@ Mixer > Events
 Functions for managing events on effects plugins
 """
 import midi
+from fl_headless import getMixerModel
 
 
 def getTrackPluginId(index: int, plugIndex: int) -> int:
@@ -81,6 +82,9 @@ def getEventValue(
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.events.get(index, 0)
     return 0
 
 
@@ -210,4 +214,9 @@ def automateEvent(
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        if isIncrement:
+            value += model.events.get(index, 0)
+        model.events[index] = value
     return 0
@@ -6,6 +6,7 @@ Properties of the mixer and other aspects of FL Studio as a whole
 from typing import Literal, overload
 
 import midi
+from fl_headless import getMixerModel
 
 
 def getTrackInfo(mode: int) -> int:
@@ -34,6 +35,15 @@ def getTrackInfo(mode: int) -> int:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        if mode == midi.TN_Master:
+            return 0
+        if mode == midi.TN_FirstIns:
+            return 1
+        if mode == midi.TN_LastIns:
+            return model.trackCount - 2
+        return model.trackCount - 1
     return 0
 
 
@@ -52,6 +62,9 @@ def trackCount() -> int:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.trackCount
     return 0
 
 
@@ -3,6 +3,7 @@ Mixer > Selection
 
 Functions for interacting with the mixer selection.
 """
+from fl_headless import getMixerModel
 
 
 def trackNumber() -> int:
@@ -15,6 +16,9 @@ def trackNumber() -> int:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return max(model.selected.find(1), 0)
     return 0
 
 
@@ -46,6 +50,10 @@ def setTrackNumber(trackNumber: int, flags: int = 0) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.selected[:] = bytes(len(model.selected))
+        model.selected[trackNumber] = 1
 
 
 def isTrackSelected(index: int) -> bool:
@@ -62,6 +70,9 @@ def isTrackSelected(index: int) -> bool:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.selected[index])
     return False
 
 
@@ -75,6 +86,9 @@ def selectTrack(index: int) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.selected[index] ^= 1
 
 
 def selectAll() -> None:
@@ -83,6 +97,9 @@ def selectAll() -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.selected[:] = b'\x01' * len(model.selected)
 
 
 def deselectAll() -> None:
@@ -91,6 +108,9 @@ def deselectAll() -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.selected[:] = bytes(len(model.selected))
 
 
 def setActiveTrack(index: int):
@@ -105,3 +125,7 @@ def setActiveTrack(index: int):
 
     Included since API Version 27.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.selected[:] = bytes(len(model.selected))
+        model.selected[index] = 1
@@ -4,6 +4,8 @@ Mixer > Tracks
 Code for managing the properties of mixer tracks
 """
 import midi
+from fl_headless import getMixerModel
+from utils import VolTodB
 
 
 def getTrackName(index: int) -> str:
@@ -20,6 +22,9 @@ def getTrackName(index: int) -> str:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.names[index] or model.defaultName(index)
     return ""
 
 
@@ -38,6 +43,9 @@ def setTrackName(index: int, name: str) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.names[index] = name
 
 
 def getTrackColor(index: int) -> int:
@@ -56,6 +64,9 @@ def getTrackColor(index: int) -> int:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.color[index]
     return 0
 
 
@@ -73,6 +84,9 @@ def setTrackColor(index: int, color: int) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.color[index] = color
 
 
 def getSlotColor(index: int, slot: int) -> int:
@@ -93,6 +107,9 @@ def getSlotColor(index: int, slot: int) -> int:
 
     Included since API Version 32.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.slotColor[index * model.slotCount + slot]
     return 0
 
 
@@ -112,6 +129,9 @@ def setSlotColor(index: int, slot: int, color: int) -> None:
 
     Included since API Version 32.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.slotColor[index * model.slotCount + slot] = color
 
 
 def isTrackArmed(index: int) -> bool:
@@ -128,6 +148,9 @@ def isTrackArmed(index: int) -> bool:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.armed[index])
     return False
 
 
@@ -141,6 +164,9 @@ def armTrack(index: int) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.armed[index] ^= 1
 
 
 def isTrackSolo(index: int) -> bool:
@@ -157,6 +183,9 @@ def isTrackSolo(index: int) -> bool:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.solo[index])
     return False
 
 
@@ -181,6 +210,13 @@ def soloTrack(index: int, value: int = -1, mode: int = -1) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        solo = not model.solo[index] if value == -1 else bool(value)
+        # Soloing a track un-solos all the others
+        if solo:
+            model.solo[:] = bytes(len(model.solo))
+        model.solo[index] = solo
 
 
 def isTrackEnabled(index: int) -> bool:
@@ -201,6 +237,9 @@ def isTrackEnabled(index: int) -> bool:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return not model.muted[index]
     return False
 
 
@@ -238,6 +277,9 @@ def enableTrack(index: int) -> None:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.muted[index] ^= 1
 
 
 def isTrackMuted(index: int) -> bool:
@@ -254,6 +296,9 @@ def isTrackMuted(index: int) -> bool:
 
     Included since API version 2.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.muted[index])
     return False
 
 
@@ -270,6 +315,10 @@ def muteTrack(index: int, value: int = -1) -> None:
 
     Included since API version 2.
     """
+    model = getMixerModel()
+    if model is not None:
+        mute = not model.muted[index] if value == -1 else bool(value)
+        model.muted[index] = mute
 
 
 def isTrackMuteLock(index: int) -> bool:
@@ -311,6 +360,10 @@ def getTrackVolume(index: int, mode: int = 0) -> float:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        volume = model.volume[index]
+        return VolTodB(volume) if mode else volume
     return 0.0
 
 
@@ -335,6 +388,9 @@ def setTrackVolume(
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.volume[index] = volume
 
 
 def getTrackPan(index: int) -> float:
@@ -353,6 +409,9 @@ def getTrackPan(index: int) -> float:
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.pan[index]
     return 0.0
 
 
@@ -378,6 +437,9 @@ def setTrackPan(
 
     Included since API version 1.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.pan[index] = pan
 
 
 def getTrackStereoSep(index: int) -> float:
@@ -396,6 +458,9 @@ def getTrackStereoSep(index: int) -> float:
 
     Included since API version 12.
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.stereoSep[index]
     return 0.0
 
 
@@ -421,6 +486,9 @@ def setTrackStereoSep(
 
     Included since API version 12.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.stereoSep[index] = pan
 
 
 def setRouteTo(
@@ -452,6 +520,13 @@ def setRouteTo(
 
     Included since API version 1
     """
+    model = getMixerModel()
+    if model is not None:
+        routes = model.routes.setdefault(index, {})
+        if not value:
+            routes.pop(destIndex, None)
+        elif destIndex not in routes:
+            routes[destIndex] = 0.8
 
 
 def setRouteToLevel(index: int, destIndex: int, level: float) -> None:
@@ -473,6 +548,11 @@ def setRouteToLevel(index: int, destIndex: int, level: float) -> None:
 
     Included since API Version 36
     """
+    model = getMixerModel()
+    if model is not None:
+        routes = model.routes.get(index)
+        if routes is not None and destIndex in routes:
+            routes[destIndex] = level
 
 
 def getRouteToLevel(index: int, destIndex: int) -> float:
@@ -494,6 +574,9 @@ def getRouteToLevel(index: int, destIndex: int) -> float:
 
     Included since API Version 36
     """
+    model = getMixerModel()
+    if model is not None:
+        return model.routes.get(index, {}).get(destIndex, 0.0)
     return 0.0
 
 
@@ -513,6 +596,9 @@ def getRouteSendActive(index: int, destIndex: int) -> bool:
 
     Included since API version 1
     """
+    model = getMixerModel()
+    if model is not None:
+        return destIndex in model.routes.get(index, ())
     return False
 
 
@@ -554,6 +640,13 @@ def getTrackPeaks(index: int, mode: int) -> float:
 
     Included since API version 1
     """
+    model = getMixerModel()
+    if model is not None:
+        if mode == 0:
+            return model.peaksLeft[index]
+        if mode == 1:
+            return model.peaksRight[index]
+        return max(model.peaksLeft[index], model.peaksRight[index])
     return 0.0
 
 
@@ -634,6 +727,9 @@ def isTrackSlotsEnabled(index: int) -> bool:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.slotsEnabled[index])
     return False
 
 
@@ -660,6 +756,9 @@ def enableTrackSlots(index: int, value: bool = False) -> None:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.slotsEnabled[index] = value
 
 
 def isTrackRevPolarity(index: int) -> bool:
@@ -676,6 +775,9 @@ def isTrackRevPolarity(index: int) -> bool:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.revPolarity[index])
     return False
 
 
@@ -695,6 +797,9 @@ def revTrackPolarity(index: int, value: bool = False) -> None:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.revPolarity[index] = value
 
 
 def isTrackSwapChannels(index: int) -> bool:
@@ -712,6 +817,9 @@ def isTrackSwapChannels(index: int) -> bool:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        return bool(model.swapChannels[index])
     return False
 
 
@@ -732,6 +840,9 @@ def swapTrackChannels(index: int, value: bool = False) -> None:
 
     Included since API Version 19.
     """
+    model = getMixerModel()
+    if model is not None:
+        model.swapChannels[index] = value
 
 
 def linkChannelToTrack(
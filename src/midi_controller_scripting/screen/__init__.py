@@ -15,6 +15,7 @@ These functions are undocumented. If you know how they work, I'd massively
 appreciate a pull request with improvements to the type safety and
 documentation.
 """
+from fl_headless import getScreenModel
 
 
 def init(
@@ -48,6 +49,10 @@ def init(
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.resize(display_width, display_height)
+        model.textRowHeight = text_row_height
 
 
 def deInit() -> None:
@@ -99,6 +104,9 @@ def update() -> None:
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.update()
 
 
 def addMeter(*args) -> None:
@@ -116,6 +124,9 @@ def addTextLine(text: str, line: int, /) -> None:
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.displayText(text, line * model.textRowHeight)
 
 
 def animateText(*args) -> None:
@@ -144,6 +155,9 @@ def displayBar(zero: int, vertical_position: int, text: str, value, bipolar) ->
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.displayBar(text, vertical_position, value, bipolar)
 
 
 def displayText(
@@ -186,6 +200,14 @@ def displayText(
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.displayText(
+            text,
+            text_row * model.textRowHeight,
+            font,
+            justification,
+        )
 
 
 def displayTimedText(text: str, text_row: int) -> None:
@@ -204,6 +226,9 @@ def displayTimedText(text: str, text_row: int) -> None:
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.displayText(text, text_row * model.textRowHeight)
 
 
 def drawRect(*args) -> None:
@@ -244,6 +269,9 @@ def fillRect(
 
     Included since API Version 1
     """
+    model = getScreenModel()
+    if model is not None:
+        model.fillRect(start_x, start_y, end_x, end_y, value)
 
 
 def findTextLine(*args) -> None:
@@ -20,8 +20,33 @@ Many of the provided functions in the FL Studio installation have bugs
 that may result in unexpected behavior. These bugs have been left as-is in this
 file for your inspection and warnings have been added to the docstrings. Use
 any functions here with caution.
+
+## Additions
+
+The functions and classes at the end of this module are not part of FL
+Studio's copy of this module, and are only provided by these stubs.
+
+* The batch color functions (such as `ColorToRGBArray`) apply the color
+  functions above to many values at once, giving results that are identical
+  to calling them on each value, including their bugs.
+* `TVolumeTable` converts volumes to and from decibels using a lookup table,
+  as a faster approximation of `VolTodB`.
+* `TPaletteMatcher` maps colors to the nearest color in a controller's LED
+  palette.
+
+If NumPy is installed, it is used for the floating point calculations.
 """
+import functools
 import math
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore[assignment]
 
 
 class TRect:
@@ -536,3 +561,606 @@ def VolTodB(Value: float) -> float:
     if Value == 0:
         return 0
     return round(math.log10(Value) * 20, 1)
+
+
+def ColorToRGBArray(Colors: 'Sequence[int]') -> 'tuple[array, array, array]':
+    """Convert a sequence of integer colors to arrays of their red, green and
+    blue components, using range 0-255.
+
+    The components are extracted by viewing the colors as bytes, rather than
+    by calculating them one at a time.
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * Colors (Sequence[int]): colors as integers
+
+    ## Returns:
+     * array: red of each color (typecode `'B'`)
+
+     * array: green of each color (typecode `'B'`)
+
+     * array: blue of each color (typecode `'B'`)
+    """
+    packed = array('q', Colors)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    raw = packed.tobytes()
+    return array('B', raw[2::8]), array('B', raw[1::8]), array('B', raw[0::8])
+
+
+def RGBToColorArray(
+    R: 'Sequence[int]',
+    G: 'Sequence[int]',
+    B: 'Sequence[int]',
+) -> array:
+    """Convert sequences of red, green and blue components to an array of
+    integer colors. values must be 0-255
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * R (Sequence[int]): red of each color
+
+     * G (Sequence[int]): green of each color
+
+     * B (Sequence[int]): blue of each color
+
+    ## Returns:
+     * array: colors (typecode `'q'`)
+    """
+    packed = bytearray(8 * len(R))
+    packed[2::8] = array('B', R)
+    packed[1::8] = array('B', G)
+    packed[0::8] = array('B', B)
+    colors = array('q', packed)
+    if sys.byteorder == 'big':
+        colors.byteswap()
+    return colors
+
+
+def _floats(values: 'Sequence[float]') -> 'numpy.ndarray':
+    """Returns a sequence as a NumPy array of floats"""
+    return numpy.asarray(values, dtype=numpy.float64)
+
+
+def RGBToHSVArray(
+    R: 'Sequence[float]',
+    G: 'Sequence[float]',
+    B: 'Sequence[float]',
+) -> 'tuple[array, array, array]':
+    """Convert sequences of RGB colors to HSV colors
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * R (Sequence[float]): red of each color (0.0 - 1.0)
+
+     * G (Sequence[float]): green of each color (0.0 - 1.0)
+
+     * B (Sequence[float]): blue of each color (0.0 - 1.0)
+
+    ## Returns:
+     * array: hue of each color (degrees: 0.0-360, typecode `'d'`)
+
+     * array: saturation of each color (0.0-1.0, typecode `'d'`)
+
+     * array: value/luminosity of each color (0.0/1.0, typecode `'d'`)
+    """
+    if numpy is None:
+        H, S, V = (array('d'), array('d'), array('d'))
+        for r, g, b in zip(R, G, B, strict=True):
+            h, s, v = RGBToHSV(r, g, b)
+            H.append(h)
+            S.append(s)
+            V.append(v)
+        return H, S, V
+    return _rgbToHSV(_floats(R), _floats(G), _floats(B))
+
+
+def _rgbToHSV(
+    r: 'numpy.ndarray',
+    g: 'numpy.ndarray',
+    b: 'numpy.ndarray',
+) -> 'tuple[array, array, array]':
+    """Convert NumPy arrays of RGB colors to HSV colors, as `RGBToHSV` does"""
+    Min = numpy.minimum(numpy.minimum(r, g), b)
+    Vs = numpy.maximum(numpy.maximum(r, g), b)
+    Delta = Vs - Min
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        Ss = numpy.where(Vs == 0, 0.0, Delta / Vs)
+        Hs = numpy.where(
+            r == Vs,
+            60.0 * (g - b) / Delta,
+            numpy.where(
+                g == Vs,
+                120.0 + 60.0 * (b - r) / Delta,
+                240.0 + 60.0 * (r - g) / Delta,
+            ),
+        )
+    Hs = numpy.where(Ss == 0.0, 0.0, numpy.where(Hs < 0.0, Hs + 360.0, Hs))
+    return (
+        array('d', Hs.tobytes()),
+        array('d', Ss.tobytes()),
+        array('d', Vs.tobytes()),
+    )
+
+
+def RGBToHSVColorArray(
+    Colors: 'Sequence[int]',
+) -> 'tuple[array, array, array]':
+    """Convert a sequence of integer colors to HSV colors
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * Colors (Sequence[int]): colors as integers (`0x--BBGGRR`)
+
+    ## Returns:
+     * array: hue of each color (typecode `'d'`)
+
+     * array: saturation of each color (typecode `'d'`)
+
+     * array: value (brightness) of each color (typecode `'d'`)
+    """
+    r, g, b = ColorToRGBArray(Colors)
+    if numpy is None:
+        return RGBToHSVArray(
+            [x / 255 for x in r],
+            [x / 255 for x in g],
+            [x / 255 for x in b],
+        )
+    return _rgbToHSV(
+        numpy.asarray(r) / 255,
+        numpy.asarray(g) / 255,
+        numpy.asarray(b) / 255,
+    )
+
+
+def HSVtoRGBArray(
+    H: 'Sequence[float]',
+    S: 'Sequence[float]',
+    V: 'Sequence[float]',
+) -> 'tuple[array, array, array]':
+    """Convert sequences of HSV colors to RGB colors
+
+    WARNING: This function returns data in an unexpected format! Be sure to
+    convert as required before usage.
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * H (Sequence[float]): hue of each color (degrees: 0.0-360)
+
+     * S (Sequence[float]): saturation of each color (0-1.0)
+
+     * V (Sequence[float]): value/luminosity of each color (0-1.0)
+
+    ## Returns:
+     * array: red of each color (0.0-1.0, typecode `'d'`)
+
+     * array: green of each color (0.0-1.0, typecode `'d'`)
+
+     * array: blue of each color (0.0-1.0, typecode `'d'`)
+
+    WARNING:
+     * Unlike `HSVtoRGB`, which fails with an `UnboundLocalError`, this raises
+       a `ValueError` for hues outside of 0.0-360
+    """
+    if numpy is None:
+        Rs, Gs, Bs = (array('d'), array('d'), array('d'))
+        for h, s, v in zip(H, S, V, strict=True):
+            try:
+                r, g, b = HSVtoRGB(h, s, v)
+            except UnboundLocalError:
+                raise ValueError("Hues must be within 0.0-360") from None
+            Rs.append(r)
+            Gs.append(g)
+            Bs.append(b)
+        return Rs, Gs, Bs
+    h, s, v = _floats(H), _floats(S), _floats(V)
+    hTemp = numpy.where(h == 360.0, 0.0, h) / 60
+    i = numpy.trunc(hTemp)
+    f = hTemp - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - (s * f))
+    t = v * (1.0 - (s * (1.0 - f)))
+    grey = s == 0.0
+    if not numpy.all(grey | ((i >= 0) & (i <= 5))):
+        # HSVtoRGB fails for these hues, since it doesn't assign a result
+        raise ValueError("Hues must be within 0.0-360")
+    sector = numpy.where(grey, 0, i).astype(numpy.intp)
+    choices = numpy.stack(
+        [v, q, p, p, t, v, t, v, v, q, p, p, p, p, t, v, v, q])
+    rgb = choices.reshape(3, 6, -1)[:, sector, numpy.arange(len(v))]
+    rgb[:, grey] = v[grey]
+    return (
+        array('d', rgb[0].tobytes()),
+        array('d', rgb[1].tobytes()),
+        array('d', rgb[2].tobytes()),
+    )
+
+
+def FadeColorArray(
+    StartColors: 'Sequence[int]',
+    EndColors: 'Sequence[int]',
+    Value: float,
+) -> array:
+    """Fade between pairs of colors
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * StartColors (Sequence[int]): color integers
+
+     * EndColors (Sequence[int]): color integers
+
+     * Value (float): fade position (0-255)
+
+    ## Returns:
+     * array: faded colors (typecode `'q'`)
+
+    WARNING:
+     * Blue value is incorrect, using green start value, as in `FadeColor`
+    """
+    if numpy is None:
+        return array('q', [
+            FadeColor(start, end, Value)
+            for start, end in zip(StartColors, EndColors, strict=True)
+        ])
+    rStart, gStart, _ = map(numpy.asarray, ColorToRGBArray(StartColors))
+    rEnd, gEnd, bEnd = map(numpy.asarray, ColorToRGBArray(EndColors))
+    ratio = Value / 255
+    r = numpy.rint(rStart * (1 - ratio) + (rEnd * ratio))
+    g = numpy.rint(gStart * (1 - ratio) + (gEnd * ratio))
+    b = numpy.rint(gStart * (1 - ratio) + (bEnd * ratio))
+    return _packColors(r, g, b)
+
+
+def LightenColorArray(Colors: 'Sequence[int]', Value: float) -> array:
+    """Lighten colors by a certain amount
+
+    NOTE: This function is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Args:
+     * Colors (Sequence[int]): color integers
+
+     * Value (float): amount to lighten by (0-255)
+
+    ## Returns:
+     * array: lightened colors (typecode `'q'`)
+    """
+    if numpy is None:
+        return array('q', [LightenColor(color, Value) for color in Colors])
+    r, g, b = map(numpy.asarray, ColorToRGBArray(Colors))
+    ratio = Value / 255
+    return _packColors(
+        numpy.rint(r + (1.0 - r) * ratio),
+        numpy.rint(g + (1.0 - g) * ratio),
+        numpy.rint(b + (1.0 - b) * ratio),
+    )
+
+
+def _packColors(
+    R: 'numpy.ndarray',
+    G: 'numpy.ndarray',
+    B: 'numpy.ndarray',
+) -> array:
+    """Pack rounded NumPy arrays of components into colors, as `RGBToColor`
+    does"""
+    r, g, b = (x.astype(numpy.int64) for x in (R, G, B))
+    return array('q', ((r << 16) | (g << 8) | b).tobytes())
+
+
+def _dBToVol(Value: float) -> float:
+    """Convert a decibel value to a volume as a decimal (0.0 - 1.0), as the
+    inverse of `VolTodB` (ignoring its rounding)"""
+    return math.log(10 ** (Value / 20) * 10 + 1) / math.log(11)
+
+
+class TVolumeTable:
+    """Converts volumes to and from decibels using a lookup table, as a faster
+    approximation of `VolTodB` for scripts that convert many volumes, such as
+    when updating meters.
+
+    The table holds the exact decibel value of evenly spaced volumes, and
+    values between them are linearly interpolated. The curve is too steep to
+    interpolate accurately close to zero volume, so volumes below
+    `32 / Resolution`, as well as volumes outside of 0.0 - 1.0, are converted
+    using the exact formula instead.
+
+    Before rounding, interpolated decibel values are within 0.0011 dB of the
+    exact value at any resolution, and interpolated volumes are within
+    0.000001 of the exact value at the default resolution. Since `VolTodB`
+    rounds its result to 0.1 dB, results can differ from it by 0.1 dB when the
+    exact value is within that error of a rounding boundary.
+
+    NOTE: This class is not available in FL Studio, and is only provided by
+    these stubs.
+    """
+
+    EXACT_STEPS = 32
+    """Number of steps of the table, starting from zero volume, which are
+    converted using the exact formula"""
+
+    def __init__(self, Resolution: int = 4096) -> None:
+        """Create a volume table
+
+        ## Args:
+         * Resolution (int, optional): number of steps in the table. Higher
+           resolutions use more memory, but convert fewer volumes using the
+           exact formula. Defaults to `4096`.
+        """
+        if Resolution <= self.EXACT_STEPS:
+            raise ValueError(
+                f"Resolution must be greater than {self.EXACT_STEPS} "
+                f"(got {Resolution})"
+            )
+        self.Resolution = Resolution
+        self.dB = array('d', [
+            math.log10((math.exp(i / Resolution * math.log(11)) - 1) * 0.1)
+            * 20 if i else -math.inf
+            for i in range(Resolution + 1)
+        ])
+        """Exact decibel value of each step of the table"""
+        if numpy is not None:
+            self.__steps = numpy.arange(Resolution + 1) / Resolution
+            self.__table = numpy.frombuffer(self.dB, numpy.float64)
+
+    def VolTodB(self, Value: float) -> float:
+        """Convert volume as a decimal (0.0 - 1.0) to a decibel value
+
+        ### WARNING:
+        * As with `VolTodB`, for zero volume, this returns 0 instead of
+          -oo dB
+
+        ## Args:
+         * Value (float): volume
+
+        ## Returns:
+         * float: volume in decibels, rounded to 0.1 dB
+        """
+        x = Value * self.Resolution
+        i = int(x)
+        if not self.EXACT_STEPS <= i < self.Resolution:
+            return VolTodB(Value)
+        dB = self.dB[i]
+        return round(dB + (self.dB[i + 1] - dB) * (x - i), 1)
+
+    def dBToVol(self, Value: float) -> float:
+        """Convert a decibel value to a volume as a decimal (0.0 - 1.0)
+
+        ## Args:
+         * Value (float): volume in decibels
+
+        ## Returns:
+         * float: volume
+        """
+        table = self.dB
+        first = self.EXACT_STEPS
+        if not table[first] <= Value <= table[-1]:
+            return _dBToVol(Value)
+        i = min(bisect_right(table, Value, first), self.Resolution) - 1
+        dB = table[i]
+        return (i + (Value - dB) / (table[i + 1] - dB)) / self.Resolution
+
+    def VolTodBArray(self, Values: 'Sequence[float]') -> array:
+        """Convert a sequence of volumes as decimals (0.0 - 1.0) to decibel
+        values
+
+        ## Args:
+         * Values (Sequence[float]): volumes
+
+        ## Raises:
+         * ValueError: a volume is negative, as for `VolTodB`
+
+        ## Returns:
+         * array: volumes in decibels, rounded to 0.1 dB (typecode `'d'`)
+        """
+        if numpy is None:
+            return array('d', map(self.VolTodB, Values))
+        v = numpy.asarray(Values, dtype=numpy.float64)
+        dB = numpy.interp(v, self.__steps, self.__table)
+        exact = (v < self.EXACT_STEPS / self.Resolution) | (v >= 1.0)
+        if exact.any():
+            if (v < 0).any():
+                # Match the math domain error raised by `VolTodB`
+                raise ValueError(
+                    f"Volumes must not be negative (got {v[v < 0][0]})")
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                scaled = (numpy.exp(v[exact] * math.log(11)) - 1) * 0.1
+                dB[exact] = numpy.where(
+                    scaled == 0, 0.0, numpy.log10(scaled) * 20)
+        return array('d', numpy.round(dB, 1).tobytes())
+
+    def dBToVolArray(self, Values: 'Sequence[float]') -> array:
+        """Convert a sequence of decibel values to volumes as decimals
+        (0.0 - 1.0)
+
+        ## Args:
+         * Values (Sequence[float]): volumes in decibels
+
+        ## Returns:
+         * array: volumes (typecode `'d'`)
+        """
+        if numpy is None:
+            return array('d', map(self.dBToVol, Values))
+        dB = numpy.asarray(Values, dtype=numpy.float64)
+        first = self.EXACT_STEPS
+        table = self.__table[first:]
+        v = numpy.interp(dB, table, self.__steps[first:])
+        exact = (dB < table[0]) | (dB > table[-1])
+        if exact.any():
+            v[exact] = numpy.log(
+                10 ** (dB[exact] / 20) * 10 + 1) / math.log(11)
+        return array('d', v.tobytes())
+
+
+class TPaletteMatcher:
+    """Maps colors to the nearest color in a palette, such as the palette of
+    LED colors of a controller.
+
+    The distance between colors is the squared distance between their red,
+    green and blue components.
+
+    `Match` finds colors using a lookup table of the nearest palette color for
+    each cell of an RGB cube, with `Bits` bits per component, so that each
+    lookup takes constant time. Since the colors in a cell share a single
+    entry, this is an approximation. `MatchExact` finds the exact nearest
+    color, and remembers the results for the most recently used colors.
+
+    If NumPy is installed, the whole table is calculated when the matcher is
+    created. Otherwise, each entry is calculated the first time it is used.
+
+    NOTE: This class is not available in FL Studio, and is only provided by
+    these stubs.
+
+    ## Example:
+
+    ```py
+    matcher = utils.TPaletteMatcher(LAUNCHPAD_PALETTE)
+    for i in range(8):
+        velocity = matcher.Match(mixer.getTrackColor(i + 1))
+        device.midiOutMsg(0x90, 0, PADS[i], velocity)
+    ```
+    """
+
+    def __init__(
+        self,
+        Palette: 'Sequence[int]',
+        Bits: int = 5,
+        CacheSize: int = 1024,
+    ) -> None:
+        """Create a palette matcher
+
+        ## Args:
+         * Palette (Sequence[int]): colors of the palette, as integers. The
+           index of each color is returned when it is matched.
+
+         * Bits (int, optional): number of bits of each component used to
+           index the lookup table (1-8). The table has `2 ** (3 * Bits)`
+           entries. Defaults to `5`.
+
+         * CacheSize (int, optional): number of colors to remember the results
+           of `MatchExact` for. Defaults to `1024`.
+        """
+        if not Palette:
+            raise ValueError("Palette must contain at least one color")
+        if len(Palette) > 0x7FFF:
+            raise ValueError(
+                f"Palette must have at most {0x7FFF} colors "
+                f"(got {len(Palette)})"
+            )
+        if not 1 <= Bits <= 8:
+            raise ValueError(f"Bits must be 1-8 (got {Bits})")
+        self.Palette = list(Palette)
+        self.Bits = Bits
+        self.__rgb = [ColorToRGB(color) for color in self.Palette]
+        self.__shift = 8 - Bits
+        self.__table = array('h', [-1]) * (1 << (3 * Bits))
+        self.__exact = functools.lru_cache(CacheSize)(self.__matchExact)
+        if numpy is not None:
+            self.__fillTable()
+
+    def __nearest(self, R: int, G: int, B: int) -> int:
+        """Returns the index of the palette color nearest to a color"""
+        best = 0
+        bestDistance = 0x40000
+        for i, (r, g, b) in enumerate(self.__rgb):
+            distance = (r - R) ** 2 + (g - G) ** 2 + (b - B) ** 2
+            if distance < bestDistance:
+                best = i
+                bestDistance = distance
+        return best
+
+    def __center(self, cell: int) -> int:
+        """Returns the component value at the center of a cell of the table"""
+        return (cell << self.__shift) + (1 << self.__shift >> 1)
+
+    def __fillTable(self) -> None:
+        """Calculate every entry of the table using NumPy"""
+        size = 1 << self.Bits
+        centers = numpy.array([self.__center(i) for i in range(size)])
+        palette = numpy.array(self.__rgb, dtype=numpy.int64)
+        # Distance from each green and blue center to each palette color,
+        # with shape (green, blue, palette)
+        gb = (
+            (centers[:, None, None] - palette[:, 1]) ** 2
+            + (centers[None, :, None] - palette[:, 2]) ** 2
+        )
+        table = numpy.frombuffer(self.__table, numpy.int16)
+        # Fill one red slice of the cube at a time, to limit memory use
+        for red in range(size):
+            distances = gb + (centers[red] - palette[:, 0]) ** 2
+            table[red * size * size:(red + 1) * size * size] = (
+                distances.argmin(axis=2).ravel())
+
+    def __matchExact(self, Color: int) -> int:
+        return self.__nearest(*ColorToRGB(Color))
+
+    def Match(self, Color: int) -> int:
+        """Returns the index of the palette color nearest to a color, using
+        the lookup table
+
+        ## Args:
+         * Color (int): color as integer
+
+        ## Returns:
+         * int: index of the palette color
+        """
+        shift = self.__shift
+        bits = self.Bits
+        mask = (1 << bits) - 1
+        cell = (
+            ((Color >> (16 + shift)) & mask) << (2 * bits)
+            | ((Color >> (8 + shift)) & mask) << bits
+            | (Color >> shift) & mask
+        )
+        index = self.__table[cell]
+        if index == -1:
+            index = self.__table[cell] = self.__nearest(
+                self.__center(cell >> (2 * bits)),
+                self.__center((cell >> bits) & mask),
+                self.__center(cell & mask),
+            )
+        return index
+
+    def MatchExact(self, Color: int) -> int:
+        """Returns the index of the palette color nearest to a color
+
+        Results are remembered for the most recently matched colors.
+
+        ## Args:
+         * Color (int): color as integer
+
+        ## Returns:
+         * int: index of the palette color
+        """
+        return self.__exact(Color & 0xFFFFFF)
+
+    def MatchArray(self, Colors: 'Sequence[int]') -> array:
+        """Returns the index of the palette color nearest to each of a
+        sequence of colors, using the lookup table
+
+        ## Args:
+         * Colors (Sequence[int]): colors as integers
+
+        ## Returns:
+         * array: index of each palette color (typecode `'h'`)
+        """
+        if numpy is None:
+            return array('h', map(self.Match, Colors))
+        r, g, b = (
+            numpy.asarray(c, dtype=numpy.intp) >> self.__shift
+            for c in ColorToRGBArray(Colors)
+        )
+        cells = (r << (2 * self.Bits)) | (g << self.Bits) | b
+        table = numpy.frombuffer(self.__table, numpy.int16)
+        return array('h', table[cells].tobytes())
@@ -15,6 +15,9 @@ be used in scripts that run in FL Studio's piano roll.
   contents.
 * {{docs_url_attr[flpianoroll.Note]}}: a class to represent notes in the piano
   roll.
+* {{docs_url_attr[flpianoroll.NoteArray]}}: a compact array of notes, for
+  transforming many notes at once when testing scripts (not available in FL
+  Studio).
 * {{docs_url_attr[flpianoroll.Marker]}}: a class to represent markers in the
   piano roll.
 * {{docs_url_attr[flpianoroll.Utils]}}: a collection of useful functions for
@@ -24,13 +27,14 @@ be used in scripts that run in FL Studio's piano roll.
 from enveditor import Utils
 
 from .__marker import Marker
-from .__note import Note
+from .__note import Note, NoteArray
 from .__score import score
 from .__script_dialog import ScriptDialog
 
 __all__ = [
     "score",
     "Note",
+    "NoteArray",
     "Marker",
     "ScriptDialog",
     "Utils",
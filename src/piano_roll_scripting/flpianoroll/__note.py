@@ -1,6 +1,17 @@
 """
 Notes in the piano roll trigger sounds in instruments.
 """
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from .__score import Score
 
 
 class Note:
@@ -8,6 +19,26 @@ class Note:
     Represents a note in the FL Studio piano roll.
     """
 
+    __slots__ = (
+        '__number',
+        '__time',
+        '__length',
+        '__group',
+        '__pan',
+        '__velocity',
+        '__release',
+        '__color',
+        '__fcut',
+        '__fres',
+        '__pitchofs',
+        '__repeats',
+        '__slide',
+        '__porta',
+        '__muted',
+        '__selected',
+        '_owner',
+    )
+
     def __init__(self) -> None:
         """
         Create a new instance of a `Note` object
@@ -15,40 +46,62 @@ class Note:
         This note won't be added to the piano roll unless it is passed to
         `score.addNote`.
         """
-        pass
+        self.__number = 0
+        self.__time = 0
+        self.__length = 0
+        self.__group = 0
+        self.__pan = 0.5
+        self.__velocity = 0.8
+        self.__release = 0.5
+        self.__color = 0
+        self.__fcut = 0.5
+        self.__fres = 0.5
+        self.__pitchofs = 0
+        self.__repeats = 0
+        self.__slide = False
+        self.__porta = False
+        self.__muted = False
+        self.__selected = False
+        self._owner: Score | None = None
 
     @property
     def number(self) -> int:
         """
         Standard MIDI note number (60 is middle C).
         """
-        return 0
+        return self.__number
 
     @number.setter
     def number(self, new_value: int) -> None:
-        pass
+        if self._owner is not None:
+            self._owner._moveNote(self, new_value, self.__time)
+        self.__number = new_value
 
     @property
     def time(self) -> int:
         """
         Time at which the note begins (in ticks).
         """
-        return 0
+        return self.__time
 
     @time.setter
     def time(self, new_value: int) -> None:
-        pass
+        if self._owner is not None:
+            self._owner._moveNote(self, self.__number, new_value)
+        self.__time = new_value
 
     @property
     def length(self) -> int:
         """
         Length of the note (in ticks).
         """
-        return 0
+        return self.__length
 
     @length.setter
     def length(self, new_value: int) -> None:
-        pass
+        if self._owner is not None:
+            self._owner._resizeNote(self, new_value)
+        self.__length = new_value
 
     @property
     def group(self) -> int:
@@ -59,44 +112,44 @@ class Note:
 
         To un-group notes, set the group number to `0`.
         """
-        return 0
+        return self.__group
 
     @group.setter
     def group(self, new_value: int) -> None:
-        pass
+        self.__group = new_value
 
     @property
     def pan(self) -> float:
         """
         The panning value of the note, between `0` and `1`. `0.5` is centered.
         """
-        return 0.5
+        return self.__pan
 
     @pan.setter
     def pan(self, new_value: float) -> None:
-        pass
+        self.__pan = new_value
 
     @property
     def velocity(self) -> float:
         """
         The velocity of the note, between `0` and `1`. `0.8` is the default.
         """
-        return 0.8
+        return self.__velocity
 
     @velocity.setter
     def velocity(self, new_value: float) -> None:
-        pass
+        self.__velocity = new_value
 
     @property
     def release(self) -> float:
         """
         The release of the note, between `0` and `1`. `0.5` is the default.
         """
-        return 0.5
+        return self.__release
 
     @release.setter
     def release(self, new_value: float) -> None:
-        pass
+        self.__release = new_value
 
     @property
     def color(self) -> int:
@@ -104,11 +157,11 @@ class Note:
         The color of the note, between `0` and `15`. `0` is the default note
         color.
         """
-        return 0
+        return self.__color
 
     @color.setter
     def color(self, new_value: int) -> None:
-        pass
+        self.__color = new_value
 
     @property
     def fcut(self) -> float:
@@ -116,11 +169,11 @@ class Note:
         The note filter cutoff frequency, between `0` and `1`. `0.5` is the
         default.
         """
-        return 0.5
+        return self.__fcut
 
     @fcut.setter
     def fcut(self, new_value: float) -> None:
-        pass
+        self.__fcut = new_value
 
     @property
     def fres(self) -> float:
@@ -128,11 +181,11 @@ class Note:
         The note filter resonance frequency, between `0` and `1`. `0.5` is the
         default.
         """
-        return 0.5
+        return self.__fres
 
     @fres.setter
     def fres(self, new_value: float) -> None:
-        pass
+        self.__fres = new_value
 
     @property
     def pitchofs(self) -> int:
@@ -143,11 +196,11 @@ class Note:
         This is represented in units of 10 cents, so setting
         `note.pitchofs = 42` will set the pitch offset to +420 cents.
         """
-        return 0
+        return self.__pitchofs
 
     @pitchofs.setter
     def pitchofs(self, new_value: int) -> None:
-        pass
+        self.__pitchofs = new_value
 
     @property
     def repeats(self) -> int:
@@ -170,55 +223,55 @@ class Note:
         * `13`: 1/64 (quarter step)
         * `14`: 1/64 triplet
         """
-        return 0
+        return self.__repeats
 
     @repeats.setter
     def repeats(self, new_value: int) -> None:
-        pass
+        self.__repeats = new_value
 
     @property
     def slide(self) -> bool:
         """
         Whether the note is a slide note.
         """
-        return False
+        return self.__slide
 
     @slide.setter
     def slide(self, new_value: bool) -> None:
-        pass
+        self.__slide = new_value
 
     @property
     def porta(self) -> bool:
         """
         Whether the note is a portamento note.
         """
-        return False
+        return self.__porta
 
     @porta.setter
     def porta(self, new_value: bool) -> None:
-        pass
+        self.__porta = new_value
 
     @property
     def muted(self) -> bool:
         """
         Whether the note is muted.
         """
-        return False
+        return self.__muted
 
     @muted.setter
     def muted(self, new_value: bool) -> None:
-        pass
+        self.__muted = new_value
 
     @property
     def selected(self) -> bool:
         """
         Whether the note is selected within the piano roll.
         """
-        return False
+        return self.__selected
 
     @selected.setter
     def selected(self, new_value: bool) -> None:
-        pass
+        self.__selected = new_value
 
     def clone(self) -> 'Note':
         """
@@ -227,4 +280,310 @@ class Note:
         This note will not be added to the piano roll until `score.addNote` is
         called with it as an argument.
         """
-        return self
+        note = Note()
+        note.__number = self.__number
+        note.__time = self.__time
+        note.__length = self.__length
+        note.__group = self.__group
+        note.__pan = self.__pan
+        note.__velocity = self.__velocity
+        note.__release = self.__release
+        note.__color = self.__color
+        note.__fcut = self.__fcut
+        note.__fres = self.__fres
+        note.__pitchofs = self.__pitchofs
+        note.__repeats = self.__repeats
+        note.__slide = self.__slide
+        note.__porta = self.__porta
+        note.__muted = self.__muted
+        note.__selected = self.__selected
+        return note
+
+
+_COLUMNS = (
+    ('number', 'B', 0),
+    ('time', 'i', 0),
+    ('length', 'i', 0),
+    ('group', 'i', 0),
+    ('pan', 'd', 0.5),
+    ('velocity', 'd', 0.8),
+    ('release', 'd', 0.5),
+    ('color', 'B', 0),
+    ('fcut', 'd', 0.5),
+    ('fres', 'd', 0.5),
+    ('pitchofs', 'b', 0),
+    ('repeats', 'B', 0),
+    ('slide', 'B', False),
+    ('porta', 'B', False),
+    ('muted', 'B', False),
+    ('selected', 'B', False),
+)
+"""
+Name, type code and default value of each column of a `NoteArray`.
+"""
+
+
+def _view(column: array) -> 'numpy.ndarray':
+    """
+    Returns a NumPy view of a column of a note array, which modifies it in
+    place.
+    """
+    return numpy.frombuffer(column, column.typecode)
+
+
+def _storeInts(column: array, values: 'numpy.ndarray') -> None:
+    """
+    Store integers calculated using a wider type in a column of a note array,
+    raising an `OverflowError` if they don't fit, as `array` does.
+    """
+    info = numpy.iinfo(column.typecode)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise OverflowError(
+            f"Values don't fit in the range of the column ({info.min} - "
+            f"{info.max})"
+        )
+    _view(column)[:] = values
+
+
+class NoteArray:
+    """
+    A sequence of notes, stored as a typed array for each property.
+
+    Compared to a list of `Note` objects, this uses a small fraction of the
+    memory, and transformations can be applied to all of the notes at once.
+    If NumPy is installed, it is used to apply the transformations, otherwise
+    they loop over the values of each column in Python.
+    Indexing the array gives a `Note` which is a view into it, meaning that
+    changes to the note are stored in the array.
+
+    ## Note
+
+    * This class is not available in FL Studio, and is only provided by these
+      stubs, for use when testing scripts.
+
+    ## Example usage
+
+    ```py
+    notes = NoteArray.fromScore(score)
+    notes.transpose(12)
+    notes.quantize(score.PPQ // 4)
+    score.clearNotes(True)
+    score.addNotes(notes)
+    ```
+    """
+
+    number: array
+    time: array
+    length: array
+    group: array
+    pan: array
+    velocity: array
+    release: array
+    color: array
+    fcut: array
+    fres: array
+    pitchofs: array
+    repeats: array
+    slide: array
+    porta: array
+    muted: array
+    selected: array
+
+    def __init__(self, notes: Iterable[Note] = ()) -> None:
+        """
+        Create a note array.
+
+        ## Args
+
+        * `notes` (`Iterable[Note]`, optional): notes to store in the array.
+          Defaults to no notes.
+        """
+        for name, typecode, _ in _COLUMNS:
+            setattr(self, name, array(typecode))
+        self.extend(notes)
+
+    @classmethod
+    def fromScore(cls, score: 'Score') -> 'NoteArray':
+        """
+        Create a note array containing a copy of the notes in a score.
+
+        ## Args
+
+        * `score` (`Score`): score to copy notes from.
+
+        ## Returns
+
+        * `NoteArray`: array of notes.
+        """
+        return cls(score.getNote(i) for i in range(score.noteCount))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index: int) -> Note:
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Note index {index} out of range")
+        return _NoteView(self, index % len(self))
+
+    def __iter__(self) -> Iterator[Note]:
+        for i in range(len(self)):
+            yield _NoteView(self, i)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used to store the notes.
+        """
+        return sum(
+            len(column) * column.itemsize
+            for column in (getattr(self, name) for name, _, _ in _COLUMNS)
+        )
+
+    def append(self, note: Note) -> None:
+        """
+        Add a copy of a note to the end of the array.
+
+        ## Args
+
+        * `note` (`Note`): note to add.
+        """
+        for name, _, _ in _COLUMNS:
+            getattr(self, name).append(getattr(note, name))
+
+    def extend(self, notes: Iterable[Note]) -> None:
+        """
+        Add copies of notes to the end of the array.
+
+        ## Args
+
+        * `notes` (`Iterable[Note]`): notes to add.
+        """
+        notes = list(notes)
+        for name, _, _ in _COLUMNS:
+            getattr(self, name).extend([getattr(n, name) for n in notes])
+
+    def transpose(self, semitones: int) -> None:
+        """
+        Transpose all notes, clamping them to the range of the piano roll
+        (`0` - `131`).
+
+        ## Args
+
+        * `semitones` (`int`): number of semitones to transpose by.
+        """
+        # Note numbers are stored as bytes, so a translation table can
+        # transpose every note without looping in Python
+        table = bytes(min(max(n + semitones, 0), 131) for n in range(256))
+        self.number = array('B', self.number.tobytes().translate(table))
+
+    def scaleVelocity(self, factor: float) -> None:
+        """
+        Multiply the velocity of all notes, clamping them to the range `0` -
+        `1`.
+
+        ## Args
+
+        * `factor` (`float`): factor to multiply by.
+        """
+        if factor < 0:
+            raise ValueError(f"factor must not be negative (got {factor})")
+        if numpy is not None:
+            values = _view(self.velocity)
+            scaled = values * factor
+            values[:] = numpy.where(scaled < 1.0, scaled, 1.0)
+            return
+        self.velocity = array('d', [
+            v if v < 1.0 else 1.0
+            for v in [v * factor for v in self.velocity]
+        ])
+
+    def shiftTime(self, ticks: int) -> None:
+        """
+        Move all notes in time, clamping their start times to `0`.
+
+        ## Args
+
+        * `ticks` (`int`): number of ticks to move the notes by.
+        """
+        if numpy is not None:
+            times = _view(self.time).astype(numpy.int64) + ticks
+            _storeInts(self.time, numpy.maximum(times, 0))
+            return
+        self.time = array('i', [
+            t if t > 0 else 0 for t in [t + ticks for t in self.time]
+        ])
+
+    def quantize(self, step: int, lengths: bool = False) -> None:
+        """
+        Move the start time of all notes to the nearest multiple of `step`.
+
+        ## Args
+
+        * `step` (`int`): quantization step, in ticks. For example, use
+          `score.PPQ // 4` to quantize to 16th notes.
+
+        * `lengths` (`bool`, optional): whether to also quantize the lengths
+          of the notes, to a minimum of one step. Defaults to `False`.
+        """
+        if step < 1:
+            raise ValueError(f"step must be at least 1 (got {step})")
+        half = step // 2
+        if numpy is not None:
+            times = _view(self.time).astype(numpy.int64)
+            _storeInts(self.time, (times + half) // step * step)
+            if lengths:
+                lens = _view(self.length).astype(numpy.int64)
+                _storeInts(
+                    self.length,
+                    numpy.maximum((lens + half) // step * step, step),
+                )
+            return
+        self.time = array('i', [
+            (t + half) // step * step for t in self.time
+        ])
+        if lengths:
+            self.length = array('i', [
+                n if n > step else step
+                for n in [(n + half) // step * step for n in self.length]
+            ])
+
+
+def _columnProperty(name: str, convert: type | None) -> property:
+    """
+    Create a property which accesses a column of the note array that a
+    `_NoteView` refers to.
+    """
+    def fget(view: '_NoteView') -> Any:
+        value = getattr(view._array, name)[view._row]
+        return value if convert is None else convert(value)
+
+    def fset(view: '_NoteView', new_value: Any) -> None:
+        getattr(view._array, name)[view._row] = new_value
+
+    return property(fget, fset, doc=getattr(Note, name).__doc__)
+
+
+class _NoteView(Note):
+    """
+    A note stored within a `NoteArray`.
+    """
+
+    __slots__ = ('_array', '_row')
+
+    def __init__(self, notes: NoteArray, row: int) -> None:
+        self._array = notes
+        self._row = row
+        self._owner = None
+
+    def clone(self) -> Note:
+        note = Note()
+        for name, _, _ in _COLUMNS:
+            setattr(note, name, getattr(self, name))
+        return note
+
+
+for _name, _, _default in _COLUMNS:
+    setattr(_NoteView, _name, _columnProperty(
+        _name,
+        bool if isinstance(_default, bool) else None,
+    ))
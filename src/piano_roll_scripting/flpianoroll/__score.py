@@ -1,20 +1,105 @@
 """
 The `flpianoroll.score` object is used to represent the state of the piano
 roll.
+
+Outside of FL Studio, the score is stored in memory, so that piano roll
+scripts can be tested by adding notes to it, running the script, and checking
+the resulting notes.
 """
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+
 from .__marker import Marker
 from .__note import Note
 
 
+class _NoteIndex:
+    """
+    Index of the notes in a score, used to find the notes that overlap a range
+    of times and pitches without checking every note.
+
+    Notes are grouped by pitch, and each group is sorted by start time. Since
+    the maximum note length in each group is tracked, the notes overlapping a
+    time range can be found using a binary search over the start times.
+    """
+
+    def __init__(self, notes: Iterable[Note]) -> None:
+        groups: dict[int, list[Note]] = {}
+        for note in notes:
+            groups.setdefault(note.number, []).append(note)
+        self.notes: dict[int, list[Note]] = {}
+        self.times: dict[int, list[int]] = {}
+        self.maxLength: dict[int, int] = {}
+        for pitch, group in groups.items():
+            # Sorting is stable, so notes at the same time keep their order
+            group.sort(key=lambda n: n.time)
+            self.notes[pitch] = group
+            self.times[pitch] = [n.time for n in group]
+            self.maxLength[pitch] = max(n.length for n in group)
+
+    def add(self, note: Note, number: int, time: int, length: int) -> None:
+        notes = self.notes.get(number)
+        if notes is None:
+            self.notes[number] = [note]
+            self.times[number] = [time]
+            self.maxLength[number] = length
+            return
+        times = self.times[number]
+        i = bisect_right(times, time)
+        times.insert(i, time)
+        notes.insert(i, note)
+        if length > self.maxLength[number]:
+            self.maxLength[number] = length
+
+    def remove(self, note: Note, number: int, time: int) -> None:
+        notes = self.notes[number]
+        times = self.times[number]
+        i = bisect_left(times, time)
+        while notes[i] is not note:
+            i += 1
+        del notes[i]
+        del times[i]
+        # The maximum length is left as it is, since it only needs to be an
+        # upper bound
+
+    def grow(self, number: int, length: int) -> None:
+        if length > self.maxLength[number]:
+            self.maxLength[number] = length
+
+    def query(
+        self,
+        start: int,
+        end: int,
+        minPitch: int,
+        maxPitch: int,
+    ) -> Iterator[Note]:
+        for pitch, times in self.times.items():
+            if not minPitch <= pitch <= maxPitch:
+                continue
+            notes = self.notes[pitch]
+            first = bisect_right(times, start - self.maxLength[pitch])
+            last = bisect_left(times, end)
+            for i in range(first, last):
+                note = notes[i]
+                if times[i] + note.length > start:
+                    yield note
+
+
 class Score:
     """
     Access via the module attribute `flpianoroll.score`.
 
     Represents the current selection of the FL Studio score, or, if there is no
     selection, the full contents of the current instrument on the piano roll.
+
+    Notes are indexed from `0` to `noteCount - 1`. Notes returned by `getNote`
+    belong to the score, so changes to them are reflected in it. Deleting a
+    note moves all notes after it down by one index.
     """
     def __init__(self) -> None:
-        pass
+        self.__notes: list[Note] = []
+        self.__index: _NoteIndex | None = None
+        self.__positions: dict[int, int] | None = None
 
     @property
     def PPQ(self) -> int:
@@ -82,6 +167,8 @@ class Score:
         * `all` (`bool`, optional): whether to clear all content from the
           score, regardless of selection status. Defaults to `False`.
         """
+        self.clearNotes(all)
+        self.clearMarkers(all)
 
     def clearNotes(self, all: bool = False) -> None:
         """
@@ -93,6 +180,17 @@ class Score:
         * `all` (`bool`, optional): whether to clear all notes from the
           score, regardless of selection status. Defaults to `False`.
         """
+        selected = [
+            i for i, note in enumerate(self.__notes) if note.selected
+        ]
+        if all or not selected:
+            for note in self.__notes:
+                note._owner = None
+            self.__notes = []
+            self.__index = None
+            self.__positions = None
+        else:
+            self.deleteNotes(selected)
 
     def clearMarkers(self, all: bool = False) -> None:
         """
@@ -113,7 +211,7 @@ class Score:
         """
         The number of notes currently in the score.
         """
-        return 0
+        return len(self.__notes)
 
     def addNote(self, note: Note) -> None:
         """
@@ -123,6 +221,45 @@ class Score:
 
         * `note` (`Note`): the note to add
         """
+        note = note.clone()
+        note._owner = self
+        if self.__positions is not None:
+            self.__positions[id(note)] = len(self.__notes)
+        self.__notes.append(note)
+        if self.__index is not None:
+            self.__index.add(note, note.number, note.time, note.length)
+
+    def addNotes(self, notes: Iterable[Note]) -> None:
+        """
+        Add multiple notes to the score, in order.
+
+        This is equivalent to calling `addNote` for each note, but is faster
+        for large numbers of notes.
+
+        ## Note
+
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+
+        ## Args
+
+        * `notes` (`Iterable[Note]`): the notes to add
+        """
+        added = [note.clone() for note in notes]
+        start = len(self.__notes)
+        for i, note in enumerate(added, start):
+            note._owner = self
+            if self.__positions is not None:
+                self.__positions[id(note)] = i
+        self.__notes.extend(added)
+        if self.__index is not None:
+            if len(added) > start // 8:
+                # Cheaper to rebuild the index when it is next needed
+                self.__index = None
+            else:
+                for note in added:
+                    self.__index.add(
+                        note, note.number, note.time, note.length)
 
     def getNote(self, index: int) -> Note:
         """
@@ -136,7 +273,7 @@ class Score:
 
         * `Note`: the note
         """
-        return Note()
+        return self.__notes[index]
 
     def deleteNote(self, index: int) -> None:
         """
@@ -146,6 +283,125 @@ class Score:
 
         * `index` (`int`): index of the note to remove
         """
+        note = self.__notes.pop(index)
+        note._owner = None
+        if self.__index is not None:
+            self.__index.remove(note, note.number, note.time)
+        self.__positions = None
+
+    def deleteNotes(self, indexes: Iterable[int]) -> None:
+        """
+        Remove the notes at the given positions from within the score.
+
+        Unlike calling `deleteNote` repeatedly, all indexes refer to positions
+        before any notes are removed. The remaining notes keep their order.
+
+        ## Note
+
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+
+        ## Args
+
+        * `indexes` (`Iterable[int]`): indexes of the notes to remove
+        """
+        count = len(self.__notes)
+        removed = set()
+        for index in indexes:
+            if not -count <= index < count:
+                raise IndexError(f"Note index {index} out of range")
+            removed.add(index % count)
+        if not removed:
+            return
+        kept = []
+        for i, note in enumerate(self.__notes):
+            if i in removed:
+                note._owner = None
+                if self.__index is not None and len(removed) <= count // 8:
+                    self.__index.remove(note, note.number, note.time)
+            else:
+                kept.append(note)
+        self.__notes = kept
+        if len(removed) > count // 8:
+            self.__index = None
+        self.__positions = None
+
+    def queryRange(
+        self,
+        start: int,
+        end: int | None = None,
+        minPitch: int = 0,
+        maxPitch: int = 127,
+    ) -> list[int]:
+        """
+        Returns the indexes of the notes which overlap the given range of
+        times and pitches.
+
+        A note overlaps the range if it starts before `end`, and ends after
+        `start`, meaning that notes with a length of `0` are never included.
+        Queries use an index of the notes, which is built when first needed,
+        and kept up to date as notes are changed.
+
+        ## Note
+
+        * This method is not available in FL Studio, and is only provided by
+          these stubs, for use when testing scripts.
+
+        ## Args
+
+        * `start` (`int`): start of the time range (in ticks).
+
+        * `end` (`int`, optional): end of the time range (in ticks,
+          exclusive). Defaults to `start + 1`, finding the notes that are
+          playing at time `start`.
+
+        * `minPitch` (`int`, optional): lowest note number to include.
+          Defaults to `0`.
+
+        * `maxPitch` (`int`, optional): highest note number to include.
+          Defaults to `127`.
+
+        ## Returns
+
+        * `list[int]`: indexes of matching notes, in ascending order.
+
+        ## Example usage
+
+        ```py
+        # Find the notes that are playing on the first beat of the score
+        for i in score.queryRange(0, score.PPQ):
+            note = score.getNote(i)
+        ```
+        """
+        if end is None:
+            end = start + 1
+        if self.__index is None:
+            self.__index = _NoteIndex(self.__notes)
+        if self.__positions is None:
+            self.__positions = {
+                id(note): i for i, note in enumerate(self.__notes)
+            }
+        positions = self.__positions
+        return sorted(
+            positions[id(note)]
+            for note in self.__index.query(start, end, minPitch, maxPitch)
+        )
+
+    def _moveNote(self, note: Note, number: int, time: int) -> None:
+        """
+        Update the index for a note that is about to change its number or
+        time.
+        """
+        if self.__index is not None:
+            self.__index.remove(note, note.number, note.time)
+            self.__index.add(note, number, time, note.length)
+
+    def _resizeNote(self, note: Note, length: int) -> None:
+        """
+        Update the index for a note that is about to change its length.
+        """
+        if self.__index is not None:
+            self.__index.grow(note.number, length)
 
     @property
     def markerCount(self) -> int:
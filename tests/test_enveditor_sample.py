@@ -0,0 +1,194 @@
+"""
+Round-trip tests for loading and saving WAV files using `enveditor.Sample`,
+checking that audio, regions and markers survive being saved and loaded.
+"""
+import random
+import struct
+import sys
+import wave
+from array import array
+
+import pytest
+from enveditor import Sample
+
+sample_module = sys.modules[Sample.__module__]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_mode(request, monkeypatch):
+    """
+    Run a test both with NumPy, if it is installed, and without it.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sample_module, "numpy", None)
+    return request.param
+
+
+def random_floats(seed: int, count: int) -> array:
+    rng = random.Random(seed)
+    return array('f', (rng.uniform(-1.0, 1.0) for _ in range(count)))
+
+
+def random_ints(seed: int, count: int) -> array:
+    rng = random.Random(seed)
+    ints = array('h', (rng.randrange(-32768, 32768) for _ in range(count)))
+    ints[:4] = array('h', [-32768, -1, 0, 32767])
+    return ints
+
+
+def make_sample(values: array, chans: int, rate: int = 48_000) -> Sample:
+    sample = Sample(len(values) // chans, chans, rate)
+    for i, value in enumerate(values):
+        sample.SetSampleAt(i // chans, i % chans, value)
+    return sample
+
+
+def sample_values(sample: Sample) -> list[float]:
+    return [
+        sample.GetSampleAt(position, channel)
+        for position in range(sample.Length)
+        for channel in range(sample.NumChans)
+    ]
+
+
+def riff_chunk(chunk_id: bytes, contents: bytes) -> bytes:
+    padding = b'\0' * (len(contents) % 2)
+    return chunk_id + struct.pack('<I', len(contents)) + contents + padding
+
+
+def float_wav(values: array, chans: int, *chunks: bytes) -> bytes:
+    """
+    Returns a 32-bit float WAV file, with the given chunks placed between
+    its `fmt ` and `data` chunks.
+    """
+    fmt = struct.pack('<HHIIHH', 3, chans, 44_100, 44_100 * chans * 4,
+                      chans * 4, 32)
+    body = (
+        b'WAVE'
+        + riff_chunk(b'fmt ', fmt)
+        + b''.join(chunks)
+        + riff_chunk(b'data', values.tobytes())
+    )
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+@pytest.mark.parametrize("chans", [1, 2])
+def test_float32_round_trip(tmp_path, numpy_mode, chans):
+    values = random_floats(chans, 1000 * chans)
+    sample = make_sample(values, chans)
+    path = tmp_path / "sample.wav"
+    sample.SaveToWav(path)
+
+    loaded = Sample()
+    loaded.LoadFromWav(path)
+    assert loaded.NumChans == chans
+    assert loaded.SampleRate == 48_000
+    assert loaded.Length == 1000
+    assert sample_values(loaded) == values.tolist()
+
+
+@pytest.mark.parametrize("chans", [1, 2])
+def test_load_pcm16(tmp_path, numpy_mode, chans):
+    ints = random_ints(chans, 1000 * chans)
+    path = tmp_path / "pcm16.wav"
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(chans)
+        f.setsampwidth(2)
+        f.setframerate(22_050)
+        f.writeframes(ints.tobytes())
+
+    sample = Sample()
+    sample.LoadFromWav(path)
+    assert sample.NumChans == chans
+    assert sample.SampleRate == 22_050
+    assert sample.Length == 1000
+    assert sample_values(sample) == [x / 32768 for x in ints]
+
+
+@pytest.mark.parametrize("chans", [1, 2])
+def test_pcm16_save_as_float32(tmp_path, numpy_mode, chans):
+    ints = random_ints(chans, 100 * chans)
+    path = tmp_path / "pcm16.wav"
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(chans)
+        f.setsampwidth(2)
+        f.setframerate(44_100)
+        f.writeframes(ints.tobytes())
+
+    sample = Sample()
+    sample.LoadFromWav(path)
+    # Saving over the file being loaded from replaces it
+    sample.SaveToWav(path)
+    loaded = Sample()
+    loaded.LoadFromWav(path)
+    assert loaded.NumChans == chans
+    assert sample_values(loaded) == [x / 32768 for x in ints]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_regions_and_markers_round_trip(tmp_path):
+    sample = Sample(1000, 2)
+    sample.AddRegion(100, 199)
+    sample.AddRegion(500)
+    sample.AddRegion(0, 0)
+    sample.AddRegion(150, 899)
+    sample.AddRegion(999)
+    path = tmp_path / "regions.wav"
+    sample.SaveToWav(path)
+
+    loaded = Sample()
+    loaded.LoadFromWav(path)
+    assert loaded.RegionCount == 5
+    assert [(r.SampleStart, r.SampleEnd) for r in loaded.Regions] == [
+        (0, 0), (100, 199), (150, 899)]
+    assert [r.SampleStart for r in loaded.Markers] == [500, 999]
+    assert all(r.SampleEnd > loaded.Length for r in loaded.Markers)
+    assert loaded.RegionAt(160) == sample.RegionAt(160)
+
+
+def test_no_regions_round_trip(tmp_path):
+    path = tmp_path / "empty.wav"
+    Sample(10, 1).SaveToWav(path)
+    loaded = Sample()
+    loaded.AddRegion(0, 5)
+    loaded.LoadFromWav(path)
+    assert loaded.RegionCount == 0
+
+
+@pytest.mark.parametrize("junk", [b'', b'x', b'odd', b'\0' * 64])
+def test_unknown_chunk_before_data(tmp_path, junk):
+    values = random_floats(0, 200)
+    path = tmp_path / "junk.wav"
+    path.write_bytes(float_wav(values, 2, riff_chunk(b'junk', junk)))
+
+    sample = Sample()
+    sample.LoadFromWav(path)
+    assert sample.NumChans == 2
+    assert sample.Length == 100
+    assert sample_values(sample) == values.tolist()
+
+
+def test_load_does_not_modify_file(tmp_path):
+    values = random_floats(1, 100)
+    path = tmp_path / "sample.wav"
+    path.write_bytes(float_wav(values, 1))
+
+    sample = Sample()
+    sample.LoadFromWav(path)
+    sample.SetSampleAt(0, 0, 0.5)
+    assert sample.GetSampleAt(0, 0) == 0.5
+    assert path.read_bytes() == float_wav(values, 1)
+
+
+@pytest.mark.parametrize("contents", [
+    b'',
+    b'RIFF\0\0\0\0AVI ',
+    float_wav(array('f'), 1)[:20],
+])
+def test_load_rejects_invalid_file(tmp_path, contents):
+    path = tmp_path / "invalid.wav"
+    path.write_bytes(contents + b'\0' * 4)
+    with pytest.raises(ValueError):
+        Sample().LoadFromWav(path)
@@ -0,0 +1,117 @@
+"""
+Round-trip tests for the raw event arrays in `fl_classes`, checking them
+against the scalar `eventToRawData` and `rawDataToEvent` functions.
+"""
+import random
+from array import array
+
+import pytest
+from fl_classes import (
+    FlMidiMsg,
+    eventsToRawArray,
+    eventToRawData,
+    joinRawArray,
+    rawArrayToEvents,
+    rawDataToEvent,
+    splitRawArray,
+)
+
+EDGE_BYTES = [0x00, 0x01, 0x7E, 0x7F, 0x80, 0x81, 0xEF, 0xF1, 0xFE, 0xFF]
+"""
+Edge-case values for each byte. `0xF0` is left out of the status bytes,
+since it marks a sysex event.
+"""
+
+
+def edge_events() -> list[FlMidiMsg]:
+    return [
+        FlMidiMsg(status, data1, data2)
+        for status in EDGE_BYTES
+        for data1 in EDGE_BYTES
+        for data2 in EDGE_BYTES
+    ]
+
+
+def random_events(seed: int, count: int = 2000) -> list[FlMidiMsg]:
+    rng = random.Random(seed)
+    events: list[FlMidiMsg] = []
+    while len(events) < count:
+        status = rng.randrange(0x100)
+        if status != 0xF0:
+            events.append(FlMidiMsg(
+                status, rng.randrange(0x100), rng.randrange(0x100)))
+    return events
+
+
+def as_tuples(events: list[FlMidiMsg]) -> list[tuple[int, int, int]]:
+    return [(e.status, e.data1, e.data2) for e in events]
+
+
+EVENT_SETS = [
+    pytest.param(edge_events(), id="edge"),
+    *(pytest.param(random_events(seed), id=f"random-{seed}")
+      for seed in range(5)),
+]
+
+
+@pytest.mark.parametrize("events", EVENT_SETS)
+def test_encode_matches_scalar(events):
+    raw = eventsToRawArray(events)
+    assert raw.typecode == 'I'
+    assert raw.tolist() == [eventToRawData(e) for e in events]
+
+
+@pytest.mark.parametrize("events", EVENT_SETS)
+def test_decode_matches_scalar(events):
+    raw = eventsToRawArray(events)
+    assert as_tuples(rawArrayToEvents(raw)) == as_tuples(
+        [rawDataToEvent(data) for data in raw])
+    assert as_tuples(rawArrayToEvents(raw)) == as_tuples(events)
+
+
+@pytest.mark.parametrize("events", EVENT_SETS)
+def test_split_join_round_trip(events):
+    raw = eventsToRawArray(events)
+    status, data1, data2 = splitRawArray(raw)
+    assert list(zip(status, data1, data2, strict=True)) == as_tuples(events)
+    assert joinRawArray(status, data1, data2) == raw
+
+
+def test_split_ignores_high_byte():
+    rng = random.Random(0)
+    raw = array('I', (rng.randrange(1 << 32) for _ in range(1000)))
+    assert as_tuples(rawArrayToEvents(raw)) == as_tuples(
+        [rawDataToEvent(data) for data in raw])
+
+
+def test_encode_rejects_sysex():
+    with pytest.raises(ValueError):
+        eventsToRawArray([FlMidiMsg([0xF0, 0x7F, 0xF7])])
+
+
+def test_join_rejects_different_lengths():
+    with pytest.raises(ValueError):
+        joinRawArray(b'\x90', b'\x3C\x3C', b'\x7F')
+
+
+@pytest.mark.parametrize("events", EVENT_SETS)
+def test_numpy_round_trip(events):
+    numpy = pytest.importorskip("numpy")
+    raw = numpy.array(
+        [eventToRawData(e) for e in events],
+        dtype=numpy.uint32,
+    )
+    assert as_tuples(rawArrayToEvents(raw)) == as_tuples(
+        [rawDataToEvent(int(data)) for data in raw])
+    status, data1, data2 = splitRawArray(raw)
+    joined = numpy.frombuffer(
+        joinRawArray(status, data1, data2), dtype=numpy.uint32)
+    assert numpy.array_equal(joined, raw)
+    assert numpy.array_equal(
+        numpy.frombuffer(eventsToRawArray(events), dtype=numpy.uint32), raw)
+
+
+def test_numpy_rejects_wrong_item_size():
+    numpy = pytest.importorskip("numpy")
+    with pytest.raises(TypeError):
+        splitRawArray(numpy.zeros(4, dtype=numpy.uint16))
@@ -0,0 +1,211 @@
+"""
+Tests for decoding streams of raw MIDI data in `fl_classes`, both from whole
+buffers and in chunks using `MidiStreamDecoder`.
+"""
+import random
+from collections.abc import Iterable
+from mmap import mmap
+
+import pytest
+from fl_classes import (
+    MidiStreamDecoder,
+    decodeMidiStream,
+    decodeMidiStreamBatched,
+    iterRawData,
+)
+
+RawData = int | bytes
+
+
+def normalize(messages: Iterable[int | memoryview]) -> list[RawData]:
+    return [m if isinstance(m, int) else m.tobytes() for m in messages]
+
+
+def decode_whole(data: bytes) -> list[RawData]:
+    return normalize(iterRawData(data))
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> list[RawData]:
+    decoder = MidiStreamDecoder()
+    messages: list[RawData] = []
+    for chunk in chunks:
+        messages.extend(normalize(decoder.feed(chunk)))
+    return messages
+
+
+def split(data: bytes, cuts: Iterable[int]) -> list[bytes]:
+    points = [0, *sorted(cuts), len(data)]
+    return [data[a:b] for a, b in zip(points, points[1:], strict=False)]
+
+
+def note(status: int, data1: int, data2: int = 0) -> int:
+    return status | (data1 << 8) | (data2 << 16)
+
+
+def random_stream(rng: random.Random) -> bytes:
+    """
+    A stream of valid and invalid messages, including running status,
+    real-time messages, stray bytes and truncated sysex.
+    """
+    out = bytearray()
+    for _ in range(rng.randrange(1, 40)):
+        kind = rng.random()
+        if kind < 0.3:
+            out += bytes((
+                0x90 | rng.randrange(16),
+                rng.randrange(0x80),
+                rng.randrange(0x80),
+            ))
+        elif kind < 0.45:
+            # Running status, or stray data bytes
+            out += bytes(rng.randrange(0x80) for _ in range(rng.randrange(4)))
+        elif kind < 0.6:
+            out.append(0xF0)
+            out += bytes(rng.randrange(0x80) for _ in range(rng.randrange(8)))
+            if rng.random() < 0.8:
+                out.append(0xF7)
+        elif kind < 0.7:
+            out.append(rng.randrange(0xF8, 0x100))
+        elif kind < 0.8:
+            out += bytes((0xC0 | rng.randrange(16), rng.randrange(0x80)))
+        else:
+            out.append(rng.randrange(0x80, 0x100))
+    return bytes(out)
+
+
+def test_running_status():
+    data = bytes([0x90, 60, 100, 62, 101, 64, 0])
+    assert decode_whole(data) == [
+        note(0x90, 60, 100),
+        note(0x90, 62, 101),
+        note(0x90, 64, 0),
+    ]
+
+
+@pytest.mark.parametrize("cut", range(1, 7))
+def test_running_status_across_chunks(cut):
+    data = bytes([0x90, 60, 100, 62, 101, 64, 0])
+    assert decode_chunks(split(data, [cut])) == decode_whole(data)
+
+
+def test_running_status_cancelled_by_sysex():
+    data = bytes([0x90, 60, 100, 0xF0, 1, 0xF7, 62, 101])
+    assert decode_whole(data) == [note(0x90, 60, 100), bytes([0xF0, 1, 0xF7])]
+
+
+def test_real_time_inside_message():
+    data = bytes([0x90, 60, 0xF8, 100])
+    assert decode_whole(data) == [0xF8, note(0x90, 60, 100)]
+
+
+def test_real_time_inside_sysex():
+    data = bytes([0xF0, 1, 2, 0xF8, 3, 0xFE, 0xF7])
+    assert decode_whole(data) == [0xF8, 0xFE, bytes([0xF0, 1, 2, 3, 0xF7])]
+
+
+@pytest.mark.parametrize("cut", range(1, 7))
+def test_real_time_inside_sysex_across_chunks(cut):
+    data = bytes([0xF0, 1, 2, 0xF8, 3, 0xFE, 0xF7])
+    assert decode_chunks(split(data, [cut])) == decode_whole(data)
+
+
+def test_sysex_split_across_feeds():
+    decoder = MidiStreamDecoder()
+    assert normalize(decoder.feed(bytes([0x80, 60, 0, 0xF0, 1, 2]))) == [
+        note(0x80, 60, 0)]
+    assert decoder.pending == 3
+    assert normalize(decoder.feed(bytes([3, 4]))) == []
+    assert normalize(decoder.feed(bytes([5, 0xF7, 0xC0, 7]))) == [
+        bytes([0xF0, 1, 2, 3, 4, 5, 0xF7]),
+        note(0xC0, 7),
+    ]
+    assert decoder.pending == 0
+
+
+def test_sysex_interrupted_across_feeds():
+    # The sysex is cut short by a note on, so is skipped
+    assert decode_chunks([bytes([0xF0, 1, 2]), bytes([3, 0x90, 60, 1])]) == [
+        note(0x90, 60, 1)]
+
+
+def test_stray_data_byte():
+    data = bytes([5, 6, 0x90, 60, 100])
+    assert decode_whole(data) == [note(0x90, 60, 100)]
+    assert decode_chunks(split(data, [1, 3])) == [note(0x90, 60, 100)]
+
+
+def test_truncated_messages_skipped():
+    assert decode_whole(bytes([0x90, 60])) == []
+    assert decode_whole(bytes([0x90, 60, 0xB0, 1, 2])) == [note(0xB0, 1, 2)]
+    assert decode_whole(bytes([0xF0, 1, 2])) == []
+
+
+def test_sysex_view_is_zero_copy():
+    data = bytearray([0xF0, 1, 2, 0xF7])
+    (view,) = iterRawData(data)
+    assert isinstance(view, memoryview)
+    assert view.obj is data
+
+
+def test_sysex_view_valid_after_next_feed():
+    decoder = MidiStreamDecoder()
+    (whole,) = decoder.feed(bytes([0xF0, 1, 2, 0xF7, 0xF0, 3]))
+    (joined,) = decoder.feed(bytes([4, 0xF7, 0xF0, 5]))
+    list(decoder.feed(bytes([6, 0xF7])))
+    list(decoder.feed(bytes([0xF0, 7, 0xF7] * 100)))
+    assert isinstance(whole, memoryview) and isinstance(joined, memoryview)
+    assert whole.tobytes() == bytes([0xF0, 1, 2, 0xF7])
+    assert joined.tobytes() == bytes([0xF0, 3, 4, 0xF7])
+
+
+def test_mmap_buffer():
+    data = bytes([0x90, 60, 100, 0xF0, 1, 0xF7])
+    with mmap(-1, len(data)) as buffer:
+        buffer.write(data)
+        messages = list(iterRawData(buffer))
+        assert normalize(messages) == decode_whole(data)
+        del messages
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunks_match_whole_buffer(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        data = random_stream(rng)
+        cuts = rng.sample(
+            range(len(data) + 1), min(len(data) + 1, rng.randrange(6)))
+        assert decode_chunks(split(data, cuts)) == decode_whole(data)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_single_byte_chunks_match_whole_buffer(seed):
+    data = random_stream(random.Random(seed))
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert decode_chunks(chunks) == decode_whole(data)
+
+
+def test_reset_discards_pending():
+    decoder = MidiStreamDecoder()
+    list(decoder.feed(bytes([0x90, 60, 100, 0xF0, 1])))
+    decoder.reset()
+    assert decoder.pending == 0
+    # Neither the sysex nor the running status continue
+    assert normalize(decoder.feed(bytes([2, 0xF7, 61, 1]))) == []
+
+
+def test_decode_midi_stream():
+    data = bytes([0x90, 60, 100, 0xF0, 1, 0xF7, 0xE0, 0, 64])
+    messages = list(decodeMidiStream(data))
+    assert [(m.status, m.data1, m.data2) for m in messages[::2]] == [
+        (0x90, 60, 100),
+        (0xE0, 0, 64),
+    ]
+    assert messages[1].sysex == bytes([0xF0, 1, 0xF7])
+
+
+def test_decode_midi_stream_batched():
+    data = bytes([0x90, 60, 100]) * 5
+    batches = list(decodeMidiStreamBatched(data, 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    with pytest.raises(ValueError):
+        decodeMidiStreamBatched(data, 0)